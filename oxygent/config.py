@@ -70,6 +70,9 @@ class Config:
             "is_stored": False,
             "is_show_in_terminal": False,
             "is_send_full_arguments": False,
+            "stream_flush_interval": 0.03,
+            "stream_max_chars": 512,
+            "transport": "list",
         },
         "vearch": {},
         "es": {},
@@ -81,11 +84,60 @@ class Config:
             "number_of_shards": 1,
             "number_of_replicas": 1,
         },
+        "local_es": {
+            "backend": "file",  # file (LocalEs) or sqlite (SqliteEs)
+            "storage_mode": "json",  # json file or log (JSONL segment), file only
+            "compaction_ratio": 2.0,
+            "compaction_min_records": 1000,
+        },
+        "es_bulk": {
+            "is_enabled": False,
+            "batch_size": 500,
+            "flush_interval": 1.0,  # seconds
+            "hold_ms": 500,  # nodes finishing within it get a single write
+            "max_pending": 100000,  # failed actions beyond it are dropped
+        },
+        "es_partition": {
+            "is_enabled": False,
+            "period": "day",  # day or month
+            "retention_days": 30,  # 0 keeps every partition
+            "recent_partitions": 7,  # searched by default, 0 searches all
+        },
+        "trace_cache": {
+            "is_enabled": True,
+            "max_size": 10000,
+            "ttl": 3600,  # seconds
+            "is_redis_backed": True,
+        },
+        "history_cache": {
+            "is_enabled": True,
+            "max_size": 1000,  # sessions
+            "max_length": 100,  # memories per session
+        },
+        "llm_cache": {
+            "is_enabled": False,  # default of BaseLLM.is_cache
+            "max_size": 1000,
+            "ttl": 86400,  # seconds
+            "is_redis_backed": True,
+        },
+        "payload_codec": {
+            "is_enabled": False,
+            "threshold": 4096,  # bytes
+            "algorithm": "zstd",  # zstd (falls back to deflate) or deflate
+        },
+        "blob_store": {
+            "is_enabled": False,
+            "threshold": 1024,  # bytes
+        },
         "redis": {},
         "redis_param": {
             "expire_time": 86400,  # 24 hours 60 * 60 * 24
             "max_size": 1024,
             "max_length": 20480,  # 20MB
+            "max_memory": 1024,  # MB, memory budget of LocalRedis, 0 for no limit
+            "sweep_interval": 1,  # seconds between LocalRedis expiry sweeps
+            "max_connections": 0,  # 0 follows the largest oxy semaphore
+            "max_blocking_connections": 512,  # waiting brpop/xread, i.e. SSE streams
         },
         "server": {
             "host": "127.0.0.1",
@@ -376,6 +428,30 @@ class Config:
     def get_message_is_send_full_arguments(cls):
         return cls.get_module_config("message", "is_send_full_arguments")
 
+    @classmethod
+    def set_message_stream_flush_interval(cls, stream_flush_interval=0.03):
+        cls.set_module_config("message", "stream_flush_interval", stream_flush_interval)
+
+    @classmethod
+    def get_message_stream_flush_interval(cls):
+        return cls.get_module_config("message", "stream_flush_interval", 0.03)
+
+    @classmethod
+    def set_message_stream_max_chars(cls, stream_max_chars=512):
+        cls.set_module_config("message", "stream_max_chars", stream_max_chars)
+
+    @classmethod
+    def get_message_stream_max_chars(cls):
+        return cls.get_module_config("message", "stream_max_chars", 512)
+
+    @classmethod
+    def set_message_transport(cls, transport="list"):
+        cls.set_module_config("message", "transport", transport)
+
+    @classmethod
+    def get_message_transport(cls):
+        return cls.get_module_config("message", "transport", "list")
+
     """ es """
 
     @classmethod
@@ -428,6 +504,320 @@ class Config:
     def get_es_settings_config(cls) -> dict:
         return cls.get_module_config("es_settings")
 
+    """ local_es """
+
+    @classmethod
+    def set_local_es_config(cls, local_es_config):
+        cls.set_module_config("local_es", local_es_config)
+
+    @classmethod
+    def get_local_es_config(cls) -> dict:
+        return cls.get_module_config("local_es")
+
+    @classmethod
+    def set_local_es_backend(cls, backend):
+        cls.set_module_config("local_es", "backend", backend)
+
+    @classmethod
+    def get_local_es_backend(cls):
+        return cls.get_module_config("local_es", "backend", "file")
+
+    @classmethod
+    def set_local_es_storage_mode(cls, storage_mode):
+        cls.set_module_config("local_es", "storage_mode", storage_mode)
+
+    @classmethod
+    def get_local_es_storage_mode(cls):
+        return cls.get_module_config("local_es", "storage_mode", "json")
+
+    @classmethod
+    def set_local_es_compaction_ratio(cls, compaction_ratio):
+        cls.set_module_config("local_es", "compaction_ratio", compaction_ratio)
+
+    @classmethod
+    def get_local_es_compaction_ratio(cls):
+        return cls.get_module_config("local_es", "compaction_ratio", 2.0)
+
+    @classmethod
+    def set_local_es_compaction_min_records(cls, compaction_min_records):
+        cls.set_module_config(
+            "local_es", "compaction_min_records", compaction_min_records
+        )
+
+    @classmethod
+    def get_local_es_compaction_min_records(cls):
+        return cls.get_module_config("local_es", "compaction_min_records", 1000)
+
+    """ es_bulk """
+
+    @classmethod
+    def set_es_bulk_config(cls, es_bulk_config):
+        cls.set_module_config("es_bulk", es_bulk_config)
+
+    @classmethod
+    def get_es_bulk_config(cls) -> dict:
+        return cls.get_module_config("es_bulk")
+
+    @classmethod
+    def set_es_bulk_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("es_bulk", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_es_bulk_is_enabled(cls):
+        return cls.get_module_config("es_bulk", "is_enabled", False)
+
+    @classmethod
+    def set_es_bulk_batch_size(cls, batch_size):
+        cls.set_module_config("es_bulk", "batch_size", batch_size)
+
+    @classmethod
+    def get_es_bulk_batch_size(cls):
+        return cls.get_module_config("es_bulk", "batch_size", 500)
+
+    @classmethod
+    def set_es_bulk_flush_interval(cls, flush_interval):
+        cls.set_module_config("es_bulk", "flush_interval", flush_interval)
+
+    @classmethod
+    def get_es_bulk_flush_interval(cls):
+        return cls.get_module_config("es_bulk", "flush_interval", 1.0)
+
+    @classmethod
+    def set_es_bulk_hold_ms(cls, hold_ms):
+        cls.set_module_config("es_bulk", "hold_ms", hold_ms)
+
+    @classmethod
+    def get_es_bulk_hold_ms(cls):
+        return cls.get_module_config("es_bulk", "hold_ms", 500)
+
+    @classmethod
+    def set_es_bulk_max_pending(cls, max_pending):
+        cls.set_module_config("es_bulk", "max_pending", max_pending)
+
+    @classmethod
+    def get_es_bulk_max_pending(cls):
+        return cls.get_module_config("es_bulk", "max_pending", 100000)
+
+    """ es_partition """
+
+    @classmethod
+    def set_es_partition_config(cls, es_partition_config):
+        cls.set_module_config("es_partition", es_partition_config)
+
+    @classmethod
+    def get_es_partition_config(cls) -> dict:
+        return cls.get_module_config("es_partition")
+
+    @classmethod
+    def set_es_partition_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("es_partition", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_es_partition_is_enabled(cls):
+        return cls.get_module_config("es_partition", "is_enabled", False)
+
+    @classmethod
+    def set_es_partition_period(cls, period):
+        cls.set_module_config("es_partition", "period", period)
+
+    @classmethod
+    def get_es_partition_period(cls):
+        return cls.get_module_config("es_partition", "period", "day")
+
+    @classmethod
+    def set_es_partition_retention_days(cls, retention_days):
+        cls.set_module_config("es_partition", "retention_days", retention_days)
+
+    @classmethod
+    def get_es_partition_retention_days(cls):
+        return cls.get_module_config("es_partition", "retention_days", 30)
+
+    @classmethod
+    def set_es_partition_recent_partitions(cls, recent_partitions):
+        cls.set_module_config("es_partition", "recent_partitions", recent_partitions)
+
+    @classmethod
+    def get_es_partition_recent_partitions(cls):
+        return cls.get_module_config("es_partition", "recent_partitions", 7)
+
+    """ trace_cache """
+
+    @classmethod
+    def set_trace_cache_config(cls, trace_cache_config):
+        cls.set_module_config("trace_cache", trace_cache_config)
+
+    @classmethod
+    def get_trace_cache_config(cls) -> dict:
+        return cls.get_module_config("trace_cache")
+
+    @classmethod
+    def set_trace_cache_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("trace_cache", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_trace_cache_is_enabled(cls):
+        return cls.get_module_config("trace_cache", "is_enabled", True)
+
+    @classmethod
+    def set_trace_cache_max_size(cls, max_size):
+        cls.set_module_config("trace_cache", "max_size", max_size)
+
+    @classmethod
+    def get_trace_cache_max_size(cls):
+        return cls.get_module_config("trace_cache", "max_size", 10000)
+
+    @classmethod
+    def set_trace_cache_ttl(cls, ttl):
+        cls.set_module_config("trace_cache", "ttl", ttl)
+
+    @classmethod
+    def get_trace_cache_ttl(cls):
+        return cls.get_module_config("trace_cache", "ttl", 3600)
+
+    @classmethod
+    def set_trace_cache_is_redis_backed(cls, is_redis_backed=True):
+        cls.set_module_config("trace_cache", "is_redis_backed", is_redis_backed)
+
+    @classmethod
+    def get_trace_cache_is_redis_backed(cls):
+        return cls.get_module_config("trace_cache", "is_redis_backed", True)
+
+    """ history_cache """
+
+    @classmethod
+    def set_history_cache_config(cls, history_cache_config):
+        cls.set_module_config("history_cache", history_cache_config)
+
+    @classmethod
+    def get_history_cache_config(cls) -> dict:
+        return cls.get_module_config("history_cache")
+
+    @classmethod
+    def set_history_cache_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("history_cache", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_history_cache_is_enabled(cls):
+        return cls.get_module_config("history_cache", "is_enabled", True)
+
+    @classmethod
+    def set_history_cache_max_size(cls, max_size):
+        cls.set_module_config("history_cache", "max_size", max_size)
+
+    @classmethod
+    def get_history_cache_max_size(cls):
+        return cls.get_module_config("history_cache", "max_size", 1000)
+
+    @classmethod
+    def set_history_cache_max_length(cls, max_length):
+        cls.set_module_config("history_cache", "max_length", max_length)
+
+    @classmethod
+    def get_history_cache_max_length(cls):
+        return cls.get_module_config("history_cache", "max_length", 100)
+
+    """ llm_cache """
+
+    @classmethod
+    def set_llm_cache_config(cls, llm_cache_config):
+        cls.set_module_config("llm_cache", llm_cache_config)
+
+    @classmethod
+    def get_llm_cache_config(cls) -> dict:
+        return cls.get_module_config("llm_cache")
+
+    @classmethod
+    def set_llm_cache_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("llm_cache", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_llm_cache_is_enabled(cls):
+        return cls.get_module_config("llm_cache", "is_enabled", False)
+
+    @classmethod
+    def set_llm_cache_max_size(cls, max_size):
+        cls.set_module_config("llm_cache", "max_size", max_size)
+
+    @classmethod
+    def get_llm_cache_max_size(cls):
+        return cls.get_module_config("llm_cache", "max_size", 1000)
+
+    @classmethod
+    def set_llm_cache_ttl(cls, ttl):
+        cls.set_module_config("llm_cache", "ttl", ttl)
+
+    @classmethod
+    def get_llm_cache_ttl(cls):
+        return cls.get_module_config("llm_cache", "ttl", 86400)
+
+    @classmethod
+    def set_llm_cache_is_redis_backed(cls, is_redis_backed=True):
+        cls.set_module_config("llm_cache", "is_redis_backed", is_redis_backed)
+
+    @classmethod
+    def get_llm_cache_is_redis_backed(cls):
+        return cls.get_module_config("llm_cache", "is_redis_backed", True)
+
+    """ payload_codec """
+
+    @classmethod
+    def set_payload_codec_config(cls, payload_codec_config):
+        cls.set_module_config("payload_codec", payload_codec_config)
+
+    @classmethod
+    def get_payload_codec_config(cls) -> dict:
+        return cls.get_module_config("payload_codec")
+
+    @classmethod
+    def set_payload_codec_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("payload_codec", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_payload_codec_is_enabled(cls):
+        return cls.get_module_config("payload_codec", "is_enabled", False)
+
+    @classmethod
+    def set_payload_codec_threshold(cls, threshold):
+        cls.set_module_config("payload_codec", "threshold", threshold)
+
+    @classmethod
+    def get_payload_codec_threshold(cls):
+        return cls.get_module_config("payload_codec", "threshold", 4096)
+
+    @classmethod
+    def set_payload_codec_algorithm(cls, algorithm):
+        cls.set_module_config("payload_codec", "algorithm", algorithm)
+
+    @classmethod
+    def get_payload_codec_algorithm(cls):
+        return cls.get_module_config("payload_codec", "algorithm", "zstd")
+
+    """ blob_store """
+
+    @classmethod
+    def set_blob_store_config(cls, blob_store_config):
+        cls.set_module_config("blob_store", blob_store_config)
+
+    @classmethod
+    def get_blob_store_config(cls) -> dict:
+        return cls.get_module_config("blob_store")
+
+    @classmethod
+    def set_blob_store_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("blob_store", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_blob_store_is_enabled(cls):
+        return cls.get_module_config("blob_store", "is_enabled", False)
+
+    @classmethod
+    def set_blob_store_threshold(cls, threshold):
+        cls.set_module_config("blob_store", "threshold", threshold)
+
+    @classmethod
+    def get_blob_store_threshold(cls):
+        return cls.get_module_config("blob_store", "threshold", 1024)
+
     """ vearch """
 
     @classmethod
@@ -478,6 +868,40 @@ class Config:
     def get_redis_max_length(cls):
         return cls.get_module_config("redis_param", "max_length")
 
+    @classmethod
+    def set_redis_max_memory(cls, max_memory):
+        cls.set_module_config("redis_param", "max_memory", max_memory)
+
+    @classmethod
+    def get_redis_max_memory(cls):
+        return cls.get_module_config("redis_param", "max_memory", 1024)
+
+    @classmethod
+    def set_redis_sweep_interval(cls, sweep_interval):
+        cls.set_module_config("redis_param", "sweep_interval", sweep_interval)
+
+    @classmethod
+    def get_redis_sweep_interval(cls):
+        return cls.get_module_config("redis_param", "sweep_interval", 1)
+
+    @classmethod
+    def set_redis_max_connections(cls, max_connections):
+        cls.set_module_config("redis_param", "max_connections", max_connections)
+
+    @classmethod
+    def get_redis_max_connections(cls):
+        return cls.get_module_config("redis_param", "max_connections", 0)
+
+    @classmethod
+    def set_redis_max_blocking_connections(cls, max_blocking_connections):
+        cls.set_module_config(
+            "redis_param", "max_blocking_connections", max_blocking_connections
+        )
+
+    @classmethod
+    def get_redis_max_blocking_connections(cls):
+        return cls.get_module_config("redis_param", "max_blocking_connections", 512)
+
     """ server """
 
     @classmethod
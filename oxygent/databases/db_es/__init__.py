@@ -1,7 +1,13 @@
+from .es_write_buffer import EsWriteBuffer
 from .jes_es import JesEs
 from .local_es import LocalEs
+from .partitioned_es import PartitionedEs
+from .sqlite_es import SqliteEs
 
 __all__ = [
+    "EsWriteBuffer",
     "JesEs",
     "LocalEs",
+    "PartitionedEs",
+    "SqliteEs",
 ]
@@ -56,6 +56,28 @@ class BaseEs(BaseDB, ABC):
     async def update(self, index_name, doc_id, body):
         pass
 
+    async def bulk(self, actions):
+        """Apply several write actions in as few round trips as possible.
+
+        The default implementation replays the actions one by one; back ends
+        override it with a real batched write.
+
+        Args:
+            actions: List of ``{"_op_type", "_index", "_id", "_source"}`` dicts
+                where ``_op_type`` is ``"index"`` or ``"update"`` (``_source``
+                then holds the partial document), applied in order.
+
+        Returns:
+            Elasticsearch-style ``{"errors": bool, "items": [...]}`` result
+        """
+        items = []
+        for action in actions:
+            op_type = action["_op_type"]
+            method = self.update if op_type == "update" else self.index
+            result = await method(action["_index"], action["_id"], action["_source"])
+            items.append({op_type: result})
+        return {"errors": any(None in item.values() for item in items), "items": items}
+
     @abstractmethod
     async def search(self, index_name, body):
         """Execute a search query against an Elasticsearch index.
@@ -72,6 +94,43 @@ class BaseEs(BaseDB, ABC):
         """
         pass
 
+    async def search_all(self, index_name, body):
+        """Search every partition of a partitioned index.
+
+        Partitioning clients search the recent partitions only by default;
+        other clients have a single index and forward to ``search``.
+
+        Args:
+            index_name: Name of the index to search
+            body: Search query body
+
+        Returns:
+            Search results matching the query criteria
+        """
+        return await self.search(index_name, body)
+
+    async def list_indices(self, prefix):
+        """List the indices whose name starts with *prefix*.
+
+        Args:
+            prefix: Prefix of the index names
+
+        Returns:
+            Sorted list of index names
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot list indices")
+
+    async def delete_index(self, index_name):
+        """Delete an index together with all of its documents.
+
+        Args:
+            index_name: Name of the index to delete
+
+        Returns:
+            Result of the delete operation
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot delete indices")
+
     @abstractmethod
     async def exists(self, index_name, doc_id):
         """Check if a document exists in the specified index.
@@ -0,0 +1,222 @@
+"""es_write_buffer.py – Batching write buffer in front of any ``BaseEs`` client.
+
+``index``/``update`` calls are queued and sent to the wrapped client through
+``bulk`` once ``batch_size`` actions are pending or ``flush_interval`` seconds
+after the first queued action, whichever comes first.  Reads first flush the
+pending actions of the index they read (of the document, for ``exists``) so
+callers always see their own writes, and ``close`` flushes whatever is left
+before closing the wrapped client.  Actions of failed bulk requests are queued
+again, up to ``max_pending`` actions; beyond that the oldest are dropped.
+
+Writes are coalesced per document while they wait: an ``update`` is merged
+into the pending action of the same document, so the ``index`` of
+``_pre_save_data`` and the ``update`` of ``_post_save_data`` of a node reach
+the back end as one insert.  ``index`` actions of the ``hold_indices`` (the
+node index) are moreover held back for ``hold_ms`` milliseconds, so nodes
+finishing within that time never produce a separate "node started" write.
+Searches only send a held document early when they look it up by ``_id``.
+Other documents are not expected to be updated soon and are not held.
+"""
+
+import asyncio
+import logging
+from typing import Any, Iterable, Optional
+
+from .base_es import BaseEs
+
+logger = logging.getLogger(__name__)
+
+
+class EsWriteBuffer(BaseEs):
+    """Proxy gathering the writes of a ``BaseEs`` client into bulk requests."""
+
+    def __init__(
+        self,
+        client: BaseEs,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        hold_ms: float = 0,
+        hold_indices: Iterable[str] = (),
+        max_pending: int = 100000,
+    ) -> None:
+        self.client = client
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.hold_ms = hold_ms
+        self.hold_indices = set(hold_indices)
+        self.max_pending = max_pending
+        # pending action per (index, doc_id), in arrival order
+        self._pending: dict[tuple[str, str], dict[str, Any]] = {}
+        self._held_until: dict[tuple[str, str], float] = {}
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    async def _enqueue(self, action: dict[str, Any]) -> None:
+        key = (action["_index"], action["_id"])
+        # shallow copy: the caller may reuse its dict before the flush
+        source = dict(action["_source"])
+        pending = self._pending.get(key)
+        if pending is not None and action["_op_type"] == "update":
+            pending["_source"].update(source)
+            self._held_until.pop(key, None)  # the document is complete now
+        else:
+            self._pending[key] = {**action, "_source": source}
+            if (
+                action["_op_type"] == "index"
+                and self.hold_ms > 0
+                and action["_index"] in self.hold_indices
+            ):
+                loop = asyncio.get_running_loop()
+                self._held_until[key] = loop.time() + self.hold_ms / 1000
+            else:
+                self._held_until.pop(key, None)
+
+        if len(self._pending) - len(self._held_until) >= self.batch_size:
+            await self._flush(force=False)
+        if self._pending and (self._timer is None or self._timer.done()):
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            delay = self.flush_interval
+            if self._held_until:
+                next_release = min(self._held_until.values()) - loop.time()
+                delay = max(0, min(delay, next_release))
+            await asyncio.sleep(delay)
+            try:
+                # shielded so that ``close`` cancelling the timer cannot drop a batch
+                await asyncio.shield(self._flush(force=False))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Flush of the ES write buffer failed: %s", e)
+
+    async def _flush(
+        self,
+        force: bool,
+        index_name: Optional[str] = None,
+        doc_id: Optional[str] = None,
+        read_ids: Iterable[str] = (),
+    ) -> None:
+        """Send the pending actions, holding back young ones unless *force*.
+
+        *index_name* and *doc_id* restrict the flush to the actions of one
+        index or one document; held actions of the *read_ids* are sent too.
+        """
+        async with self._flush_lock:
+            now = asyncio.get_running_loop().time()
+            keys = [
+                key
+                for key in self._pending
+                if (index_name is None or key[0] == index_name)
+                and (doc_id is None or key[1] == doc_id)
+                and (force or key[1] in read_ids or self._held_until.get(key, 0) <= now)
+            ]
+            actions = []
+            for key in keys:
+                actions.append(self._pending.pop(key))
+                self._held_until.pop(key, None)
+            if not actions:
+                return
+            try:
+                result = await self.client.bulk(actions)
+            except Exception as e:
+                logger.error(
+                    "Bulk write of %d actions failed, retrying later: %s",
+                    len(actions),
+                    e,
+                )
+                self._requeue(actions)
+                return
+            if result is None:
+                logger.error("Bulk write of %d actions failed", len(actions))
+            elif result.get("errors"):
+                logger.warning("Bulk write of %d actions had errors", len(actions))
+
+    def _requeue(self, actions: list[dict[str, Any]]) -> None:
+        """Put failed *actions* back ahead of the ones queued meanwhile."""
+        pending = {}
+        for action in actions:
+            key = (action["_index"], action["_id"])
+            newer = self._pending.pop(key, None)
+            if newer is not None and newer["_op_type"] == "update":
+                action["_source"].update(newer["_source"])
+            elif newer is not None:
+                action = newer  # re-indexed since, the failed write is obsolete
+            pending[key] = action
+        pending.update(self._pending)
+        overflow = len(pending) - self.max_pending
+        if overflow > 0:
+            logger.error(
+                "ES write buffer is full, dropping %d failed actions", overflow
+            )
+            for key in list(pending)[:overflow]:
+                del pending[key]
+                self._held_until.pop(key, None)
+        self._pending = pending
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Send every pending action to the wrapped client now."""
+        await self._flush(force=True)
+
+    async def create_index(self, index_name, body):
+        return await self.client.create_index(index_name, body)
+
+    async def index(self, index_name, doc_id, body):
+        await self._enqueue(
+            {"_op_type": "index", "_index": index_name, "_id": doc_id, "_source": body}
+        )
+        return {"_id": doc_id, "result": "created"}
+
+    async def update(self, index_name, doc_id, body):
+        await self._enqueue(
+            {"_op_type": "update", "_index": index_name, "_id": doc_id, "_source": body}
+        )
+        return {"_id": doc_id, "result": "updated"}
+
+    async def bulk(self, actions):
+        for action in actions:
+            await self._enqueue(action)
+        return {"errors": False, "items": []}
+
+    @staticmethod
+    def _read_ids(body) -> set:
+        """Return the ids a search looks up with a ``term``/``terms`` on ``_id``."""
+        query = (body or {}).get("query") or {}
+        ids = (query.get("term") or query.get("terms") or {}).get("_id")
+        if ids is None:
+            return set()
+        return set(ids) if isinstance(ids, list) else {ids}
+
+    async def search(self, index_name, body):
+        # held documents stay held unless they are the ones searched for
+        await self._flush(
+            force=False, index_name=index_name, read_ids=self._read_ids(body)
+        )
+        return await self.client.search(index_name, body)
+
+    async def search_all(self, index_name, body):
+        await self._flush(
+            force=False, index_name=index_name, read_ids=self._read_ids(body)
+        )
+        return await self.client.search_all(index_name, body)
+
+    async def exists(self, index_name, doc_id):
+        await self._flush(force=True, index_name=index_name, doc_id=doc_id)
+        return await self.client.exists(index_name, doc_id)
+
+    async def list_indices(self, prefix):
+        return await self.client.list_indices(prefix)
+
+    async def delete_index(self, index_name):
+        await self._flush(force=True, index_name=index_name)
+        return await self.client.delete_index(index_name)
+
+    async def close(self):
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        await self.flush()
+        return await self.client.close()
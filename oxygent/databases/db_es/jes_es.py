@@ -74,12 +74,36 @@ class JesEs(BaseEs):
     async def update(self, index_name, doc_id, body):
         return await self.client.update(index=index_name, id=doc_id, body={"doc": body})
 
+    async def bulk(self, actions):
+        operations = []
+        for action in actions:
+            op_type = action["_op_type"]
+            operations.append(
+                {op_type: {"_index": action["_index"], "_id": action["_id"]}}
+            )
+            if op_type == "update":
+                operations.append({"doc": action["_source"]})
+            else:
+                operations.append(action["_source"])
+        return await self.client.bulk(body=operations)
+
     async def search(self, index_name, body):
         return await self.client.search(index=index_name, body=body)
 
     async def exists(self, index_name, doc_id):
         return await self.client.exists(index=index_name, id=doc_id)
 
+    async def list_indices(self, prefix):
+        indices = await self.client.indices.get_alias(
+            index=f"{prefix}*", allow_no_indices=True
+        )
+        return sorted(indices)
+
+    async def delete_index(self, index_name):
+        return await self.client.indices.delete(
+            index=index_name, ignore_unavailable=True
+        )
+
     async def close(self):
         return await self.client.close()
 
@@ -10,16 +10,32 @@ files on the local filesystem.  The design goals are:
   requested; corrupted files are preserved via ``.bak`` before we attempt any
   recovery so historic logs are not silently lost.
 
+Two storage modes are available (``Config.get_local_es_storage_mode()``):
+
+* ``json`` – the whole index lives in ``{index}.json`` and every write rewrites
+  it.  Simple, human readable, but write cost grows with the index size.
+* ``log``  – every write appends one record to the ``{index}.jsonl`` segment and
+  an in‑memory ``doc_id → offset`` map points at the latest record of each
+  document.  Superseded records are dropped by a background compaction, so the
+  per‑write cost stays O(1) regardless of how many nodes have been stored.
+
+Whatever the mode, an index is read from disk only once: the documents are then
+kept in an in‑process cache together with hash indexes on the ``keyword`` fields
+of its mapping, both updated on every write, so ``term``/``terms`` queries are
+answered with dictionary lookups instead of full scans.
+
 Only the subset of APIs that OxyGent actually uses is implemented.
 """
 
 from __future__ import annotations
 
 import asyncio
+import heapq
 import json
 import locale
 import logging
 import os
+from functools import cmp_to_key
 from typing import Any, Dict, Optional
 
 import aiofiles
@@ -27,6 +43,7 @@ import aiofiles.os
 from aiofiles import tempfile
 
 from oxygent.config import Config
+from oxygent.utils.data_utils import compare_sort_values
 
 from .base_es import BaseEs
 
@@ -36,11 +53,29 @@ logger = logging.getLogger(__name__)
 class LocalEs(BaseEs):
     """Very small file‑system‑backed ES shim."""
 
-    def __init__(self) -> None:  # noqa: D401 – simple init
+    storage_modes = ("json", "log")
+
+    def __init__(self, storage_mode: Optional[str] = None) -> None:
         self.data_dir: str = os.path.join(Config.get_cache_save_dir(), "local_es_data")
         os.makedirs(self.data_dir, exist_ok=True)
         self._locks: dict[str, asyncio.Lock] = {}
 
+        self.storage_mode = storage_mode or Config.get_local_es_storage_mode()
+        if self.storage_mode not in self.storage_modes:
+            raise ValueError(
+                f"Unsupported LocalEs storage mode: {self.storage_mode}, "
+                f"expected one of {self.storage_modes}"
+            )
+        # log mode bookkeeping, all keyed by index name
+        self._log_offsets: dict[str, dict[str, int]] = {}
+        self._log_sizes: dict[str, int] = {}
+        self._log_records: dict[str, int] = {}
+        self._compaction_tasks: dict[str, asyncio.Task] = {}
+        # document cache and keyword indexes, all keyed by index name
+        self._docs: dict[str, dict[str, Any]] = {}
+        self._doc_seqs: dict[str, dict[str, int]] = {}
+        self._field_indexes: dict[str, dict[str, dict[Any, set[str]]]] = {}
+
     # ------------------------------------------------------------------
     # Utilities (paths, atomic IO helpers)
     # ------------------------------------------------------------------
@@ -51,6 +86,12 @@ class LocalEs(BaseEs):
     def _mapping_path(self, index_name: str) -> str:
         return os.path.join(self.data_dir, f"{index_name}_mapping.json")
 
+    def _log_path(self, index_name: str) -> str:
+        return os.path.join(self.data_dir, f"{index_name}.jsonl")
+
+    def _get_lock(self, index_name: str) -> asyncio.Lock:
+        return self._locks.setdefault(index_name, asyncio.Lock())
+
     async def _write_json_atomic(self, path: str, data: Dict[str, Any]) -> None:
         """Write *data* to *path* atomically, UTF‑8 encoded."""
         async with tempfile.NamedTemporaryFile(
@@ -113,9 +154,15 @@ class LocalEs(BaseEs):
         await self._write_json_atomic(self._mapping_path(index_name), body)
 
         # 2) create empty index *only if it does not exist* – avoids wiping logs
-        index_path = self._index_path(index_name)
-        if not await aiofiles.os.path.exists(index_path):
-            await self._write_json_atomic(index_path, {})
+        async with self._get_lock(index_name):
+            if self.storage_mode == "log":
+                await self._ensure_log_loaded(index_name)
+            else:
+                index_path = self._index_path(index_name)
+                if not await aiofiles.os.path.exists(index_path):
+                    await self._write_json_atomic(index_path, {})
+            # keyword fields may have changed – rebuild the cache on next access
+            self._docs.pop(index_name, None)
         return {"acknowledged": True}
 
     async def insert(
@@ -126,29 +173,277 @@ class LocalEs(BaseEs):
         *,
         update_mode: bool,
     ) -> dict[str, str]:
+        await self._write_batch(index_name, [(doc_id, body, update_mode)])
+        return {"_id": doc_id, "result": "updated" if update_mode else "created"}
+
+    async def _write_batch(
+        self, index_name: str, ops: list[tuple[str, dict[str, Any], bool]]
+    ) -> None:
+        """Apply ``(doc_id, body, update_mode)`` *ops* with a single disk write."""
+        async with self._get_lock(index_name):
+            await self._write_batch_locked(index_name, ops)
+
+    async def _write_batch_locked(
+        self, index_name: str, ops: list[tuple[str, dict[str, Any], bool]]
+    ) -> None:
+        """``_write_batch`` for callers already holding the index lock."""
+        if self.storage_mode == "log":
+            sources = await self._log_write(index_name, ops)
+        else:
+            sources = await self._json_write(index_name, ops)
+        if index_name in self._docs:
+            for doc_id, source in sources:
+                # decouple the cache from the caller's objects like a disk
+                # round trip would
+                source = json.loads(json.dumps(source, ensure_ascii=False))
+                self._cache_put(index_name, doc_id, source)
+
+    async def index(self, index_name: str, doc_id: str, body: dict[str, Any]):
+        return await self.insert(index_name, doc_id, body, update_mode=False)
+
+    async def update(self, index_name: str, doc_id: str, body: dict[str, Any]):
+        return await self.insert(index_name, doc_id, body, update_mode=True)
+
+    async def bulk(self, actions: list[dict[str, Any]]) -> dict[str, Any]:
+        """Apply *actions* with one write per touched index."""
+        ops_by_index: dict[str, list[tuple[str, dict[str, Any], bool]]] = {}
+        items = []
+        for action in actions:
+            update_mode = action["_op_type"] == "update"
+            ops_by_index.setdefault(action["_index"], []).append(
+                (action["_id"], action["_source"], update_mode)
+            )
+            result = "updated" if update_mode else "created"
+            items.append({action["_op_type"]: {"_id": action["_id"], "result": result}})
+        for index_name, ops in ops_by_index.items():
+            await self._write_batch(index_name, ops)
+        return {"errors": False, "items": items}
+
+    async def list_indices(self, prefix: str) -> list[str]:
+        suffix = "_mapping.json"
+        names = await asyncio.to_thread(os.listdir, self.data_dir)
+        return sorted(
+            name[: -len(suffix)]
+            for name in names
+            if name.startswith(prefix) and name.endswith(suffix)
+        )
+
+    async def delete_index(self, index_name: str) -> dict[str, bool]:
+        task = self._compaction_tasks.pop(index_name, None)
+        if task is not None and not task.done():
+            await asyncio.gather(task, return_exceptions=True)
+        async with self._get_lock(index_name):
+            for path in (
+                self._index_path(index_name),
+                self._log_path(index_name),
+                self._mapping_path(index_name),
+            ):
+                if await aiofiles.os.path.exists(path):
+                    await aiofiles.os.unlink(path)
+            for state in (
+                self._docs,
+                self._doc_seqs,
+                self._field_indexes,
+                self._log_offsets,
+                self._log_sizes,
+                self._log_records,
+            ):
+                state.pop(index_name, None)
+        return {"acknowledged": True}
+
+    async def exists(self, index_name: str, doc_id: str) -> bool:
+        data = await self._load_data(index_name)
+        return doc_id in data
+
+    async def search(self, index_name: str, body: dict[str, Any]):
+        data = await self._load_data(index_name)
+        query = body.get("query", {})
+        candidates = self._candidate_ids(index_name, query)
+        if candidates is None:
+            docs = self._build_docs(data)
+        else:
+            seqs = self._doc_seqs[index_name]
+            docs = [
+                {"_id": doc_id, "_source": data[doc_id]}
+                for doc_id in sorted(candidates, key=seqs.__getitem__)
+            ]
+        docs = self._filter_docs(docs, query)
+        size = body.get("size", 10)
+        docs = self._sort_docs(
+            docs, body.get("sort", []), size=size, search_after=body.get("search_after")
+        )
+        return {"hits": {"hits": [self._clone_hit(d) for d in docs[:size]]}}
+
+    # ------------------------------------------------------------------
+    # Document cache and keyword indexes
+    # ------------------------------------------------------------------
+
+    async def _load_data(self, index_name: str) -> dict[str, Any]:
+        """Return the cached ``{doc_id: source}`` map of *index_name*.
+
+        The map is live: callers must not mutate it nor await while iterating.
+        """
+        async with self._get_lock(index_name):
+            return await self._load_data_locked(index_name)
+
+    async def _load_data_locked(self, index_name: str) -> dict[str, Any]:
+        """``_load_data`` for callers already holding the index lock."""
+        if index_name not in self._docs:
+            data = await self._read_index(index_name)
+            mapping = await self._read_json_safe(self._mapping_path(index_name))
+            self._cache_load(index_name, data, mapping or {})
+        return self._docs[index_name]
+
+    def _cache_load(
+        self, index_name: str, data: dict[str, Any], mapping: dict[str, Any]
+    ) -> None:
+        properties = (mapping.get("mappings") or {}).get("properties") or {}
+        self._docs[index_name] = {}
+        self._doc_seqs[index_name] = {}
+        self._field_indexes[index_name] = {
+            field: {}
+            for field, spec in properties.items()
+            if isinstance(spec, dict) and spec.get("type") == "keyword"
+        }
+        for doc_id, source in data.items():
+            self._cache_put(index_name, doc_id, source)
+
+    def _cache_put(self, index_name: str, doc_id: str, source: dict[str, Any]) -> None:
+        docs = self._docs[index_name]
+        old = docs.get(doc_id)
+        for field, field_index in self._field_indexes[index_name].items():
+            if old is not None:
+                key = self._index_key(old.get(field))
+                ids = field_index.get(key)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del field_index[key]
+            field_index.setdefault(self._index_key(source.get(field)), set()).add(
+                doc_id
+            )
+        docs[doc_id] = source
+        seqs = self._doc_seqs[index_name]
+        seqs.setdefault(doc_id, len(seqs))
+
+    @staticmethod
+    def _index_key(value: Any) -> Any:
+        try:
+            hash(value)
+            return value
+        except TypeError:  # lists/dicts, e.g. ``root_trace_ids``
+            return ("__json__", json.dumps(value, sort_keys=True, ensure_ascii=False))
+
+    def _lookup_ids(
+        self, index_name: str, field: str, values: Any
+    ) -> Optional[set[str]]:
+        if not isinstance(values, (list, tuple, set)):
+            return None
+        if field == "_id":
+            data = self._docs[index_name]
+            return {v for v in values if isinstance(v, str) and v in data}
+        field_index = self._field_indexes[index_name].get(field)
+        if field_index is None:
+            return None
+        ids: set[str] = set()
+        for value in values:
+            ids.update(field_index.get(self._index_key(value), ()))
+        return ids
+
+    def _candidate_ids(
+        self, index_name: str, query: dict[str, Any]
+    ) -> Optional[set[str]]:
+        """Return a superset of the ids matching *query*, ``None`` if unknown.
+
+        Only the indexed part of the query is evaluated here; ``search`` still
+        runs ``_filter_docs`` over the candidates for exact semantics.
+        """
+        if not query:
+            return None
+
+        if "term" in query:
+            k, v = next(iter(query["term"].items()))
+            return self._lookup_ids(index_name, k, [v])
+
+        if "terms" in query:
+            k, vlist = next(iter(query["terms"].items()))
+            if k == "_id":  # ``terms`` matches the source field, not the doc id
+                return None
+            return self._lookup_ids(index_name, k, vlist)
+
+        if "bool" in query:
+            bool_query = query["bool"]
+
+            if "must" in bool_query:
+                candidates = None
+                for condition in bool_query["must"]:
+                    ids = self._candidate_ids(index_name, condition)
+                    if ids is not None:
+                        candidates = ids if candidates is None else candidates & ids
+                return candidates
+
+            if "should" in bool_query:
+                candidates = set()
+                for condition in bool_query["should"]:
+                    ids = self._candidate_ids(index_name, condition)
+                    if ids is None:
+                        return None
+                    candidates |= ids
+                return candidates
+
+        return None
+
+    @staticmethod
+    def _clone_hit(doc: dict[str, Any]) -> dict[str, Any]:
+        # callers (e.g. the web routes) mutate hits in place
+        source = json.loads(json.dumps(doc["_source"], ensure_ascii=False))
+        hit = {"_id": doc["_id"], "_source": source}
+        if "sort" in doc:
+            hit["sort"] = doc["sort"]
+        return hit
+
+    # ------------------------------------------------------------------
+    # Storage back ends (callers hold the index lock)
+    # ------------------------------------------------------------------
+
+    async def _read_index(self, index_name: str) -> dict[str, Any]:
+        """Read every document of *index_name* from disk."""
+        if self.storage_mode == "log":
+            await self._ensure_log_loaded(index_name)
+            live_offsets = set(self._log_offsets[index_name].values())
+            return await asyncio.to_thread(
+                self._read_log_docs,
+                self._log_path(index_name),
+                live_offsets,
+                self._log_sizes[index_name],
+            )
+        return await self._read_json_safe(self._index_path(index_name)) or {}
+
+    async def _json_write(
+        self, index_name: str, ops: list[tuple[str, dict[str, Any], bool]]
+    ) -> list[tuple[str, dict[str, Any]]]:
         data_path = self._index_path(index_name)
         backup_path = f"{data_path}.bak"
 
-        lock = self._locks.setdefault(index_name, asyncio.Lock())
-        async with lock:
-            # --- load existing data ---
-            data = await self._read_json_safe(data_path)
-
-            if data is None:  # unrecoverable corruption; try backup once
-                if await aiofiles.os.path.exists(backup_path):
-                    await aiofiles.os.replace(backup_path, data_path)
-                    data = await self._read_json_safe(data_path)
-
-            if data is None:
-                # still corrupted – preserve original file, switch to fresh store
-                corrupt_path = f"{data_path}.corrupt"
-                await aiofiles.os.rename(data_path, corrupt_path)
-                logger.error(
-                    "Index %s is corrupted – moved to %s", index_name, corrupt_path
-                )
-                data = {}
-
-            # --- apply mutation ---
+        # --- load existing data ---
+        data = await self._read_json_safe(data_path)
+
+        if data is None:  # unrecoverable corruption; try backup once
+            if await aiofiles.os.path.exists(backup_path):
+                await aiofiles.os.replace(backup_path, data_path)
+                data = await self._read_json_safe(data_path)
+
+        if data is None:
+            # still corrupted – preserve original file, switch to fresh store
+            corrupt_path = f"{data_path}.corrupt"
+            await aiofiles.os.rename(data_path, corrupt_path)
+            logger.error(
+                "Index %s is corrupted – moved to %s", index_name, corrupt_path
+            )
+            data = {}
+
+        # --- apply mutations ---
+        for doc_id, body, update_mode in ops:
             if update_mode:
                 merged = data.get(doc_id, {})
                 merged.update(body)
@@ -156,29 +451,204 @@ class LocalEs(BaseEs):
             else:
                 data[doc_id] = body
 
-            # --- backup & persist ---
-            if await aiofiles.os.path.exists(data_path):
-                await aiofiles.os.replace(data_path, backup_path)
-            await self._write_json_atomic(data_path, data)
+        # --- backup & persist ---
+        if await aiofiles.os.path.exists(data_path):
+            await aiofiles.os.replace(data_path, backup_path)
+        await self._write_json_atomic(data_path, data)
+        return [(doc_id, data[doc_id]) for doc_id, _, _ in ops]
+
+    async def _log_write(
+        self, index_name: str, ops: list[tuple[str, dict[str, Any], bool]]
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Append the new versions of the documents to the index segment."""
+        await self._ensure_log_loaded(index_name)
+        offsets = self._log_offsets[index_name]
+        log_path = self._log_path(index_name)
+
+        written: dict[str, dict[str, Any]] = {}
+        sources, lines = [], []
+        for doc_id, body, update_mode in ops:
+            if update_mode and doc_id in written:
+                source = dict(written[doc_id])
+                source.update(body)
+            elif update_mode and doc_id in offsets:
+                source = await asyncio.to_thread(
+                    self._read_log_record, log_path, offsets[doc_id]
+                )
+                source = dict(source or {})
+                source.update(body)
+            else:
+                source = body
+            written[doc_id] = source
+            sources.append((doc_id, source))
+            lines.append(
+                (
+                    json.dumps({"_id": doc_id, "_source": source}, ensure_ascii=False)
+                    + "\n"
+                ).encode("utf-8")
+            )
+
+        async with aiofiles.open(log_path, "ab") as f:
+            await f.write(b"".join(lines))
+
+        for (doc_id, _), line in zip(sources, lines):
+            offsets[doc_id] = self._log_sizes[index_name]
+            self._log_sizes[index_name] += len(line)
+        self._log_records[index_name] += len(lines)
+        self._maybe_schedule_compaction(index_name)
+        return sources
+
+    async def _ensure_log_loaded(self, index_name: str) -> None:
+        """Build the ``doc_id → offset`` map of *index_name* on first access.
+
+        A legacy ``{index}.json`` file is imported into the segment once, so an
+        existing installation can switch to log mode without losing history.
+        """
+        if index_name in self._log_offsets:
+            return
+        log_path = self._log_path(index_name)
+        if not await aiofiles.os.path.exists(log_path):
+            legacy = await self._read_json_safe(self._index_path(index_name)) or {}
+            await asyncio.to_thread(self._write_log_docs, log_path, legacy)
+            if legacy:
+                logger.info(
+                    "Imported %d docs of %s into %s", len(legacy), index_name, log_path
+                )
+        offsets, size, records = await asyncio.to_thread(self._scan_log, log_path)
+        self._log_offsets[index_name] = offsets
+        self._log_sizes[index_name] = size
+        self._log_records[index_name] = records
+
+    def _maybe_schedule_compaction(self, index_name: str) -> None:
+        records = self._log_records[index_name]
+        live = len(self._log_offsets[index_name])
+        if records < Config.get_local_es_compaction_min_records():
+            return
+        if records < live * Config.get_local_es_compaction_ratio():
+            return
+        task = self._compaction_tasks.get(index_name)
+        if task is not None and not task.done():
+            return
+        self._compaction_tasks[index_name] = asyncio.create_task(
+            self._compact_log(index_name)
+        )
+
+    async def _compact_log(self, index_name: str) -> None:
+        """Rewrite the segment of *index_name* keeping only live records.
+
+        The bulk copy runs without the index lock; records appended meanwhile
+        are replayed onto the new segment under the lock right before the swap.
+        """
+        log_path = self._log_path(index_name)
+        tmp_path = f"{log_path}.compact"
+        lock = self._get_lock(index_name)
+        try:
+            async with lock:
+                snapshot = dict(self._log_offsets[index_name])
+                snapshot_end = self._log_sizes[index_name]
+            new_offsets, new_size = await asyncio.to_thread(
+                self._copy_log_records, log_path, tmp_path, snapshot
+            )
+            async with lock:
+                tail_offsets, tail_size, tail_records = await asyncio.to_thread(
+                    self._append_log_tail, log_path, tmp_path, snapshot_end, new_size
+                )
+                new_offsets.update(tail_offsets)
+                await aiofiles.os.replace(tmp_path, log_path)
+                self._log_offsets[index_name] = new_offsets
+                self._log_sizes[index_name] = new_size + tail_size
+                self._log_records[index_name] = len(snapshot) + tail_records
+            logger.info("Compacted %s: %d live docs", index_name, len(new_offsets))
+        except Exception as e:  # noqa: BLE001 – the old segment is still valid
+            logger.error("Compaction of %s failed: %s", index_name, e)
+            if await aiofiles.os.path.exists(tmp_path):
+                await aiofiles.os.unlink(tmp_path)
 
-        return {"_id": doc_id, "result": "updated" if update_mode else "created"}
+    # ------------------------------------------------------------------
+    # Blocking segment IO (run through ``asyncio.to_thread``)
+    # ------------------------------------------------------------------
 
-    async def index(self, index_name: str, doc_id: str, body: dict[str, Any]):
-        return await self.insert(index_name, doc_id, body, update_mode=False)
+    @staticmethod
+    def _scan_log(path: str) -> tuple[dict[str, int], int, int]:
+        """Return ``(offsets, size, record_count)`` of the segment at *path*.
+
+        A torn last line (crash during append) is truncated so later appends
+        start on a clean record boundary.
+        """
+        offsets: dict[str, int] = {}
+        position = records = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning("Truncating torn record at %s:%d", path, position)
+                    break
+                try:
+                    offsets[json.loads(line)["_id"]] = position
+                    records += 1
+                except (ValueError, KeyError):
+                    logger.warning("Skipping corrupted record at %s:%d", path, position)
+                position += len(line)
+        if position != os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(position)
+        return offsets, position, records
 
-    async def update(self, index_name: str, doc_id: str, body: dict[str, Any]):
-        return await self.insert(index_name, doc_id, body, update_mode=True)
+    @staticmethod
+    def _read_log_record(path: str, offset: int) -> Optional[dict[str, Any]]:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())["_source"]
 
-    async def exists(self, index_name: str, doc_id: str) -> bool:
-        data = await self._read_json_safe(self._index_path(index_name)) or {}
-        return doc_id in data
+    @staticmethod
+    def _read_log_docs(path: str, live_offsets: set[int], size: int) -> dict[str, Any]:
+        data: dict[str, Any] = {}
+        position = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if position >= size:
+                    break
+                if position in live_offsets:
+                    record = json.loads(line)
+                    data[record["_id"]] = record["_source"]
+                position += len(line)
+        return data
 
-    async def search(self, index_name: str, body: dict[str, Any]):
-        data = await self._read_json_safe(self._index_path(index_name)) or {}
-        docs = self._build_docs(data)
-        docs = self._filter_docs(docs, body.get("query", {}))
-        docs = self._sort_docs(docs, body.get("sort", []))
-        return {"hits": {"hits": docs[: body.get("size", 10)]}}
+    @staticmethod
+    def _write_log_docs(path: str, data: dict[str, Any]) -> None:
+        with open(path, "wb") as f:
+            for doc_id, source in data.items():
+                record = {"_id": doc_id, "_source": source}
+                f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+
+    @staticmethod
+    def _copy_log_records(
+        src_path: str, dst_path: str, offsets: dict[str, int]
+    ) -> tuple[dict[str, int], int]:
+        new_offsets: dict[str, int] = {}
+        position = 0
+        with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            for doc_id, offset in sorted(offsets.items(), key=lambda kv: kv[1]):
+                src.seek(offset)
+                line = src.readline()
+                dst.write(line)
+                new_offsets[doc_id] = position
+                position += len(line)
+        return new_offsets, position
+
+    @staticmethod
+    def _append_log_tail(
+        src_path: str, dst_path: str, start: int, base: int
+    ) -> tuple[dict[str, int], int, int]:
+        tail_offsets: dict[str, int] = {}
+        position = records = 0
+        with open(src_path, "rb") as src, open(dst_path, "ab") as dst:
+            src.seek(start)
+            for line in src:
+                dst.write(line)
+                tail_offsets[json.loads(line)["_id"]] = base + position
+                position += len(line)
+                records += 1
+        return tail_offsets, position, records
 
     # ------------------------------------------------------------------
     # Helpers for naive query execution
@@ -279,54 +749,87 @@ class LocalEs(BaseEs):
 
         return False
 
-    @staticmethod
-    def _sort_docs(docs: list[dict[str, Any]], spec: list[dict[str, Any]]):
-        for s in reversed(spec):
-            for field, order in s.items():
-                reverse = order.get("order", "asc") == "desc"
-                docs.sort(key=lambda d: d["_source"].get(field), reverse=reverse)
-        return docs
+    def _sort_docs(
+        self,
+        docs: list[dict[str, Any]],
+        spec: list[dict[str, Any]],
+        size: Optional[int] = None,
+        search_after: Optional[list[Any]] = None,
+    ):
+        """Order *docs* by *spec*, keeping only the first *size* of them.
+
+        Like Elasticsearch, every sorted hit carries its ``sort`` values, which
+        the caller can pass back as ``search_after`` to fetch the next page.
+        Missing values sort last whatever the order; ties keep index order.
+        """
+        fields = [
+            (field, order.get("order", "asc") if isinstance(order, dict) else order)
+            for s in spec
+            for field, order in s.items()
+        ]
+        if not fields:
+            return docs
+        descending = [order == "desc" for _, order in fields]
+        keyed = [
+            ([d["_id"] if f == "_id" else d["_source"].get(f) for f, _ in fields], d)
+            for d in docs
+        ]
+        if search_after is not None:
+            keyed = [
+                (values, d)
+                for values, d in keyed
+                if compare_sort_values(values, search_after, descending) > 0
+            ]
+
+        key = cmp_to_key(lambda a, b: compare_sort_values(a[0], b[0], descending))
+        if size is not None and size < len(keyed):
+            keyed = heapq.nsmallest(size, keyed, key=key)  # bounded top-k, stable
+        else:
+            keyed.sort(key=key)
+
+        for values, d in keyed:
+            d["sort"] = values
+        return [d for _, d in keyed]
 
     async def get_by_node_id(
         self, index_name: str, node_id: str
     ) -> Optional[dict[str, Any]]:
-        data = await self._read_json_safe(self._index_path(index_name)) or {}
-
-        for doc_id, doc_content in data.items():
+        data = await self._load_data(index_name)
+        doc_id = self._find_node_doc_id(index_name, data, node_id)
+        if doc_id is None:
+            return None
+        return self._clone_hit({"_id": doc_id, "_source": data[doc_id]})
+
+    def _find_node_doc_id(
+        self, index_name: str, data: dict[str, Any], node_id: str
+    ) -> Optional[str]:
+        candidates = self._lookup_ids(index_name, "node_id", [node_id])
+        if candidates is not None:
+            seqs = self._doc_seqs[index_name]
+            doc_ids = sorted(candidates, key=seqs.__getitem__)
+        else:
+            doc_ids = data
+        for doc_id in doc_ids:
+            doc_content = data[doc_id]
             if isinstance(doc_content, dict) and doc_content.get("node_id") == node_id:
-                return {"_id": doc_id, "_source": doc_content}
-
+                return doc_id
         return None
 
     async def update_by_node_id(
         self, index_name: str, node_id: str, updates: dict[str, Any]
     ) -> dict[str, str]:
-        data_path = self._index_path(index_name)
-        backup_path = f"{data_path}.bak"
-
-        lock = self._locks.setdefault(index_name, asyncio.Lock())
-        async with lock:
-            data = await self._read_json_safe(data_path) or {}
-
-            target_doc_id = None
-            for doc_id, doc_content in data.items():
-                if (
-                    isinstance(doc_content, dict)
-                    and doc_content.get("node_id") == node_id
-                ):
-                    target_doc_id = doc_id
-                    break
-
-            if target_doc_id is None:
+        # look up and update under one lock, so that no write lands in between
+        async with self._get_lock(index_name):
+            data = await self._load_data_locked(index_name)
+            doc_id = self._find_node_doc_id(index_name, data, node_id)
+            if doc_id is None:
                 return {"_id": "", "result": "not_found"}
-
-            data[target_doc_id].update(updates)
-
-            if await aiofiles.os.path.exists(data_path):
-                await aiofiles.os.replace(data_path, backup_path)
-            await self._write_json_atomic(data_path, data)
-
-            return {"_id": target_doc_id, "result": "updated"}
-
-    async def close(self) -> bool:  # noqa: D401 – nothing to clean
+            await self._write_batch_locked(index_name, [(doc_id, updates, True)])
+        return {"_id": doc_id, "result": "updated"}
+
+    async def close(self) -> bool:
+        """Wait for running compactions; nothing else to clean."""
+        pending = [t for t in self._compaction_tasks.values() if not t.done()]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
         return True
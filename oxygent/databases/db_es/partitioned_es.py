@@ -0,0 +1,251 @@
+"""partitioned_es.py – Time partitioning of the indices of any ``BaseEs`` client.
+
+Documents of a partitioned index ``name`` are written to ``name-YYYYMMDD``
+(``name-YYYYMM`` for monthly partitions) of the day they were first written,
+and later writes of a document go to the partition holding it.  ``search``
+fans out over the ``recent_partitions`` newest partitions only and merges the
+hits like a multi-index search would; ``search_all`` visits every partition,
+for callers that know they read older data.  When the query is sorted on
+``create_time`` (or looks a document up by id) the partitions are visited in
+that order and the search stops as soon as enough hits were found.
+
+Partitions older than the retention are dropped whole with ``delete_index``,
+which is much cheaper than deleting their documents one by one.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from functools import cmp_to_key
+from typing import Any, Optional
+
+from oxygent.utils.cache_utils import LRUCache
+from oxygent.utils.data_utils import compare_sort_values
+
+from .base_es import BaseEs
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionedEs(BaseEs):
+    """Proxy splitting some indices of a ``BaseEs`` client into time partitions.
+
+    Args:
+        client (BaseEs): The wrapped client.
+        index_names (list[str]): The indices to partition; others are forwarded.
+        period (str): ``"day"`` or ``"month"``.
+        retention_days (int): Partitions entirely older than that many days are
+            dropped, ``0`` keeps everything.
+        partition_field (str): Date field the partitions follow.
+        recent_partitions (int): Number of newest partitions ``search`` visits,
+            ``0`` visits every partition.
+    """
+
+    period_formats = {"day": "%Y%m%d", "month": "%Y%m"}
+
+    def __init__(
+        self,
+        client: BaseEs,
+        index_names: list[str],
+        period: str = "day",
+        retention_days: int = 30,
+        partition_field: str = "create_time",
+        recent_partitions: int = 7,
+    ) -> None:
+        if period not in self.period_formats:
+            raise ValueError(
+                f"Unsupported partition period: {period}, "
+                f"expected one of {tuple(self.period_formats)}"
+            )
+        self.client = client
+        self.index_names = set(index_names)
+        self.period = period
+        self.retention_days = retention_days
+        self.partition_field = partition_field
+        self.recent_partitions = recent_partitions
+        self._mappings: dict[str, dict[str, Any]] = {}
+        self._partitions: dict[str, list[str]] = {}  # oldest first
+        self._doc_partitions = LRUCache(max_size=100000)
+
+    # ------------------------------------------------------------------
+    # Partition bookkeeping
+    # ------------------------------------------------------------------
+
+    def _partition_name(self, index_name: str, when: datetime) -> str:
+        return f"{index_name}-{when.strftime(self.period_formats[self.period])}"
+
+    async def _load_partitions(self, index_name: str) -> list[str]:
+        if index_name not in self._partitions:
+            names = await self.client.list_indices(f"{index_name}-") or []
+            prefix_len = len(index_name) + 1
+            self._partitions[index_name] = sorted(
+                name for name in names if name[prefix_len:].isdigit()
+            )
+        return self._partitions[index_name]
+
+    async def _current_partition(self, index_name: str) -> str:
+        partition = self._partition_name(index_name, datetime.now())
+        partitions = await self._load_partitions(index_name)
+        if partition not in partitions:
+            await self.client.create_index(partition, self._mappings[index_name])
+            partitions.append(partition)
+            partitions.sort()
+            await self.drop_expired_partitions(index_name)
+        return partition
+
+    async def _remembered_partition(
+        self, index_name: str, doc_id: str
+    ) -> Optional[str]:
+        partition = self._doc_partitions.get((index_name, doc_id))
+        if partition in await self._load_partitions(index_name):
+            return partition
+        return None  # unknown or dropped
+
+    async def _find_partition(self, index_name: str, doc_id: str) -> Optional[str]:
+        """Return the partition holding *doc_id*, searching newest first."""
+        partition = await self._remembered_partition(index_name, doc_id)
+        if partition is not None:
+            return partition
+        for partition in reversed(await self._load_partitions(index_name)):
+            if await self.client.exists(partition, doc_id):
+                self._doc_partitions.set((index_name, doc_id), partition)
+                return partition
+        return None
+
+    async def _write_partition(self, index_name: str, doc_id: str, op_type: str):
+        # new documents go to the current partition without any lookup; only
+        # updates of documents unknown after a restart or an eviction search
+        # the partition holding them
+        if op_type == "update":
+            partition = await self._find_partition(index_name, doc_id)
+        else:
+            partition = await self._remembered_partition(index_name, doc_id)
+        if partition is None:
+            partition = await self._current_partition(index_name)
+        self._doc_partitions.set((index_name, doc_id), partition)
+        return partition
+
+    async def drop_expired_partitions(self, index_name: str) -> list[str]:
+        """Delete the partitions of *index_name* older than the retention."""
+        if self.retention_days <= 0:
+            return []
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        oldest_kept = self._partition_name(index_name, cutoff)
+        partitions = await self._load_partitions(index_name)
+        expired = [p for p in partitions if p < oldest_kept]
+        for partition in expired:
+            await self.client.delete_index(partition)
+            partitions.remove(partition)
+            logger.info("Dropped expired partition %s", partition)
+        return expired
+
+    # ------------------------------------------------------------------
+    # Public ES‑like API
+    # ------------------------------------------------------------------
+
+    async def create_index(self, index_name, body):
+        if index_name not in self.index_names:
+            return await self.client.create_index(index_name, body)
+        self._mappings[index_name] = body
+        self._partitions.pop(index_name, None)
+        # mapping updates apply to the existing partitions too
+        for partition in await self._load_partitions(index_name):
+            await self.client.create_index(partition, body)
+        await self.drop_expired_partitions(index_name)
+        await self._current_partition(index_name)
+        return {"acknowledged": True}
+
+    async def index(self, index_name, doc_id, body):
+        if index_name in self.index_names:
+            index_name = await self._write_partition(index_name, doc_id, "index")
+        return await self.client.index(index_name, doc_id, body)
+
+    async def update(self, index_name, doc_id, body):
+        if index_name in self.index_names:
+            index_name = await self._write_partition(index_name, doc_id, "update")
+        return await self.client.update(index_name, doc_id, body)
+
+    async def bulk(self, actions):
+        routed = []
+        for action in actions:
+            if action["_index"] in self.index_names:
+                partition = await self._write_partition(
+                    action["_index"], action["_id"], action["_op_type"]
+                )
+                action = {**action, "_index": partition}
+            routed.append(action)
+        return await self.client.bulk(routed)
+
+    async def exists(self, index_name, doc_id):
+        if index_name not in self.index_names:
+            return await self.client.exists(index_name, doc_id)
+        return await self._find_partition(index_name, doc_id) is not None
+
+    async def search(self, index_name, body):
+        return await self._search(index_name, body, self.recent_partitions)
+
+    async def search_all(self, index_name, body):
+        return await self._search(index_name, body, 0)
+
+    async def _search(self, index_name, body, recent_partitions):
+        if index_name not in self.index_names:
+            return await self.client.search(index_name, body)
+
+        size = body.get("size", 10)
+        query = body.get("query", {})
+        fields = [
+            (field, order.get("order", "asc") if isinstance(order, dict) else order)
+            for s in body.get("sort", [])
+            for field, order in s.items()
+        ]
+        partitions = list(await self._load_partitions(index_name))
+        if recent_partitions > 0:
+            partitions = partitions[-recent_partitions:]
+        if not fields or fields[0] != (self.partition_field, "asc"):
+            partitions.reverse()  # newest first
+        # enough hits may be found before visiting every partition when the
+        # partitions are visited in the requested order
+        limit = None
+        if not fields:
+            limit = size
+            ids = (query.get("term") or query.get("terms") or {}).get("_id")
+            if ids is not None:
+                limit = min(size, len(ids) if isinstance(ids, list) else 1)
+        elif fields[0][0] == self.partition_field:
+            limit = size
+
+        hits = []
+        for i, partition in enumerate(partitions):
+            es_response = await self.client.search(partition, body)
+            hits.extend((es_response or {}).get("hits", {}).get("hits", []))
+            if limit is not None and len(hits) >= limit:
+                if not fields or i + 1 == len(partitions):
+                    break
+                # documents written around midnight may sit in the next
+                # partition, so merge it in before stopping
+                es_response = await self.client.search(partitions[i + 1], body)
+                hits.extend((es_response or {}).get("hits", {}).get("hits", []))
+                break
+
+        if fields:
+            descending = [order == "desc" for _, order in fields]
+            hits.sort(
+                key=cmp_to_key(
+                    lambda a, b: compare_sort_values(a["sort"], b["sort"], descending)
+                )
+            )
+        return {"hits": {"hits": hits[:size]}}
+
+    async def list_indices(self, prefix):
+        return await self.client.list_indices(prefix)
+
+    async def delete_index(self, index_name):
+        if index_name not in self.index_names:
+            return await self.client.delete_index(index_name)
+        for partition in await self._load_partitions(index_name):
+            await self.client.delete_index(partition)
+        self._partitions[index_name] = []
+        self._doc_partitions.clear()
+        return {"acknowledged": True}
+
+    async def close(self):
+        return await self.client.close()
@@ -0,0 +1,330 @@
+"""sqlite_es.py – SQLite backed Elasticsearch shim for single‑node deployments.
+
+Every index is a table ``(_id TEXT PRIMARY KEY, _source TEXT)`` holding the
+document as JSON in a WAL‑mode database, so readers never block the writer and
+a crash cannot lose acknowledged writes.  ``create_index`` turns each
+``keyword`` field of the mapping into an expression index on
+``json_extract(_source, '$.field')`` and ``search`` translates the query subset
+OxyGent uses (``term``/``terms``/``bool``/``match_all``, ``sort``, ``size`` and
+``search_after``) into SQL that can use those indexes.
+
+All writes go through one dedicated thread, reads through a small pool of
+threads with their own connections, so the event loop never blocks on IO.
+
+The MAS uses it instead of ``LocalEs`` when ``local_es.backend`` is ``"sqlite"``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from oxygent.config import Config
+
+from .base_es import BaseEs
+
+logger = logging.getLogger(__name__)
+
+_FIELD_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SqliteEs(BaseEs):
+    """Elasticsearch shim persisting documents to a SQLite database."""
+
+    def __init__(self, db_path: Optional[str] = None, read_workers: int = 4) -> None:
+        if db_path is None:
+            data_dir = os.path.join(Config.get_cache_save_dir(), "local_es_data")
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = os.path.join(data_dir, "local_es.db")
+        self.db_path = db_path
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite_es_writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=read_workers, thread_name_prefix="sqlite_es_reader"
+        )
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._tables: set[str] = set()  # only touched by the writer thread
+
+    # ------------------------------------------------------------------
+    # Thread side helpers
+    # ------------------------------------------------------------------
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection owned by the calling thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.db_path, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    async def _write(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, func, *args)
+
+    async def _read(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, func, *args)
+
+    @staticmethod
+    def _table(index_name: str) -> str:
+        return '"' + index_name.replace('"', '""') + '"'
+
+    @staticmethod
+    def _field(field: str) -> str:
+        """Return the SQL expression reading *field* from a document."""
+        if field == "_id":
+            return "_id"
+        if not _FIELD_PATTERN.match(field):
+            raise ValueError(f"Unsupported field name: {field}")
+        return f"json_extract(_source, '$.{field}')"
+
+    @staticmethod
+    def _param(value: Any) -> Any:
+        """Convert *value* to what ``json_extract`` returns for it."""
+        if isinstance(value, (list, dict)):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        return value
+
+    def _ensure_table(self, conn: sqlite3.Connection, index_name: str) -> None:
+        if index_name in self._tables:
+            return
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._table(index_name)} "
+            "(_id TEXT PRIMARY KEY, _source TEXT NOT NULL)"
+        )
+        self._tables.add(index_name)
+
+    def _create_index_sync(self, index_name: str, body: dict[str, Any]) -> None:
+        conn = self._connection()
+        self._ensure_table(conn, index_name)
+        properties = (body.get("mappings") or {}).get("properties") or {}
+        for field, spec in properties.items():
+            if not isinstance(spec, dict) or spec.get("type") != "keyword":
+                continue
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS "
+                f"{self._table(f'{index_name}__{field}')} "
+                f"ON {self._table(index_name)} ({self._field(field)})"
+            )
+
+    def _write_sync(self, actions: list[tuple[str, str, dict[str, Any], bool]]) -> None:
+        """Apply ``(index_name, doc_id, body, update_mode)`` in one transaction."""
+        conn = self._connection()
+        for index_name, _, _, _ in actions:
+            self._ensure_table(conn, index_name)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for index_name, doc_id, body, update_mode in actions:
+                table = self._table(index_name)
+                if update_mode:
+                    row = conn.execute(
+                        f"SELECT _source FROM {table} WHERE _id = ?", (doc_id,)
+                    ).fetchone()
+                    source = json.loads(row[0]) if row else {}
+                    source.update(body)
+                else:
+                    source = body
+                # an upsert keeps the rowid, which orders ties like insertion order
+                conn.execute(
+                    f"INSERT INTO {table} (_id, _source) VALUES (?, ?) "
+                    "ON CONFLICT(_id) DO UPDATE SET _source = excluded._source",
+                    (doc_id, json.dumps(source, ensure_ascii=False)),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _drop_table_sync(self, index_name: str) -> None:
+        self._connection().execute(f"DROP TABLE IF EXISTS {self._table(index_name)}")
+        self._tables.discard(index_name)
+
+    def _select_sync(self, sql: str, params: list[Any]) -> list[tuple]:
+        try:
+            return self._connection().execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                return []
+            raise
+
+    # ------------------------------------------------------------------
+    # Query translation
+    # ------------------------------------------------------------------
+
+    def _where(self, query: dict[str, Any], params: list[Any]) -> str:
+        """Translate an ES *query* into a SQL condition, filling *params*."""
+        if not query or "match_all" in query:
+            return "1"
+
+        if "term" in query:
+            k, v = next(iter(query["term"].items()))
+            params.append(self._param(v))
+            return f"{self._field(k)} IS ?"
+
+        if "terms" in query:
+            k, vlist = next(iter(query["terms"].items()))
+            values = [self._param(v) for v in vlist if v is not None]
+            clauses = []
+            if values:
+                params.extend(values)
+                placeholders = ", ".join("?" * len(values))
+                clauses.append(f"{self._field(k)} IN ({placeholders})")
+            if len(values) != len(vlist):
+                clauses.append(f"{self._field(k)} IS NULL")
+            return "(" + " OR ".join(clauses) + ")" if clauses else "0"
+
+        if "bool" in query:
+            bool_query = query["bool"]
+            clauses = []
+            for cond in bool_query.get("must", []) + bool_query.get("filter", []):
+                clauses.append(self._where(cond, params))
+            # as in ES, ``should`` only filters when nothing is required
+            if bool_query.get("should") and not clauses:
+                should = [self._where(c, params) for c in bool_query["should"]]
+                clauses.append("(" + " OR ".join(should) + ")")
+            for cond in bool_query.get("must_not", []):
+                clauses.append(f"NOT {self._where(cond, params)}")
+            return "(" + " AND ".join(clauses) + ")" if clauses else "1"
+
+        raise ValueError(f"Unsupported query: {query}")
+
+    @staticmethod
+    def _sort_fields(spec: list[dict[str, Any]]) -> list[tuple[str, bool]]:
+        return [
+            (
+                field,
+                (order.get("order", "asc") if isinstance(order, dict) else order)
+                == "desc",
+            )
+            for s in spec
+            for field, order in s.items()
+        ]
+
+    def _search_after(
+        self,
+        fields: list[tuple[str, bool]],
+        values: list[Any],
+        params: list[Any],
+    ) -> str:
+        """Condition selecting rows strictly after the *values* cursor.
+
+        Missing values sort last, matching the ``ORDER BY`` built by ``search``.
+        """
+        alternatives = []
+        for i, ((field, desc), value) in enumerate(zip(fields, values)):
+            if value is not None:
+                clause = [f"{self._field(f)} IS ?" for f, _ in fields[:i]]
+                clause.append(
+                    f"({self._field(field)} {'<' if desc else '>'} ? "
+                    f"OR {self._field(field)} IS NULL)"
+                )
+                params.extend(self._param(v) for v in values[:i])
+                params.append(self._param(value))
+                alternatives.append("(" + " AND ".join(clause) + ")")
+        return "(" + " OR ".join(alternatives) + ")" if alternatives else "0"
+
+    # ------------------------------------------------------------------
+    # Public ES‑like API
+    # ------------------------------------------------------------------
+
+    async def create_index(
+        self, index_name: str, body: dict[str, Any]
+    ) -> dict[str, bool]:
+        if not index_name or not body:
+            raise ValueError("index_name and body must not be empty")
+        await self._write(self._create_index_sync, index_name, body)
+        return {"acknowledged": True}
+
+    async def index(self, index_name: str, doc_id: str, body: dict[str, Any]):
+        await self._write(self._write_sync, [(index_name, doc_id, body, False)])
+        return {"_id": doc_id, "result": "created"}
+
+    async def update(self, index_name: str, doc_id: str, body: dict[str, Any]):
+        await self._write(self._write_sync, [(index_name, doc_id, body, True)])
+        return {"_id": doc_id, "result": "updated"}
+
+    async def bulk(self, actions: list[dict[str, Any]]) -> dict[str, Any]:
+        """Apply *actions* in a single transaction."""
+        ops, items = [], []
+        for action in actions:
+            update_mode = action["_op_type"] == "update"
+            ops.append(
+                (action["_index"], action["_id"], action["_source"], update_mode)
+            )
+            result = "updated" if update_mode else "created"
+            items.append({action["_op_type"]: {"_id": action["_id"], "result": result}})
+        await self._write(self._write_sync, ops)
+        return {"errors": False, "items": items}
+
+    async def list_indices(self, prefix: str) -> list[str]:
+        rows = await self._read(
+            self._select_sync,
+            "SELECT name FROM sqlite_master WHERE type = 'table'",
+            [],
+        )
+        return sorted(name for (name,) in rows if name.startswith(prefix))
+
+    async def delete_index(self, index_name: str) -> dict[str, bool]:
+        await self._write(self._drop_table_sync, index_name)
+        return {"acknowledged": True}
+
+    async def exists(self, index_name: str, doc_id: str) -> bool:
+        rows = await self._read(
+            self._select_sync,
+            f"SELECT 1 FROM {self._table(index_name)} WHERE _id = ?",
+            [doc_id],
+        )
+        return bool(rows)
+
+    async def search(self, index_name: str, body: dict[str, Any]):
+        params: list[Any] = []
+        fields = self._sort_fields(body.get("sort", []))
+        sort_columns = "".join(f", {self._field(f)}" for f, _ in fields)
+        where = self._where(body.get("query", {}), params)
+        if body.get("search_after") is not None and fields:
+            where += " AND " + self._search_after(fields, body["search_after"], params)
+        order_by = "".join(
+            f"{self._field(f)} IS NULL, {self._field(f)} {'DESC' if desc else 'ASC'}, "
+            for f, desc in fields
+        )
+        sql = (
+            f"SELECT _id, _source{sort_columns} FROM {self._table(index_name)} "
+            f"WHERE {where} ORDER BY {order_by}rowid LIMIT ?"
+        )
+        params.append(body.get("size", 10))
+
+        rows = await self._read(self._select_sync, sql, params)
+        hits = []
+        for row in rows:
+            hit = {"_id": row[0], "_source": json.loads(row[1])}
+            if fields:
+                hit["sort"] = list(row[2:])
+            hits.append(hit)
+        return {"hits": {"hits": hits}}
+
+    async def close(self) -> bool:
+        """Finish pending writes, then close every connection."""
+        await asyncio.to_thread(self._writer.shutdown, wait=True)
+        await asyncio.to_thread(self._readers.shutdown, wait=True)
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        return True
@@ -23,6 +23,7 @@ class BaseRedis(BaseDB, ABC):
     - Basic key-value operations (get, set, delete)
     - Batch operations (mget, mset)
     - List operations (lpush, brpop, lrange, ltrim)
+    - Stream operations (xadd, xread)
     - Key management (exists, expire)
     """
 
@@ -195,3 +196,32 @@ class BaseRedis(BaseDB, ABC):
             NotImplementedError: This method must be implemented by subclasses
         """
         pass
+
+    @abstractmethod
+    async def xadd(self, key: str, fields: dict, ex: int = None):
+        """Append an entry to a stream.
+
+        Args:
+            key: The stream key
+            fields: The field-value pairs of the entry
+            ex: Optional expiration time in seconds of the stream
+
+        Raises:
+            NotImplementedError: This method must be implemented by subclasses
+        """
+        pass
+
+    @abstractmethod
+    async def xread(self, key: str, last_id: str = "0-0", count=None, timeout=None):
+        """Read the entries of a stream after *last_id* without removing them.
+
+        Args:
+            key: The stream key
+            last_id: Id of the last entry already read
+            count: Maximum number of entries to return
+            timeout: Seconds to wait for an entry, ``None`` does not wait
+
+        Raises:
+            NotImplementedError: This method must be implemented by subclasses
+        """
+        pass
@@ -12,8 +12,8 @@ import traceback
 from functools import wraps
 from typing import Union
 
-from aioredis import Redis
-from aioredis.exceptions import ConnectionError, TimeoutError
+from aioredis import BlockingConnectionPool, Redis
+from aioredis.exceptions import ConnectionError, ResponseError, TimeoutError
 
 from ...config import Config
 
@@ -25,6 +25,8 @@ def retry_decorator(func):
 
     This decorator handles connection errors by automatically reconnecting
     and retrying the operation once. Other exceptions are logged and return None.
+    Only the pool of the regular commands is reconnected: the waiting blocking
+    commands keep their connections.
 
     Args:
         func: The Redis operation function to wrap
@@ -40,7 +42,7 @@ def retry_decorator(func):
         except (ConnectionError, ConnectionResetError, TimeoutError) as e:
             logger.error(f"Reconnect for Connection Error in {func.__name__}: {str(e)}")
             # Close current connection and retry
-            await self.close()
+            await self._close_pool(self.redis_pool)
             self.redis_pool = self._get_redis_connection()
             return await func(self, *args, **kwargs)
         except Exception as e:
@@ -59,19 +61,37 @@ class JimdbApRedis:
     built-in size limits and expiration handling.
     """
 
-    def __init__(self, host, port, password, db=0):
+    def __init__(
+        self,
+        host,
+        port,
+        password,
+        db=0,
+        max_connections=5,
+        max_blocking_connections=None,
+    ):
         """Initialize the JimDB Redis client.
 
         Args:
             host: Redis server hostname or IP address
             port: Redis server port number
             password: Authentication password for Redis server
+            max_connections: Size of the pool serving the regular commands
+            max_blocking_connections: Size of the pool serving ``brpop`` and
+                blocking ``xread``, i.e. the number of pops that can wait at the
+                same time (default: ``redis_param.max_blocking_connections``)
         """
         self.host = host
         self.port = port
         self.password = password
         self.db = db
+        self.max_connections = max_connections
         self.redis_pool = None
+        self.blocking_pool = None
+        if max_blocking_connections is None:
+            max_blocking_connections = Config.get_redis_max_blocking_connections()
+        self.max_blocking_connections = max_blocking_connections
+        self.brpop_supported = True
         self.default_expire_time = Config.get_redis_expire_time()
         self.default_list_max_size = Config.get_redis_max_size()
         self.default_list_max_length = Config.get_redis_max_length() * 1024
@@ -92,20 +112,65 @@ class JimdbApRedis:
         return Redis.from_url(
             f"redis://{self.host}:{self.port}/{self.db}",
             password=self.password,
-            max_connections=5,
+            max_connections=self.max_connections,
             # decode_responses=True,  # Automatic decoding (disabled)
             health_check_interval=30,
         )
 
+    def _get_blocking_connection(self):
+        """Create the connection pool serving blocking commands.
+
+        Pops waiting beyond ``max_blocking_connections`` queue for a free
+        connection instead of failing.
+
+        Returns:
+            Redis: Redis client on a blocking connection pool
+        """
+        return Redis(
+            connection_pool=BlockingConnectionPool.from_url(
+                f"redis://{self.host}:{self.port}/{self.db}",
+                password=self.password,
+                max_connections=self.max_blocking_connections,
+                health_check_interval=30,
+            )
+        )
+
     async def close(self):
         """Close the Redis connection pool and clean up resources.
 
         This method properly closes all connections and disconnects the pool to prevent
         resource leaks.
         """
-        if self.redis_pool is not None:
-            await self.redis_pool.close()
-            await self.redis_pool.connection_pool.disconnect()
+        for pool in (self.redis_pool, self.blocking_pool):
+            await self._close_pool(pool)
+
+    @staticmethod
+    async def _close_pool(pool):
+        if pool is not None:
+            await pool.close()
+            await pool.connection_pool.disconnect()
+
+    async def _blocking_command(self, name, *args, **kwargs):
+        """Send the blocking command *name* on the pool dedicated to them.
+
+        The pool is never reset: the client already drops a connection that
+        fails, and resetting would cut every other waiting command. When all
+        ``max_blocking_connections`` stay busy, the call gives up like a timeout
+        and returns None, so the caller backs off and retries.
+        """
+        if self.blocking_pool is None:
+            self.blocking_pool = self._get_blocking_connection()
+        try:
+            return await getattr(self.blocking_pool, name)(*args, **kwargs)
+        except (ConnectionError, ConnectionResetError, TimeoutError) as e:
+            if "No connection available" in str(e):
+                logger.warning(
+                    f"All {self.max_blocking_connections} blocking connections "
+                    f"are busy, {name} gives up for now"
+                )
+            else:
+                logger.error(f"Error in {name}: {str(e)}")
+            return None
 
     @retry_decorator
     async def set(self, key, value, ex=86400):  # Key-value expiration time is 1 day
@@ -210,12 +275,14 @@ class JimdbApRedis:
         ex: int = None,
         max_size: int = None,
         max_length: int = None,
+        transaction: bool = False,
     ):
         """Push values to the left (head) of a list with size and length limits.
 
         This enhanced lpush operation includes automatic list trimming to maintain
-        size limits, value length truncation, and expiration setting. It uses
-        Redis pipeline for atomic operations.
+        size limits, value length truncation, and expiration setting. The push,
+        trim and expire are sent in one pipeline, i.e. one round trip, however
+        many values are pushed.
 
         Args:
             key: The list key
@@ -223,6 +290,8 @@ class JimdbApRedis:
             ex: Expiration time in seconds (default: 1 day)
             max_size: Maximum number of elements to keep in list (default: 10)
             max_length: Maximum length for string values (default: 20MB)
+            transaction: Wrap the commands in MULTI/EXEC, so no client sees
+                the list untrimmed or without expiry
 
         Returns:
             int: The length of the list after the push operation
@@ -237,8 +306,29 @@ class JimdbApRedis:
             max_size = self.default_list_max_size
         if max_length is None:
             max_length = self.default_list_max_length
-        # Default value lehgth: 3
-        # Process and validate input values
+        new_values = self._process_values(values, max_length)
+
+        async with self.redis_pool.pipeline(transaction=transaction) as pipe:
+            # Batch commands: use pipeline for operations
+            pipe.lpush(key, *new_values)
+            pipe.ltrim(key, 0, max_size - 1)
+            pipe.expire(key, ex)
+
+            results = await pipe.execute()
+            return results[0]
+
+    async def lpush_batch(self, key: str, values: list, **kwargs):
+        """Push several values in one round trip, ``rpop`` returns them in order.
+
+        Accepts the keyword arguments of ``lpush``.
+
+        Returns:
+            int: The length of the list after the push operation
+        """
+        return await self.lpush(key, *values, **kwargs)
+
+    def _process_values(self, values, max_length):
+        """Validate *values* and truncate them to *max_length*."""
         new_values = []
         for value in values:
             if isinstance(value, (str, bytes)):
@@ -249,15 +339,7 @@ class JimdbApRedis:
                 new_values.append(json.dumps(value, ensure_ascii=False)[:max_length])
             else:
                 raise ValueError(f"Unsupported value type: {type(value)}")
-
-        async with self.redis_pool.pipeline(transaction=False) as pipe:
-            # Batch commands: use pipeline for operations
-            pipe.lpush(key, *new_values)
-            pipe.ltrim(key, 0, max_size - 1)
-            pipe.expire(key, ex)
-
-            results = await pipe.execute()
-            return results[0]
+        return new_values
 
     async def rpop(self, key: str):  # Waiting for 1 sec for default
         """Remove and return the last element of a list.
@@ -270,27 +352,131 @@ class JimdbApRedis:
         """
         return await self.redis_pool.rpop(key)
 
-    # @retry_decorator
-    async def brpop(self, key: str, timeout=1):  # Waiting for 1 sec for default
+    async def brpop(self, key: str, timeout=1):
         """Blocking pop operation that removes and returns the last element of a list.
 
-        NOTE: Since JimDB doesn't support brpop, this implementation simulates
-        blocking behavior using rpop with sleep fallback.
+        Sends ``BRPOP`` on a dedicated pool, so waiting calls never starve the
+        regular commands of connections. Servers rejecting ``BRPOP`` are
+        polled with ``RPOP`` every 100 ms instead.
 
         Args:
             key: The list key to pop from
-            timeout: Maximum time to wait in seconds (default: 1)
+            timeout: Maximum time to wait in seconds, ``0`` waits forever (default: 1)
+
+        Returns:
+            Optional[bytes]: The popped element, None if the timeout expired
+        """
+        if self.brpop_supported:
+            try:
+                result = await self._blocking_command("brpop", key, timeout=timeout)
+                return result[1] if result else None
+            except ResponseError as e:
+                if "unknown command" not in str(e).lower():
+                    logger.error(f"Error in brpop: {str(e)}")
+                    return None
+                logger.warning("BRPOP is not supported, polling with RPOP instead")
+                self.brpop_supported = False
+        return await self._poll_rpop(key, timeout)
+
+    @retry_decorator
+    async def _poll_rpop(self, key: str, timeout):
+        """Simulate ``brpop`` by polling with ``RPOP`` every 100 ms."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        while True:
+            value = await self.redis_pool.rpop(key)
+            if value is not None or (deadline is not None and loop.time() >= deadline):
+                return value
+            await asyncio.sleep(0.1)
+
+    async def xadd(self, key: str, fields: dict, ex: int = None, max_size: int = None):
+        """Append an entry to a stream, capped to about ``max_size`` entries.
+
+        Args:
+            key: The stream key
+            fields: The field-value pairs of the entry
+            ex: Expiration time in seconds of the stream (default: 1 day)
+            max_size: Maximum number of entries to keep (approximate trimming)
+
+        Returns:
+            Optional[str]: The id of the new entry
+        """
+        entry_ids = await self.xadd_batch(key, [fields], ex=ex, max_size=max_size)
+        return entry_ids[0] if entry_ids else None
+
+    @retry_decorator
+    async def xadd_batch(
+        self, key: str, fields_list: list, ex: int = None, max_size: int = None
+    ):
+        """Append several entries to a stream in one round trip.
+
+        Args:
+            key: The stream key
+            fields_list: The field-value pairs of each entry, in order
+            ex: Expiration time in seconds of the stream (default: 1 day)
+            max_size: Maximum number of entries to keep (approximate trimming)
 
         Returns:
-            Optional[bytes]: The response of the simulated brpop operation
+            Optional[List[str]]: The ids of the new entries
         """
-        # Simulating brpop
-        value = await self.redis_pool.rpop(key)
-        if value is not None:
-            return value
-        else:  # Simulating blocking by sleeping and trying again
-            await asyncio.sleep(timeout)
-            return await self.redis_pool.rpop(key)
+        if ex is None:
+            ex = self.default_expire_time
+        if max_size is None:
+            max_size = self.default_list_max_size
+        async with self.redis_pool.pipeline(transaction=False) as pipe:
+            for fields in fields_list:
+                pipe.xadd(key, fields, maxlen=max_size, approximate=True)
+            pipe.expire(key, ex)
+            results = await pipe.execute()
+        return [
+            entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+            for entry_id in results[:-1]
+        ]
+
+    async def xread(self, key: str, last_id="0-0", count=None, timeout=None):
+        """Read the entries of a stream after *last_id* without removing them.
+
+        Blocking reads are sent on the pool serving ``brpop``.
+
+        Args:
+            key: The stream key
+            last_id: Id of the last entry already read, ``"0-0"`` reads from the
+                start and ``"$"`` only returns entries added from now on
+            count: Maximum number of entries to return
+            timeout: Seconds to wait for an entry if there is none, ``None``
+                does not wait and ``0`` waits forever
+
+        Returns:
+            Optional[List[Tuple[str, dict]]]: The ``(id, fields)`` entries with
+                str ids and field names, oldest first
+        """
+        if timeout is None:
+            response = await self._xread({key: last_id}, count=count)
+        else:
+            try:
+                response = await self._blocking_command(
+                    "xread", {key: last_id}, count=count, block=int(timeout * 1000)
+                )
+            except ResponseError as e:
+                logger.error(f"Error in xread: {str(e)}")
+                return None
+        entries = []
+        for _, stream_entries in response or []:
+            for entry_id, fields in stream_entries:
+                entries.append(
+                    (
+                        entry_id.decode() if isinstance(entry_id, bytes) else entry_id,
+                        {
+                            k.decode() if isinstance(k, bytes) else k: v
+                            for k, v in fields.items()
+                        },
+                    )
+                )
+        return entries
+
+    @retry_decorator
+    async def _xread(self, streams, count=None):
+        return await self.redis_pool.xread(streams, count=count)
 
     @retry_decorator
     async def lrange(self, key: str, start: int = 0, end: int = -1):
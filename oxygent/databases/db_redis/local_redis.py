@@ -8,8 +8,8 @@ requiring an actual Elasticsearch server.
 import asyncio
 import json
 import time
-from collections import deque
-from typing import Dict, Optional, Union
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple, Union
 
 from ...config import Config
 
@@ -23,20 +23,60 @@ class LocalRedis:
 
     Features:
     - In-memory key-value storage using deques for list operations
-    - Automatic expiration handling with TTL support
+    - Automatic expiration handling with TTL support, lazily on access and by
+      a background sweeper
+    - A global memory budget, evicting the least recently used keys
     - List operations with configurable size limits
+    - Blocking pops woken up directly by pushes to the awaited key
+    - Append-only streams read by any number of consumers, like Redis Streams
     - Value type validation and conversion
     """
 
-    def __init__(self, *, yield_on_ops: bool = True):
-        self.data: Dict[str, deque] = {}
+    def __init__(
+        self,
+        *,
+        yield_on_ops: bool = True,
+        max_bytes: Optional[int] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        """Initialize the store.
+
+        Args:
+            yield_on_ops: Yield the event loop once per operation for fairness.
+            max_bytes: Memory budget of all values, ``0`` for no limit
+                (default: ``redis_param.max_memory`` MB).
+            sweep_interval: Seconds between two sweeps of the expired keys
+                (default: ``redis_param.sweep_interval``).
+        """
+        self.data: Dict[str, deque] = OrderedDict()  # least recently used first
         self.expiry: Dict[str, float] = {}
         self.default_expire_time = Config.get_redis_expire_time()
         self.default_list_max_size = Config.get_redis_max_size()
         self.default_list_max_length = Config.get_redis_max_length() * 1024
+        # Futures of the brpop calls waiting for each key, oldest first
+        self._waiters: Dict[str, deque] = {}
+        # Futures of the xread calls waiting for each stream
+        self._stream_waiters: Dict[str, list] = {}
+        self._stream_last_ids: Dict[str, Tuple[int, int]] = {}
         # When True, each mutating/read pop yields the event loop once for fairness.
         self._yield_on_ops = yield_on_ops
 
+        self.max_bytes = (
+            Config.get_redis_max_memory() * 1024 * 1024
+            if max_bytes is None
+            else max_bytes
+        )
+        self.sweep_interval = (
+            Config.get_redis_sweep_interval()
+            if sweep_interval is None
+            else sweep_interval
+        )
+        self.used_bytes = 0
+        self._key_bytes: Dict[str, int] = {}
+        self.evictions = 0
+        self.expirations = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
     async def lpush(
         self,
         key: str,
@@ -94,16 +134,38 @@ class LocalRedis:
             else:
                 raise ValueError(f"Unsupported value type: {type(value)}")
 
+        # The deque keeps the first maxlen items of new_values + old items
+        items = self.data[key]
+        added = sum(self._sizeof(v) for v in new_values)
+        dropped = len(new_values) + len(items) - items.maxlen
+        if dropped > 0:
+            from_old = min(dropped, len(items))
+            added -= sum(self._sizeof(items[-i]) for i in range(1, from_old + 1))
+            added -= sum(self._sizeof(v) for v in new_values[items.maxlen :])
+
         # Add values to the laft (head) of the deque
         self.data[key].extendleft(
             reversed(new_values)
         )  # Use reserved to ensure proper order
         self.expiry[key] = time.time() + ex
+        self._account(key, added)
+        length = len(self.data[key])  # woken brpop calls may drop the key
+        self._wake_waiters(key, len(new_values))
 
         if self._yield_on_ops:
             await asyncio.sleep(0)
 
-        return len(self.data[key])
+        return length
+
+    async def lpush_batch(self, key: str, values: list, **kwargs) -> int:
+        """Push several values so that ``rpop`` returns them in the given order.
+
+        Accepts the keyword arguments of ``lpush``.
+
+        Returns:
+            int: The length of the list after the push operation
+        """
+        return await self.lpush(key, *reversed(values), **kwargs)
 
     async def rpop(self, key: str) -> Union[str, bytes, int, float, None]:
         """Remove and return the last (rightmost, tail) element from a list.
@@ -124,6 +186,9 @@ class LocalRedis:
         self._check_expiry(key)
         if key in self.data and self.data[key]:
             item = self.data[key].pop()
+            self._account(key, -self._sizeof(item))
+            if not self.data[key]:
+                self._delete_key(key)  # like Redis, drop emptied lists
 
             # Yield after a successful pop so producers/other tasks get a turn too
             if self._yield_on_ops:
@@ -136,6 +201,226 @@ class LocalRedis:
             await asyncio.sleep(0)
         return None
 
+    async def brpop(
+        self, key: str, timeout: float = 1
+    ) -> Union[str, bytes, int, float, None]:
+        """Remove and return the last element of a list, waiting for one if needed.
+
+        Unlike polling ``rpop``, a waiting call costs nothing until ``lpush``
+        targets *key*, which wakes up the oldest waiters right away.
+
+        Args:
+            key: The list key to pop from
+            timeout: Maximum time to wait in seconds, ``0`` waits forever
+
+        Returns:
+            The removed element, or None if none arrived before the timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        while True:
+            item = await self.rpop(key)
+            if item is not None:
+                return item
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return None
+            waiter = loop.create_future()
+            waiters = self._waiters.setdefault(key, deque())
+            waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                return await self.rpop(key)
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake_waiters(key, 1)  # hand the wakeup over
+                raise
+            finally:
+                if not waiter.done():
+                    waiter.cancel()
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if not waiters and self._waiters.get(key) is waiters:
+                    del self._waiters[key]
+
+    def _wake_waiters(self, key: str, count: int):
+        """Wake up to *count* brpop calls waiting for *key*."""
+        waiters = self._waiters.get(key)
+        while waiters and count > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                count -= 1
+
+    async def xadd(
+        self,
+        key: str,
+        fields: dict,
+        ex: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> str:
+        """Append an entry to a stream, like the Redis XADD command.
+
+        Entries get ids ``<milliseconds>-<sequence>`` that increase
+        monotonically within a stream, and are kept until the stream holds
+        more than ``max_size`` entries or expires; reading does not remove them.
+
+        Args:
+            key: The stream key
+            fields: The field-value pairs of the entry
+            ex: Expiration time in seconds of the stream (default: 1 day)
+            max_size: Maximum number of entries in the stream
+
+        Returns:
+            str: The id of the new entry
+        """
+        if ex is None:
+            ex = self.default_expire_time
+        if max_size is None:
+            max_size = self.default_list_max_size
+        self._check_expiry(key)
+
+        ms = int(time.time() * 1000)
+        last_ms, last_seq = self._stream_last_ids.get(key, (0, -1))
+        entry_id = (ms, 0) if ms > last_ms else (last_ms, last_seq + 1)
+        self._stream_last_ids[key] = entry_id
+
+        if key not in self.data:
+            self.data[key] = deque(maxlen=max_size)
+        items = self.data[key]
+        entry = (entry_id, dict(fields))
+        added = self._sizeof(entry)
+        if len(items) == items.maxlen:
+            added -= self._sizeof(items[0])
+        items.append(entry)
+        self.expiry[key] = time.time() + ex
+        self._account(key, added)
+
+        for waiter in self._stream_waiters.pop(key, []):
+            if not waiter.done():
+                waiter.set_result(None)
+
+        if self._yield_on_ops:
+            await asyncio.sleep(0)
+
+        return f"{entry_id[0]}-{entry_id[1]}"
+
+    async def xadd_batch(
+        self,
+        key: str,
+        fields_list: List[dict],
+        ex: Optional[int] = None,
+        max_size: Optional[int] = None,
+    ) -> List[str]:
+        """Append several entries to a stream, see ``xadd``.
+
+        Returns:
+            List[str]: The ids of the new entries
+        """
+        return [
+            await self.xadd(key, fields, ex=ex, max_size=max_size)
+            for fields in fields_list
+        ]
+
+    async def xread(
+        self,
+        key: str,
+        last_id: str = "0-0",
+        count: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Tuple[str, dict]]:
+        """Read the entries of a stream after *last_id*, like XREAD.
+
+        Args:
+            key: The stream key
+            last_id: Id of the last entry already read, ``"0-0"`` reads from the
+                start and ``"$"`` only returns entries added from now on
+            count: Maximum number of entries to return
+            timeout: Seconds to wait for an entry if there is none, ``None``
+                does not wait and ``0`` waits forever
+
+        Returns:
+            List[Tuple[str, dict]]: The ``(id, fields)`` entries, oldest first
+        """
+        self._check_expiry(key)
+        if last_id == "$":
+            after = self._stream_last_ids.get(key, (0, 0))
+        else:
+            after = self._parse_stream_id(last_id)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        while True:
+            entries = self._entries_after(key, after, count)
+            if entries or timeout is None:
+                break
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                break
+            waiter = loop.create_future()
+            self._stream_waiters.setdefault(key, []).append(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                waiters = self._stream_waiters.get(key)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._stream_waiters[key]
+
+        if self._yield_on_ops:
+            await asyncio.sleep(0)
+        return [(f"{ms}-{seq}", fields) for (ms, seq), fields in entries]
+
+    @staticmethod
+    def _parse_stream_id(entry_id: str) -> Tuple[int, int]:
+        ms, _, seq = str(entry_id).partition("-")
+        return int(ms), int(seq or 0)
+
+    def _entries_after(
+        self, key: str, after: Tuple[int, int], count: Optional[int]
+    ) -> list:
+        self._check_expiry(key)
+        if key in self.data:
+            self.data.move_to_end(key)
+        entries = []
+        for entry in reversed(self.data.get(key, ())):
+            if entry[0] <= after:
+                break
+            entries.append(entry)
+        entries.reverse()
+        return entries[:count] if count else entries
+
+    @staticmethod
+    def _sizeof(item) -> int:
+        """Approximate memory use of a list item or stream entry."""
+        if isinstance(item, (str, bytes)):
+            return len(item)
+        if isinstance(item, tuple):  # stream entry
+            return 16 + sum(len(k) + LocalRedis._sizeof(v) for k, v in item[1].items())
+        return 8
+
+    def _account(self, key: str, added: int):
+        """Record *added* bytes for *key*, evicting other keys over budget."""
+        self._key_bytes[key] = self._key_bytes.get(key, 0) + added
+        self.used_bytes += added
+        self.data.move_to_end(key)
+        if self.max_bytes and self.used_bytes > self.max_bytes:
+            for lru_key in list(self.data):
+                if self.used_bytes <= self.max_bytes:
+                    break
+                if lru_key != key:
+                    self._delete_key(lru_key)
+                    self.evictions += 1
+
+    def _delete_key(self, key: str):
+        self.data.pop(key, None)
+        self.expiry.pop(key, None)
+        self.used_bytes -= self._key_bytes.pop(key, 0)
+        self._stream_last_ids.pop(key, None)
+
     def _check_expiry(self, key: str):
         """Check if a key has expired and remove it if necessary.
 
@@ -143,11 +428,59 @@ class LocalRedis:
             key: The key to check for expiration
         """
         if key in self.expiry and time.time() > self.expiry[key]:
-            del self.data[key]
-            del self.expiry[key]
+            self._delete_key(key)
+            self.expirations += 1
+
+    async def sweep(self, batch_size: int = 1000) -> int:
+        """Remove every expired key.
+
+        Keys are checked *batch_size* at a time, yielding the event loop in
+        between, so a sweep never blocks other tasks for long.
+
+        Returns:
+            int: The number of removed keys
+        """
+        keys = list(self.expiry)
+        expired = 0
+        for i in range(0, len(keys), batch_size):
+            now = time.time()
+            for key in keys[i : i + batch_size]:
+                expire_at = self.expiry.get(key)
+                if expire_at is not None and now > expire_at:
+                    self._delete_key(key)
+                    expired += 1
+            await asyncio.sleep(0)
+        self.expirations += expired
+        return expired
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            await self.sweep()
+
+    def start_sweeper(self):
+        """Start sweeping expired keys every ``sweep_interval`` seconds.
+
+        Needs a running event loop; ``close`` stops it.
+        """
+        if self.sweep_interval and (self._sweeper is None or self._sweeper.done()):
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    def stats(self) -> dict:
+        """Return the number of keys, bytes used and keys removed so far."""
+        return {
+            "keys": len(self.data),
+            "bytes": self.used_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
 
     async def close(self):
         # This method is async to maintain compatibility with the Redis interface
         # Async for interface compatibility
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
         if self._yield_on_ops:
             await asyncio.sleep(0)
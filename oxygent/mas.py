@@ -24,12 +24,17 @@ import traceback
 from collections import OrderedDict
 from typing import Callable, Optional
 
-import msgpack
 from elasticsearch import AsyncElasticsearch
 from pydantic import BaseModel, ConfigDict, Field
 
 from .config import Config
-from .databases.db_es import JesEs, LocalEs
+from .databases.db_es import (
+    EsWriteBuffer,
+    JesEs,
+    LocalEs,
+    PartitionedEs,
+    SqliteEs,
+)
 from .databases.db_redis import JimdbApRedis, LocalRedis
 from .databases.db_vector import VearchDB
 from .db_factory import DBFactory
@@ -40,16 +45,21 @@ from .oxy.agents.remote_agent import RemoteAgent
 from .oxy.base_flow import BaseFlow
 from .oxy.base_tool import BaseTool
 from .oxy.llms.base_llm import BaseLLM
+from .oxy.llms.http_llm import HttpLLM
+from .oxy.llms.openai_llm import OpenAILLM
 from .oxy.mcp_tools.base_mcp_client import BaseMCPClient
 from .routes import router
 from .schemas import OxyRequest, OxyResponse, WebResponse
+from .utils.blob_utils import get_blob_index_name
+from .utils.cache_utils import HistoryCache, TieredCache
 from .utils.common_utils import (
     generate_uuid,
     get_format_time,
-    msgpack_preprocess,
     print_tree,
     to_json,
 )
+from .utils.data_utils import get_trace_meta, search_trace_nodes
+from .utils.message_utils import decode_message, encode_message
 
 logger = None
 
@@ -78,6 +88,15 @@ class MAS(BaseModel):
     vearch_client: Optional[VearchDB] = Field(None)
     es_client: Optional[AsyncElasticsearch] = Field(None)
     redis_client: Optional[JimdbApRedis] = Field(None)
+    trace_meta_cache: Optional[TieredCache] = Field(
+        None, exclude=True, description="cache of trace metadata for follow-up turns"
+    )
+    history_cache: Optional[HistoryCache] = Field(
+        None, exclude=True, description="cache of decoded short memories"
+    )
+    llm_cache: Optional[TieredCache] = Field(
+        None, exclude=True, description="cache of deterministic LLM responses"
+    )
 
     lock: bool = Field(False)
     active_tasks: dict = Field(default_factory=dict)
@@ -218,12 +237,12 @@ class MAS(BaseModel):
         """Gracefully shut down remote servers/clients.
 
         The method concurrently calls ``cleanup()`` on every
-        :class:`BaseMCPClient` that has been registered.  It is automatically
-        invoked by :func:`__aexit__`.
+        :class:`BaseMCPClient`, :class:`HttpLLM` and :class:`OpenAILLM` that has
+        been registered.  It is automatically invoked by :func:`__aexit__`.
         """
         cleanup_tasks = []
         for oxy in self.oxy_name_to_oxy.values():
-            if not isinstance(oxy, BaseMCPClient):
+            if not isinstance(oxy, (BaseMCPClient, HttpLLM, OpenAILLM)):
                 continue
             cleanup_tasks.append(asyncio.create_task(oxy.cleanup()))
 
@@ -249,8 +268,29 @@ class MAS(BaseModel):
             user = jes_config["user"]
             password = jes_config["password"]
             self.es_client = db_factory.get_instance(JesEs, hosts, user, password)
+        elif Config.get_local_es_backend() == "sqlite":
+            self.es_client = db_factory.get_instance(SqliteEs)
         else:
             self.es_client = db_factory.get_instance(LocalEs)
+        if Config.get_es_partition_is_enabled():
+            app_name = Config.get_app_name()
+            names = ("trace", "node", "message", "history")
+            self.es_client = PartitionedEs(
+                self.es_client,
+                [f"{app_name}_{name}" for name in names],
+                period=Config.get_es_partition_period(),
+                retention_days=Config.get_es_partition_retention_days(),
+                recent_partitions=Config.get_es_partition_recent_partitions(),
+            )
+        if Config.get_es_bulk_is_enabled():
+            self.es_client = EsWriteBuffer(
+                self.es_client,
+                batch_size=Config.get_es_bulk_batch_size(),
+                flush_interval=Config.get_es_bulk_flush_interval(),
+                hold_ms=Config.get_es_bulk_hold_ms(),
+                hold_indices=[Config.get_app_name() + "_node"],
+                max_pending=Config.get_es_bulk_max_pending(),
+            )
         # trace table
         await self.es_client.create_index(
             Config.get_app_name() + "_trace",
@@ -351,6 +391,20 @@ class MAS(BaseModel):
                 "settings": Config.get_es_settings_config(),
             },
         )
+        # blob table
+        if Config.get_blob_store_is_enabled():
+            await self.es_client.create_index(
+                get_blob_index_name(),
+                {
+                    "mappings": {
+                        "properties": {
+                            "blob_id": {"type": "keyword"},
+                            "content": {"type": "text", "index": False},
+                        },
+                    },
+                    "settings": Config.get_es_settings_config(),
+                },
+            )
 
         # init redis client
         redis_config = Config.get_redis_config()
@@ -359,11 +413,55 @@ class MAS(BaseModel):
             port = redis_config["port"]
             password = redis_config["password"]
             db = redis_config.get("db", 0)
+            # every oxy running at its concurrency limit may push messages
+            max_connections = Config.get_redis_max_connections() or max(
+                [5]
+                + [
+                    oxy.get_max_concurrency()
+                    for oxy in self.oxy_name_to_oxy.values()
+                ]
+            )
             self.redis_client = JimdbApRedis(
-                host=host, port=port, password=password, db=db
+                host=host,
+                port=port,
+                password=password,
+                db=db,
+                max_connections=max_connections,
+                max_blocking_connections=Config.get_redis_max_blocking_connections(),
             )
         else:
             self.redis_client = LocalRedis()
+            self.redis_client.start_sweeper()
+
+        # init trace metadata cache
+        if Config.get_trace_cache_is_enabled():
+            is_redis_backed = redis_config and Config.get_trace_cache_is_redis_backed()
+            self.trace_meta_cache = TieredCache(
+                prefix=f"{Config.get_app_name()}_trace_meta",
+                max_size=Config.get_trace_cache_max_size(),
+                ttl=Config.get_trace_cache_ttl(),
+                redis_client=self.redis_client if is_redis_backed else None,
+            )
+
+        # init short memory cache
+        if Config.get_history_cache_is_enabled():
+            self.history_cache = HistoryCache(
+                max_size=Config.get_history_cache_max_size(),
+                max_length=Config.get_history_cache_max_length(),
+            )
+
+        # init llm response cache, for the LLMs opting in
+        if any(
+            isinstance(oxy, BaseLLM) and oxy.is_cache
+            for oxy in self.oxy_name_to_oxy.values()
+        ):
+            is_redis_backed = redis_config and Config.get_llm_cache_is_redis_backed()
+            self.llm_cache = TieredCache(
+                prefix=f"{Config.get_app_name()}_llm_cache",
+                max_size=Config.get_llm_cache_max_size(),
+                ttl=Config.get_llm_cache_ttl(),
+                redis_client=self.redis_client if is_redis_backed else None,
+            )
 
     async def batch_init_oxy(self, *class_type):
         """Batch initialize oxy objects of specified types asynchronously.
@@ -569,49 +667,85 @@ class MAS(BaseModel):
     async def send_message(self, message, redis_key):
         """Push *message* onto a capped Redis list.
 
-        The data is MsgPack‑encoded before being stored.  At most **10** items
+        The data is serialized to its final SSE form before being stored.  At most **10** items
         are kept to bound memory usage for long‑running SSE connections.
+        With the ``stream`` message transport it is appended to a Redis stream
+        instead, where it stays readable by every observer of the trace.
 
         Args:
             message: Any serialisable Python object.
             redis_key: Target Redis key (usually ``mas_msg:{app}:{trace_id}``).
         """
-        if Config.get_message_is_show_in_terminal():
-            logger.info(f"--- Send Message ---: {message}")
-
-        message_type = ""
-        message_is_stored = Config.get_message_is_stored()
-        message_is_send = True
-        _is_stored, _is_send = "_is_stored", "_is_send"
-        if isinstance(message, dict):
-            message_type = message.get("type", "")
-            if _is_stored in message:
-                message_is_stored = message[_is_stored]
-                del message[_is_stored]
-            if _is_send in message:
-                message_is_send = message[_is_send]
-                del message[_is_send]
-
-        if message_is_stored:
-            parts = redis_key.split(":")
-            current_trace_id = parts[-1] if len(parts) >= 3 else ""
-
-            # Insert into Elasticsearch
-            message_id = generate_uuid()
+        await self.send_messages([message], redis_key)
+
+    async def send_messages(self, messages, redis_key):
+        """Send several messages of a trace at once, in order.
+
+        Works like ``send_message`` for each message, but the stored messages
+        are written with one bulk request and the sent ones with one push, so
+        the batch costs a single Redis round trip.
+
+        Args:
+            messages: Serialisable Python objects.
+            redis_key: Target Redis key (usually ``mas_msg:{app}:{trace_id}``).
+        """
+        parts = redis_key.split(":")
+        current_trace_id = parts[-1] if len(parts) >= 3 else ""
+        actions = []
+        bytes_msgs = []
+        for message in messages:
+            if Config.get_message_is_show_in_terminal():
+                logger.info(f"--- Send Message ---: {message}")
+
+            message_type = ""
+            message_is_stored = Config.get_message_is_stored()
+            message_is_send = True
+            _is_stored, _is_send = "_is_stored", "_is_send"
+            if isinstance(message, dict):
+                message_type = message.get("type", "")
+                if _is_stored in message:
+                    message_is_stored = message[_is_stored]
+                    del message[_is_stored]
+                if _is_send in message:
+                    message_is_send = message[_is_send]
+                    del message[_is_send]
+
+            if message_is_stored:
+                message_id = generate_uuid()
+                actions.append(
+                    {
+                        "_op_type": "index",
+                        "_index": Config.get_app_name() + "_message",
+                        "_id": message_id,
+                        "_source": {
+                            "message_id": message_id,
+                            "trace_id": current_trace_id,
+                            "message": to_json(message),
+                            "message_type": message_type,
+                            "create_time": get_format_time(),
+                        },
+                    }
+                )
+            if message_is_send and message:
+                bytes_msgs.append(encode_message(message))
+
+        # Insert into Elasticsearch
+        if len(actions) == 1:
             await self.es_client.index(
-                Config.get_app_name() + "_message",
-                doc_id=message_id,
-                body={
-                    "message_id": message_id,
-                    "trace_id": current_trace_id,
-                    "message": to_json(message),
-                    "message_type": message_type,
-                    "create_time": get_format_time(),
-                },
+                actions[0]["_index"],
+                doc_id=actions[0]["_id"],
+                body=actions[0]["_source"],
             )
-        if message_is_send:
-            bytes_msg = msgpack.packb(msgpack_preprocess(message))
-            await self.redis_client.lpush(redis_key, bytes_msg)
+        elif actions:
+            await self.es_client.bulk(actions)
+        if not bytes_msgs:
+            return
+        if Config.get_message_transport() == "stream":
+            await self.redis_client.xadd_batch(
+                redis_key, [{"data": bytes_msg} for bytes_msg in bytes_msgs]
+            )
+        else:
+            await self.redis_client.lpush_batch(redis_key, bytes_msgs)
 
     async def chat_with_agent(
         self,
@@ -643,7 +777,8 @@ class MAS(BaseModel):
             group_data = payload.get("group_data", {})
 
             if "restart_node_id" in payload and payload.get("restart_node_id"):
-                es_response = await self.es_client.search(
+                # the restarted trace may be older than the recent partitions
+                es_response = await self.es_client.search_all(
                     Config.get_app_name() + "_node",
                     {
                         "query": {"term": {"node_id": payload["restart_node_id"]}},
@@ -683,24 +818,30 @@ class MAS(BaseModel):
                         f"Restart node {payload['restart_node_id']} not found in ES"
                     )
 
+            # Load the reference trace once, so that the request interceptors
+            # replay from memory instead of searching ES for every node
+            reference_nodes = None
+            if payload.get("restart_node_id") and payload.get("reference_trace_id"):
+                reference_nodes = dict()
+                for hit in await search_trace_nodes(
+                    self.es_client, payload["reference_trace_id"], all_partitions=True
+                ):
+                    node = hit["_source"]
+                    reference_nodes.setdefault(node.get("input_md5"), node)
+
             oxy_request = OxyRequest(mas=self)
             oxy_request.group_data = group_data
             if "current_trace_id" in payload and payload["current_trace_id"]:
                 oxy_request.current_trace_id = payload["current_trace_id"]
             # Set group_id: inherit if from_trace_id is provided, else new
             if "from_trace_id" in payload and payload["from_trace_id"]:
-                es_response_group_id = await self.es_client.search(
-                    Config.get_app_name() + "_trace",
-                    {
-                        "query": {"term": {"_id": payload["from_trace_id"]}},
-                        "size": 1,
-                    },
+                trace_meta = await get_trace_meta(
+                    self.es_client, payload["from_trace_id"], self.trace_meta_cache
                 )
 
-                hits = es_response_group_id.get("hits", {}).get("hits", [])
-                if hits:
-                    oxy_request.group_id = hits[0]["_source"].get("group_id", "")
-                    raw_group_data = hits[0]["_source"].get("group_data", {})
+                if trace_meta:
+                    oxy_request.group_id = trace_meta.get("group_id", "")
+                    raw_group_data = trace_meta.get("group_data", {})
                     if isinstance(raw_group_data, str):
                         try:
                             history_group_data = json.loads(raw_group_data)
@@ -736,6 +877,8 @@ class MAS(BaseModel):
                     setattr(oxy_request, k, v)
                 else:
                     oxy_request.arguments[k] = v
+            # internal field, set after the payload so that it cannot override it
+            oxy_request.reference_nodes = reference_nodes
 
             if not oxy_request.callee:
                 oxy_request.callee = self.master_agent_name
@@ -781,52 +924,82 @@ class MAS(BaseModel):
     # FastAPI + SSE web service (unedited original docstring preserved)
     # ------------------------------------------------------------------
 
-    async def event_stream(self, redis_key, current_trace_id, task):
-        try:
-            task.add_done_callback(
-                lambda future: self.active_tasks.pop(current_trace_id, None)
-            )
-            self.active_tasks[current_trace_id] = task
+    async def _read_messages(self, redis_key, last_event_id=None):
+        """Yield the ``(event_id, value)`` pairs sent to *redis_key*.
+
+        The list transport pops the messages, so each one is read once and has
+        no id. The stream transport reads them after *last_event_id* without
+        removing them, so readers can resume and observe the same trace.
+        """
+        loop = asyncio.get_running_loop()
+        if Config.get_message_transport() == "stream":
+            last_id = last_event_id or "0-0"
+            while True:
+                start_time = loop.time()
+                entries = await self.redis_client.xread(redis_key, last_id, timeout=5)
+                if not entries and loop.time() - start_time < 1:
+                    await asyncio.sleep(0.1)  # failed read, not a timeout
+                for last_id, fields in entries or []:
+                    yield last_id, fields["data"]
+        else:
             while True:
-                bytes_msg = await self.redis_client.rpop(redis_key)
+                # Wakes up as soon as a message is pushed; the timeout only
+                # bounds how long an idle stream holds a redis connection
+                start_time = loop.time()
+                bytes_msg = await self.redis_client.brpop(redis_key, timeout=5)
                 if bytes_msg is None:
-                    await asyncio.sleep(0.1)
+                    # Redis errors are logged and return None right away
+                    if loop.time() - start_time < 1:
+                        await asyncio.sleep(0.1)
                     continue
-                message = msgpack.unpackb(bytes_msg)
-                if message:
-                    if isinstance(message, dict):
-                        if "event" in message:
-                            yield message
-                            logger.info(
-                                "SSE connection terminated.",
-                                extra={"trace_id": current_trace_id},
-                            )
-                            break
-                        # Convert before sending message: Use msg.content.arguments.query
-                        if message.get("type", "") == "tool_call" and isinstance(
-                            message.get("content", {})
-                            .get("arguments", {})
-                            .get("query", ""),
-                            list,
-                        ):
-                            for msg in message["content"]["arguments"]["query"]:
-                                if msg.get("type") == "text":
-                                    message["content"]["arguments"]["query"] = msg.get(
-                                        "text", ""
-                                    )
-                                    break
-                        if message.get("type", "") == "observation":
-                            message["content"]["output"] = to_json(
-                                message["content"]["output"]
-                            )
-                    # Send message
-                    yield {"data": to_json(message)}
+                yield None, bytes_msg
+
+    async def event_stream(
+        self, redis_key, current_trace_id, task=None, last_event_id=None
+    ):
+        """Yield the SSE events of a trace until its close event.
+
+        Messages were serialized to their final form by ``send_message``, so
+        they are passed through without being decoded again.
+
+        Args:
+            redis_key: The message key of the trace.
+            current_trace_id: The trace to stream.
+            task: The task running the trace, cancelled when the client
+                disconnects unless messages are resumable (stream transport).
+                ``None`` for observers and resumed connections.
+            last_event_id: With the stream transport, the id of the last
+                event the client received.
+        """
+        is_resumable = Config.get_message_transport() == "stream"
+        try:
+            if task is not None:
+                task.add_done_callback(
+                    lambda future: self.active_tasks.pop(current_trace_id, None)
+                )
+                self.active_tasks[current_trace_id] = task
+            async for event_id, value in self._read_messages(
+                redis_key, last_event_id
+            ):
+                event = decode_message(value)
+                if event is None:
+                    continue
+                if event_id:
+                    event["id"] = event_id
+                yield event
+                if "event" in event:
+                    logger.info(
+                        "SSE connection terminated.",
+                        extra={"trace_id": current_trace_id},
+                    )
+                    break
         except asyncio.CancelledError:
             logger.info(
                 "SSE connection terminated.",
                 extra={"trace_id": current_trace_id},
             )
-            self.active_tasks[current_trace_id].cancel()
+            if task is not None and not is_resumable:
+                task.cancel()
             raise
 
     async def start_web_service(
@@ -849,11 +1022,12 @@ class MAS(BaseModel):
         import importlib.resources
 
         import uvicorn
-        from fastapi import FastAPI, Request
+        from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
         from fastapi.staticfiles import StaticFiles
         from sse_starlette.sse import EventSourceResponse
 
         app = FastAPI()
+        app.state.mas = self  # lets the routes share this MAS's clients
 
         from fastapi.middleware.cors import CORSMiddleware
 
@@ -951,7 +1125,7 @@ class MAS(BaseModel):
                 }
             ).to_dict()
 
-        async def request_to_payload(request: Request):
+        async def request_to_payload(request: Request, new_trace_id=True):
             if request.method == "GET":
                 params = dict(request.query_params)
                 payload = dict()
@@ -965,18 +1139,21 @@ class MAS(BaseModel):
             elif request.method == "POST":
                 payload = await request.json()
 
+            return complete_payload(payload, request.headers, new_trace_id)
+
+        def complete_payload(payload, headers, new_trace_id=True):
             payload = self.func_filter(payload)
 
             if "query" not in payload:
                 payload["query"] = ""
 
-            if "current_trace_id" not in payload:
+            if "current_trace_id" not in payload and new_trace_id:
                 payload["current_trace_id"] = generate_uuid()
 
             # fetch headers
             if "shared_data" not in payload:
                 payload["shared_data"] = dict()
-            payload["shared_data"]["_headers"] = dict(request.headers)
+            payload["shared_data"]["_headers"] = dict(headers)
 
             return payload
 
@@ -992,18 +1169,38 @@ class MAS(BaseModel):
 
         @app.api_route("/sse/chat", methods=["GET", "POST"])
         async def sse_chat(request: Request):
-            payload = await request_to_payload(request)
+            # A reconnecting EventSource resumes the trace it was reading
+            last_event_id = request.headers.get("last-event-id")
+            is_resume = bool(last_event_id) and (
+                Config.get_message_transport() == "stream"
+            )
+            payload = await request_to_payload(request, new_trace_id=not is_resume)
             # Apply request interceptor if configured
             intercepted_response = self.func_interceptor(payload)
             if intercepted_response is not None:
                 return intercepted_response
-            current_trace_id = payload["current_trace_id"]
+            current_trace_id = payload.get("current_trace_id")
+            if is_resume and not current_trace_id:
+                return WebResponse(
+                    code=400, message="resuming requires the current_trace_id"
+                ).to_dict()
+            redis_key = f"{self.message_prefix}:{self.name}:{current_trace_id}"
+
+            if is_resume:
+                logger.info(
+                    f"SSE connection resumed after {last_event_id}.",
+                    extra={"trace_id": current_trace_id},
+                )
+                return EventSourceResponse(
+                    self.event_stream(
+                        redis_key, current_trace_id, last_event_id=last_event_id
+                    )
+                )
 
             logger.info(
                 "SSE connection established.",
                 extra={"trace_id": current_trace_id},
             )
-            redis_key = f"{self.message_prefix}:{self.name}:{current_trace_id}"
             task = asyncio.create_task(
                 self.chat_with_agent(payload=payload, send_msg_key=redis_key)
             )
@@ -1012,6 +1209,27 @@ class MAS(BaseModel):
                 self.event_stream(redis_key, current_trace_id, task)
             )
 
+        @app.get("/sse/observe")
+        async def sse_observe(
+            current_trace_id: str, request: Request, last_event_id: str = "0-0"
+        ):
+            """Tail the messages of a running or recent trace.
+
+            Any number of observers can follow the same trace alongside its
+            ``/sse/chat`` client. Requires the ``stream`` message transport.
+            """
+            if Config.get_message_transport() != "stream":
+                return WebResponse(
+                    code=400, message="observing requires the stream message transport"
+                ).to_dict()
+            last_event_id = request.headers.get("last-event-id", last_event_id)
+            redis_key = f"{self.message_prefix}:{self.name}:{current_trace_id}"
+            return EventSourceResponse(
+                self.event_stream(
+                    redis_key, current_trace_id, last_event_id=last_event_id
+                )
+            )
+
         @app.api_route("/async/chat", methods=["GET", "POST"])
         async def async_chat(request: Request):
             payload = await request_to_payload(request)
@@ -1035,6 +1253,146 @@ class MAS(BaseModel):
             self.active_tasks[current_trace_id] = task
             return WebResponse().to_dict()
 
+        @app.websocket("/ws")
+        async def websocket_chat(websocket: WebSocket):
+            """Drive several concurrent chat traces over one WebSocket.
+
+            Client frames are JSON objects:
+
+            - ``{"type": "chat", "payload": {...}}`` starts a trace, the payload
+              being the body of ``/sse/chat``;
+            - ``{"type": "cancel", "current_trace_id": ...}`` cancels a trace
+              started on this socket.
+
+            Server frames are the SSE events of every trace (``data``, and
+            ``event`` / ``id`` when set) tagged with their ``current_trace_id``.
+            A trace ends with an ``event`` frame: ``close`` when done or
+            cancelled, ``error`` for rejected frames.
+            """
+            await websocket.accept()
+            send_lock = asyncio.Lock()
+            forwarders = {}
+
+            async def send(frame):
+                async with send_lock:
+                    await websocket.send_text(to_json(frame))
+
+            async def forward(current_trace_id, redis_key, task):
+                try:
+                    async for event in self.event_stream(
+                        redis_key, current_trace_id, task
+                    ):
+                        await send({"current_trace_id": current_trace_id, **event})
+                finally:
+                    if forwarders.get(current_trace_id) is asyncio.current_task():
+                        del forwarders[current_trace_id]
+
+            async def start_chat(payload):
+                payload = complete_payload(payload, websocket.headers)
+                current_trace_id = payload["current_trace_id"]
+                if current_trace_id in forwarders:
+                    await send(
+                        {
+                            "current_trace_id": current_trace_id,
+                            "event": "error",
+                            "data": "trace is already running",
+                        }
+                    )
+                    return
+                # Apply request interceptor if configured
+                intercepted_response = self.func_interceptor(payload)
+                if intercepted_response is not None:
+                    await send(
+                        {
+                            "current_trace_id": current_trace_id,
+                            "event": "close",
+                            "data": to_json(intercepted_response),
+                        }
+                    )
+                    return
+
+                logger.info(
+                    "WebSocket trace started.",
+                    extra={"trace_id": current_trace_id},
+                )
+                redis_key = f"{self.message_prefix}:{self.name}:{current_trace_id}"
+                task = asyncio.create_task(
+                    self.chat_with_agent(payload=payload, send_msg_key=redis_key)
+                )
+                task.add_done_callback(
+                    lambda future: self.active_tasks.pop(current_trace_id, None)
+                )
+                self.active_tasks[current_trace_id] = task
+                forwarders[current_trace_id] = asyncio.create_task(
+                    forward(current_trace_id, redis_key, task)
+                )
+
+            async def cancel_chat(current_trace_id):
+                # only the traces started on this socket can be cancelled here
+                forwarder = forwarders.pop(current_trace_id, None)
+                if forwarder is None:
+                    await send(
+                        {
+                            "current_trace_id": current_trace_id,
+                            "event": "error",
+                            "data": "trace is not running on this socket",
+                        }
+                    )
+                    return
+                if current_trace_id in self.active_tasks:
+                    self.active_tasks[current_trace_id].cancel()
+                forwarder.cancel()
+                await send(
+                    {
+                        "current_trace_id": current_trace_id,
+                        "event": "close",
+                        "data": "cancelled",
+                    }
+                )
+
+            try:
+                while True:
+                    try:
+                        frame = json.loads(await websocket.receive_text())
+                    except json.JSONDecodeError as e:
+                        await send(
+                            {
+                                "event": "error",
+                                "data": f"can not convert data into JSON: {e}",
+                            }
+                        )
+                        continue
+                    frame_type = frame.get("type") if isinstance(frame, dict) else None
+                    try:
+                        if frame_type == "chat":
+                            payload = frame.get("payload") or {}
+                            if not isinstance(payload, dict):
+                                await send(
+                                    {
+                                        "event": "error",
+                                        "data": "payload must be a JSON object",
+                                    }
+                                )
+                                continue
+                            await start_chat(dict(payload))
+                        elif frame_type == "cancel":
+                            await cancel_chat(frame.get("current_trace_id"))
+                        else:
+                            await send(
+                                {"event": "error", "data": f"unknown frame: {frame}"}
+                            )
+                    except WebSocketDisconnect:
+                        raise
+                    except Exception as e:
+                        # a bad frame must not end the other traces of the socket
+                        logger.error(traceback.format_exc())
+                        await send({"event": "error", "data": f"frame failed: {e}"})
+            except WebSocketDisconnect:
+                logger.info("WebSocket connection closed.")
+            finally:
+                for forwarder in list(forwarders.values()):
+                    forwarder.cancel()
+
         async def run_uvicorn():
             """Run the Uvicorn server with the FastAPI app."""
             logger.info("🔗 OxyGent MAS FastAPI Service Initialization")
@@ -5,6 +5,7 @@ implementations in the OxyGent system. It handles trace management, data persist
 and common agent lifecycle operations.
 """
 
+import json
 import logging
 from typing import Any
 
@@ -12,7 +13,10 @@ from pydantic import Field
 
 from ...config import Config
 from ...schemas import OxyRequest, OxyResponse
+from ...utils.cache_utils import HistoryCache, TieredCache
+from ...utils.codec_utils import encode_payload
 from ...utils.common_utils import generate_uuid, get_format_time, to_json
+from ...utils.data_utils import get_trace_meta
 from ..base_flow import BaseFlow
 
 logger = logging.getLogger(__name__)
@@ -50,29 +54,42 @@ class BaseAgent(BaseFlow):
         if oxy_request.caller_category == "user":
             # Retrieve historical trace_id list for the request
             if oxy_request.from_trace_id:
-                # Query Elasticsearch for the parent trace information
-                es_response = await self.mas.es_client.search(
-                    Config.get_app_name() + "_trace",
-                    {"query": {"term": {"_id": oxy_request.from_trace_id}}},
+                # Look up the parent trace, from the cache when possible
+                trace_meta = await get_trace_meta(
+                    self.mas.es_client,
+                    oxy_request.from_trace_id,
+                    self._get_trace_meta_cache(),
+                )
+                oxy_request.root_trace_ids = list(
+                    (trace_meta or {}).get("root_trace_ids") or []
                 )
-
-                # Extract root trace IDs from the parent trace if available
-                if (
-                    es_response
-                    and es_response["hits"]["hits"]
-                    and es_response["hits"]["hits"][0]["_source"]["root_trace_ids"]
-                ):
-                    oxy_request.root_trace_ids = es_response["hits"]["hits"][0][
-                        "_source"
-                    ]["root_trace_ids"]
-                else:
-                    oxy_request.root_trace_ids = []
 
                 # Add the current from_trace_id to the root trace IDs
                 oxy_request.root_trace_ids.append(oxy_request.from_trace_id)
 
         return oxy_request
 
+    def _get_trace_meta_cache(self):
+        cache = getattr(self.mas, "trace_meta_cache", None)
+        return cache if isinstance(cache, TieredCache) else None
+
+    def _get_history_cache(self):
+        cache = getattr(self.mas, "history_cache", None)
+        return cache if isinstance(cache, HistoryCache) else None
+
+    async def _cache_trace_meta(self, oxy_request: OxyRequest, group_data):
+        """Remember what a follow-up turn of this trace has to look up."""
+        cache = self._get_trace_meta_cache()
+        if cache is not None:
+            await cache.set(
+                oxy_request.current_trace_id,
+                {
+                    "group_id": oxy_request.group_id,
+                    "group_data": group_data,
+                    "root_trace_ids": oxy_request.root_trace_ids,
+                },
+            )
+
     async def _pre_save_data(self, oxy_request: OxyRequest):
         """Save preliminary trace data before processing the request.
 
@@ -123,12 +140,13 @@ class BaseAgent(BaseFlow):
                         "group_data": to_save_group_data,
                         "from_trace_id": oxy_request.from_trace_id,
                         "root_trace_ids": oxy_request.root_trace_ids,
-                        "input": to_json(oxy_request.arguments),
+                        "input": encode_payload(to_json(oxy_request.arguments)),
                         "callee": oxy_request.callee,
                         "output": "",  # Output will be filled in post_save_data
                         "create_time": get_format_time(),
                     },
                 )
+                await self._cache_trace_meta(oxy_request, to_save_group_data)
             else:
                 logger.warning(f"Save {oxy_request.callee} pre trace data error")
 
@@ -183,12 +201,13 @@ class BaseAgent(BaseFlow):
                         "group_data": to_save_group_data,
                         "from_trace_id": oxy_request.from_trace_id,
                         "root_trace_ids": oxy_request.root_trace_ids,
-                        "input": to_json(oxy_request.arguments),
+                        "input": encode_payload(to_json(oxy_request.arguments)),
                         "callee": oxy_request.callee,
-                        "output": to_json(oxy_response.output),
+                        "output": encode_payload(to_json(oxy_response.output)),
                         "create_time": get_format_time(),
                     },
                 )
+                await self._cache_trace_meta(oxy_request, to_save_group_data)
             else:
                 logger.warning(f"Save {oxy_request.callee} post trace data error")
 
@@ -204,6 +223,7 @@ class BaseAgent(BaseFlow):
 
                 # Store the conversation history record
                 history_id = generate_uuid()
+                memory = to_json(history)
                 await self.mas.es_client.index(
                     Config.get_app_name() + "_history",
                     doc_id=history_id,
@@ -211,9 +231,16 @@ class BaseAgent(BaseFlow):
                         "history_id": history_id,
                         "session_name": oxy_request.session_name,
                         "trace_id": oxy_request.current_trace_id,
-                        "memory": to_json(history),
+                        "memory": encode_payload(memory),
                         "create_time": get_format_time(),
                     },
                 )
+                history_cache = self._get_history_cache()
+                if history_cache is not None:
+                    history_cache.append(
+                        oxy_request.session_name,
+                        oxy_request.root_trace_ids + [oxy_request.current_trace_id],
+                        json.loads(memory),
+                    )
             else:
                 logger.warning(f"Save {oxy_request.callee} history data error")
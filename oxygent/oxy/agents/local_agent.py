@@ -16,6 +16,7 @@ from pydantic import Field
 
 from ...config import Config
 from ...schemas import Memory, Message, OxyRequest, OxyResponse
+from ...utils.codec_utils import decode_payload
 from ..base_tool import BaseTool
 from ..function_tools.function_hub import FunctionHub
 from ..function_tools.function_tool import FunctionTool
@@ -226,33 +227,63 @@ class LocalAgent(BaseAgent):
                 session_name = "__".join(oxy_request.call_stack[:2])
             else:
                 session_name = oxy_request.session_name
-            es_response = await self.mas.es_client.search(
-                Config.get_app_name() + "_history",
-                {
-                    "query": {
-                        "bool": {
-                            "must": [
-                                {
-                                    "terms": {
-                                        "trace_id": oxy_request.root_trace_ids
-                                        + [oxy_request.current_trace_id]
-                                    }
-                                },
-                                {"term": {"session_name": session_name}},
-                            ]
-                        }
-                    },
-                    "size": self.short_memory_size,
-                    "sort": [{"create_time": {"order": "desc"}}],
-                },
-            )
-            historys = es_response["hits"]["hits"][::-1]
-            for history in historys:
-                memory = json.loads(history["_source"]["memory"])
+            for memory in await self._get_history_memories(oxy_request, session_name):
                 short_memory.add_message(Message.user_message(memory["query"]))
                 short_memory.add_message(Message.assistant_message(memory["answer"]))
         return short_memory
 
+    async def _get_history_memories(
+        self, oxy_request: OxyRequest, session_name: str
+    ) -> list[dict]:
+        """Return the last ``short_memory_size`` decoded memories of a session.
+
+        Served from the history cache of the MAS when it knows the session,
+        otherwise read from Elasticsearch and put into the cache.
+
+        Args:
+            oxy_request (OxyRequest): The current request containing trace info.
+            session_name (str): The session whose memories are returned.
+
+        Returns:
+            list[dict]: The memories, oldest first.
+        """
+        trace_ids = oxy_request.root_trace_ids + [oxy_request.current_trace_id]
+        history_cache = self._get_history_cache()
+        if history_cache is not None:
+            memories = history_cache.get(
+                session_name, trace_ids, self.short_memory_size
+            )
+            if memories is not None:
+                return memories
+
+        es_response = await self.mas.es_client.search(
+            Config.get_app_name() + "_history",
+            {
+                "query": {
+                    "bool": {
+                        "must": [
+                            {"terms": {"trace_id": trace_ids}},
+                            {"term": {"session_name": session_name}},
+                        ]
+                    }
+                },
+                "size": self.short_memory_size,
+                "sort": [{"create_time": {"order": "desc"}}],
+            },
+        )
+        hits = es_response["hits"]["hits"]
+        memories = [
+            json.loads(decode_payload(hit["_source"]["memory"])) for hit in hits[::-1]
+        ]
+        if history_cache is not None:
+            history_cache.put(
+                session_name,
+                trace_ids,
+                memories,
+                is_complete=len(hits) < self.short_memory_size,
+            )
+        return memories
+
     async def _get_llm_tool_desc_list(self, oxy_request: OxyRequest, query: str) -> str:
         """Get tool descriptions for LLM context based on configuration and query.
 
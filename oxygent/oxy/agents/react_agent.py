@@ -142,39 +142,17 @@ class ReActAgent(LocalAgent):
             session_name = "__".join(oxy_request.call_stack[:2])
         else:
             session_name = oxy_request.session_name
-        es_response = await self.mas.es_client.search(
-            Config.get_app_name() + "_history",
-            {
-                "query": {
-                    "bool": {
-                        "must": [
-                            {
-                                "terms": {
-                                    "trace_id": oxy_request.root_trace_ids
-                                    + [oxy_request.current_trace_id]
-                                }
-                            },
-                            {"term": {"session_name": session_name}},
-                        ]
-                    }
-                },
-                "size": self.short_memory_size,
-                "sort": [{"create_time": {"order": "desc"}}],
-            },
-        )
-        historys = es_response["hits"]["hits"][::-1]
+        memories = await self._get_history_memories(oxy_request, session_name)
         if self.is_discard_react_memory:
             # Simple mode: Only keep query-answer pairs
-            for history in historys:
-                memory = json.loads(history["_source"]["memory"])
+            for memory in memories:
                 short_memory.add_message(Message.user_message(memory["query"]))
                 short_memory.add_message(Message.assistant_message(memory["answer"]))
         else:
             # Advanced mode: Weighted memory management with token limits
             # Collect all question-answer pairs from both short and ReAct memory
             qa_list = []
-            for short_i, history in enumerate(historys):
-                memory = json.loads(history["_source"]["memory"])
+            for short_i, memory in enumerate(memories):
                 qa_list.append((memory["query"], memory["answer"], short_i, "short"))
                 for react_q, react_a in chunk_list(memory["react_memory"]):
                     qa_list.append(
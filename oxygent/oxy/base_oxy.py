@@ -6,9 +6,11 @@ handling, logging, and data persistence patterns.
 """
 
 import asyncio
+import copy
 import inspect
 import json
 import logging
+import time
 import traceback
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Optional
@@ -18,6 +20,8 @@ from pydantic import BaseModel, Field
 # from ..mas import MAS
 from ..config import Config
 from ..schemas import OxyRequest, OxyResponse, OxyState
+from ..utils.blob_utils import extract_blobs, save_blobs
+from ..utils.codec_utils import decode_payload, encode_payload
 from ..utils.common_utils import (
     filter_json_types,
     generate_uuid,
@@ -25,6 +29,7 @@ from ..utils.common_utils import (
     get_md5,
     to_json,
 )
+from ..utils.concurrency_utils import AdaptiveSemaphore, is_overload_error
 
 logger = logging.getLogger(__name__)
 
@@ -69,9 +74,14 @@ class Oxy(BaseModel, ABC):
         desc (str): Human-readable description of functionality.
         category (str): Category classification (tool, agent, etc.).
         is_permission_required (bool): Whether permission is needed for execution.
-        semaphore (int): Maximum number of concurrent executions.
+        semaphore (int): Maximum number of concurrent executions, the initial
+            one with ``is_adaptive_semaphore``.
+        is_adaptive_semaphore (bool): Whether the limit adapts to the health of
+            the calls, between ``min_semaphore`` and ``max_semaphore``.
         timeout (float): Execution timeout in seconds.
         retries (int): Number of retry attempts on failure.
+        is_single_flight (bool): Whether concurrent calls with the same
+            arguments share one execution.
     """
 
     name: str = Field(..., description="Identifier for the agent.")
@@ -148,13 +158,35 @@ class Oxy(BaseModel, ABC):
         None, description="User-friendly error message"
     )
     semaphore: int = Field(16, description="Concurrency limit")
+    is_adaptive_semaphore: bool = Field(
+        False, description="Whether the concurrency limit adapts to overloads"
+    )
+    min_semaphore: int = Field(1, description="Lowest adaptive concurrency limit")
+    max_semaphore: Optional[int] = Field(
+        None, description="Highest adaptive concurrency limit, 4x semaphore if None"
+    )
+    semaphore_latency_threshold: Optional[float] = Field(
+        None, description="Calls slower than it do not raise the adaptive limit"
+    )
     timeout: float = Field(3600, description="Timeout in seconds.")
     retries: int = Field(2)
     delay: float = Field(1.0)
+    is_single_flight: bool = Field(
+        False, description="Whether concurrent identical calls share one execution"
+    )
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(self.semaphore)
+        if self.is_adaptive_semaphore:
+            self._semaphore = AdaptiveSemaphore(
+                self.semaphore,
+                min_limit=self.min_semaphore,
+                max_limit=self.max_semaphore or 4 * self.semaphore,
+                latency_threshold=self.semaphore_latency_threshold,
+            )
+        else:
+            self._semaphore = asyncio.Semaphore(self.semaphore)
+        self._in_flight: dict[str, asyncio.Future] = {}
         self._ensure_async_functions()
         self._set_desc_for_llm()
 
@@ -220,6 +252,17 @@ class Oxy(BaseModel, ABC):
     async def init(self):
         self._set_desc_for_llm()
 
+    def get_max_concurrency(self) -> int:
+        """Largest number of concurrent executions of this oxy."""
+        if isinstance(self._semaphore, AdaptiveSemaphore):
+            return self._semaphore.max_limit
+        return self.semaphore
+
+    def report_overload(self) -> None:
+        """Report an overload of the endpoint, e.g. a timeout, to the limit."""
+        if isinstance(self._semaphore, AdaptiveSemaphore):
+            self._semaphore.on_overload()
+
     async def _pre_process(self, oxy_request: OxyRequest) -> OxyRequest:
         """Pre-process the request before execution."""
         # Initialize the parameters
@@ -249,38 +292,43 @@ class Oxy(BaseModel, ABC):
             },
         )
 
+    async def _get_reference_node(self, oxy_request: OxyRequest) -> Optional[dict]:
+        """Find the node of the reference trace with the same input md5."""
+        if oxy_request.reference_nodes is not None:
+            return oxy_request.reference_nodes.get(oxy_request.input_md5)
+        if not (self.mas and self.mas.es_client):
+            return None
+        es_response = await self.mas.es_client.search(
+            Config.get_app_name() + "_node",
+            {
+                "query": {
+                    "bool": {
+                        "must": [
+                            {"term": {"trace_id": oxy_request.reference_trace_id}},
+                            {"term": {"input_md5": oxy_request.input_md5}},
+                        ]
+                    }
+                },
+                "size": 1,
+            },
+        )
+        logging.info(f"ES search returned {len(es_response['hits']['hits'])} hits")
+        if es_response["hits"]["hits"]:
+            return es_response["hits"]["hits"][0]["_source"]
+        return None
+
     async def _request_interceptor(self, oxy_request: OxyRequest):
         if (
             oxy_request.reference_trace_id
             and oxy_request.restart_node_id
             and oxy_request.is_load_data_for_restart
-            and self.mas
-            and self.mas.es_client
             and self.category in ["llm", "tool"]
         ):
-            es_response = await self.mas.es_client.search(
-                Config.get_app_name() + "_node",
-                {
-                    "query": {
-                        "bool": {
-                            "must": [
-                                {"term": {"trace_id": oxy_request.reference_trace_id}},
-                                {"term": {"input_md5": oxy_request.input_md5}},
-                            ]
-                        }
-                    },
-                    "size": 1,
-                },
-            )
-            logging.info(f"ES search returned {len(es_response['hits']['hits'])} hits")
-            if es_response["hits"]["hits"]:
-                current_node_order = es_response["hits"]["hits"][0]["_source"][
-                    "update_time"
-                ]
+            reference_node = await self._get_reference_node(oxy_request)
+            if reference_node:
+                current_node_order = reference_node["update_time"]
                 if current_node_order < oxy_request.restart_node_order:
-                    restart_node_output = es_response["hits"]["hits"][0]["_source"][
-                        "output"
-                    ]
+                    restart_node_output = decode_payload(reference_node["output"])
 
                     logger.info(
                         f"{' <<< '.join(oxy_request.call_stack)}  Load from ES: {restart_node_output}",
@@ -291,13 +339,9 @@ class Oxy(BaseModel, ABC):
                     )
 
                     oxy_response = OxyResponse(
-                        state=OxyState(
-                            es_response["hits"]["hits"][0]["_source"]["state"]
-                        ),
+                        state=OxyState(reference_node["state"]),
                         output=restart_node_output,
-                        extra=json.loads(
-                            es_response["hits"]["hits"][0]["_source"]["extra"]
-                        ),
+                        extra=json.loads(reference_node["extra"]),
                     )
                     oxy_response.oxy_request = oxy_request
                     return await self._format_output(oxy_response)
@@ -316,13 +360,9 @@ class Oxy(BaseModel, ABC):
                     )
 
                     oxy_response = OxyResponse(
-                        state=OxyState(
-                            es_response["hits"]["hits"][0]["_source"]["state"]
-                        ),
+                        state=OxyState(reference_node["state"]),
                         output=restart_node_output,
-                        extra=json.loads(
-                            es_response["hits"]["hits"][0]["_source"]["extra"]
-                        ),
+                        extra=json.loads(reference_node["extra"]),
                     )
                     oxy_response.oxy_request = oxy_request
                     return await self._format_output(oxy_response)
@@ -451,6 +491,13 @@ class Oxy(BaseModel, ABC):
         callee_name = oxy_request.callee
         callee_cat = oxy_request.callee_category
         if self.mas and self.mas.es_client:
+            # store large repeated strings (prompts, tool descriptions) once
+            if Config.get_blob_store_is_enabled():
+                blobs = dict()
+                oxy_input = extract_blobs(
+                    oxy_input, blobs, Config.get_blob_store_threshold()
+                )
+                await save_blobs(self.mas.es_client, blobs)
             # save shared_data
             shared_data_schema = Config.get_es_schema_shared_data().get(
                 "properties", {}
@@ -475,9 +522,9 @@ class Oxy(BaseModel, ABC):
                     "caller": oxy_request.caller,
                     "callee": callee_name,
                     "shared_data": to_save_shared_data,
-                    "input": to_json(oxy_input),
+                    "input": encode_payload(to_json(oxy_input)),
                     "input_md5": oxy_request.input_md5,
-                    "output": to_json(oxy_response.output),
+                    "output": encode_payload(to_json(oxy_response.output)),
                     "state": oxy_response.state.value,
                     "extra": to_json(oxy_response.extra),
                     "update_time": get_format_time(),
@@ -495,10 +542,11 @@ class Oxy(BaseModel, ABC):
     async def _post_send_message(self, oxy_response: OxyResponse):
         """Send observation and answer messages to frontend if enabled."""
         oxy_request = oxy_response.oxy_request
+        messages = []
 
         # Send observation message to frontend
         if self.is_send_observation:
-            await oxy_request.send_message(
+            messages.append(
                 {
                     "type": "observation",
                     "content": {
@@ -517,7 +565,7 @@ class Oxy(BaseModel, ABC):
 
         # Send additional observation-answer message to frontend
         if self.is_send_answer and oxy_request.caller_category == "user":
-            await oxy_request.send_message(
+            messages.append(
                 {
                     "type": "answer",
                     "content": oxy_response.output,
@@ -526,6 +574,136 @@ class Oxy(BaseModel, ABC):
                 }
             )
 
+        # Both messages go out in one push when the MAS can batch them
+        if hasattr(oxy_request.mas, "send_messages"):
+            await oxy_request.send_messages(messages)
+        else:
+            for message in messages:
+                await oxy_request.send_message(message)
+
+    async def _execute_with_retries(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Run the interceptor and ``_execute``, retrying failed attempts."""
+        attempt = 0
+        while attempt < self.retries:
+            try:
+                if self.func_interceptor:
+                    error_message = await self.func_interceptor(oxy_request)
+                    if error_message:
+                        oxy_response = OxyResponse(
+                            state=OxyState.SKIPPED,
+                            output=error_message,
+                        )
+                        break
+                start_time = time.monotonic()
+                if self.func_execute:
+                    oxy_response = await self.func_execute(oxy_request)
+                else:
+                    oxy_response = await self._execute(oxy_request)
+                if isinstance(self._semaphore, AdaptiveSemaphore):
+                    self._semaphore.on_success(time.monotonic() - start_time)
+                break
+            except asyncio.CancelledError:
+                # if the task is cancelled, log and return a canceled response
+                logger.error(
+                    f"oxy {self.name} was cancelled---",
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                oxy_response = OxyResponse(
+                    state=OxyState.CANCELED,
+                    output=f"Tool {self.name} was cancelled",
+                )
+                oxy_response.oxy_request = oxy_request
+                asyncio.create_task(self._post_save_data(oxy_response))
+                raise
+            except Exception as e:
+                # Handle exceptions and retry logic
+                if is_overload_error(e):
+                    self.report_overload()
+                await self._handle_exception(e)
+                attempt += 1
+                logger.warning(
+                    f"Error executing oxy {self.name}: {str(e)}. Attempt {attempt} of {self.retries}.",
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                logger.error(
+                    traceback.format_exc(),
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                if attempt < self.retries:
+                    await asyncio.sleep(self.delay)
+                else:
+                    error_msg = traceback.format_exc()
+                    logger.error(
+                        f"Max retries reached. Failed. {error_msg}",
+                        extra={
+                            "trace_id": oxy_request.current_trace_id,
+                            "node_id": oxy_request.node_id,
+                        },
+                    )
+                    oxy_response = OxyResponse(
+                        state=OxyState.FAILED,
+                        output=f"Error executing oxy {self.name}: {str(e)}",
+                    )
+        return oxy_response
+
+    async def _execute_single_flight(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Share the execution of concurrent calls with the same ``input_md5``.
+
+        The first call executes; calls arriving while it runs await its
+        response and get a copy marked ``is_coalesced`` in ``extra``, so their
+        own nodes record where the output came from. They execute on their own
+        if the first call is cancelled. Interceptors may veto any call, so oxys
+        with one are never coalesced.
+
+        Only executing calls hold a slot of the semaphore, so that waiting
+        calls do not use up the concurrency of the oxy.
+        """
+        if not self.is_single_flight or self.func_interceptor:
+            return await self._execute_with_retries(oxy_request)
+
+        key = oxy_request.input_md5
+        future = self._in_flight.get(key)
+        if future is not None:
+            shared_response = await asyncio.shield(future)
+            if shared_response is None:
+                async with self._semaphore:
+                    return await self._execute_with_retries(oxy_request)
+            return OxyResponse(
+                state=shared_response.state,
+                output=copy.deepcopy(shared_response.output),
+                extra=dict(shared_response.extra),
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        shared_response = None
+        try:
+            async with self._semaphore:
+                oxy_response = await self._execute_with_retries(oxy_request)
+            # Snapshot before the caller post-processes the output in place
+            shared_response = OxyResponse(
+                state=oxy_response.state,
+                output=copy.deepcopy(oxy_response.output),
+                extra={
+                    **oxy_response.extra,
+                    "is_coalesced": True,
+                    "coalesced_node_id": oxy_request.node_id,
+                },
+            )
+            return oxy_response
+        finally:
+            del self._in_flight[key]
+            future.set_result(shared_response)
+
     async def execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute the complete lifecycle of an Oxy operation.
 
@@ -547,147 +725,85 @@ class Oxy(BaseModel, ABC):
         - Output formatting
         - Post-send message handling
         """
+        if self.is_single_flight and not self.func_interceptor:
+            # only the call that executes takes a slot, see _execute_single_flight
+            return await self._execute_lifecycle(oxy_request)
         async with self._semaphore:
-            # Pre-process
-            oxy_request = await self._pre_process(oxy_request)
-            await self._pre_log(oxy_request)
-
-            key_to_md5 = {
-                k: v
-                for k, v in oxy_request.arguments.items()
-                if isinstance(v, (int, str, float, list, dict, tuple, set))
-            }
-            oxy_request.input_md5 = get_md5(to_json(key_to_md5))
-            result = await self._request_interceptor(oxy_request)
-            if isinstance(result, OxyResponse):
-                return result
-
-            event = asyncio.Event()
-            if self.mas:
-
-                def pre_done_callback(task):
-                    self.mas.background_tasks.discard(task)
-                    event.set()
-
-                pre_save_data_task = asyncio.create_task(
-                    self._pre_save_data(oxy_request)
-                )
+            return await self._execute_lifecycle(oxy_request)
 
-                pre_save_data_task.add_done_callback(pre_done_callback)
-                self.mas.background_tasks.add(pre_save_data_task)
-            else:
-                logger.warning(
-                    "Temporary invocation without storing data.",
-                    extra={
-                        "trace_id": oxy_request.current_trace_id,
-                        "node_id": oxy_request.node_id,
-                    },
-                )
-            oxy_request = await self._format_input(oxy_request)
-            await self._pre_send_message(oxy_request)
-
-            oxy_request = await self._before_execute(oxy_request)
-
-            # Execute the request with retry logic
-            attempt = 0
-            while attempt < self.retries:
-                try:
-                    if self.func_interceptor:
-                        error_message = await self.func_interceptor(oxy_request)
-                        if error_message:
-                            oxy_response = OxyResponse(
-                                state=OxyState.SKIPPED,
-                                output=error_message,
-                            )
-                            break
-                    if self.func_execute:
-                        oxy_response = await self.func_execute(oxy_request)
-                    else:
-                        oxy_response = await self._execute(oxy_request)
-                    break
-                except asyncio.CancelledError:
-                    # if the task is cancelled, log and return a canceled response
-                    logger.error(
-                        f"oxy {self.name} was cancelled---",
-                        extra={
-                            "trace_id": oxy_request.current_trace_id,
-                            "node_id": oxy_request.node_id,
-                        },
-                    )
-                    oxy_response = OxyResponse(
-                        state=OxyState.CANCELED,
-                        output=f"Tool {self.name} was cancelled",
-                    )
-                    oxy_response.oxy_request = oxy_request
-                    asyncio.create_task(self._post_save_data(oxy_response))
-                    raise
-                except Exception as e:
-                    # Handle exceptions and retry logic
-                    await self._handle_exception(e)
-                    attempt += 1
-                    logger.warning(
-                        f"Error executing oxy {self.name}: {str(e)}. Attempt {attempt} of {self.retries}.",
-                        extra={
-                            "trace_id": oxy_request.current_trace_id,
-                            "node_id": oxy_request.node_id,
-                        },
-                    )
-                    logger.error(
-                        traceback.format_exc(),
-                        extra={
-                            "trace_id": oxy_request.current_trace_id,
-                            "node_id": oxy_request.node_id,
-                        },
-                    )
-                    if attempt < self.retries:
-                        await asyncio.sleep(self.delay)
-                    else:
-                        error_msg = traceback.format_exc()
-                        logger.error(
-                            f"Max retries reached. Failed. {error_msg}",
-                            extra={
-                                "trace_id": oxy_request.current_trace_id,
-                                "node_id": oxy_request.node_id,
-                            },
-                        )
-                        oxy_response = OxyResponse(
-                            state=OxyState.FAILED,
-                            output=f"Error executing oxy {self.name}: {str(e)}",
-                        )
+    async def _execute_lifecycle(self, oxy_request: OxyRequest) -> OxyResponse:
+        # Pre-process
+        oxy_request = await self._pre_process(oxy_request)
+        await self._pre_log(oxy_request)
 
-            oxy_response.oxy_request = oxy_request
-            oxy_response = await self._after_execute(oxy_response)
+        key_to_md5 = {
+            k: v
+            for k, v in oxy_request.arguments.items()
+            if isinstance(v, (int, str, float, list, dict, tuple, set))
+        }
+        oxy_request.input_md5 = get_md5(to_json(key_to_md5))
+        result = await self._request_interceptor(oxy_request)
+        if isinstance(result, OxyResponse):
+            return result
 
-            # Post-process
-            oxy_response = await self._post_process(oxy_response)
-            await self._post_log(oxy_response)
+        event = asyncio.Event()
+        if self.mas:
 
-            if self.mas:
+            def pre_done_callback(task):
+                self.mas.background_tasks.discard(task)
+                event.set()
 
-                async def _post_save_data_task(oxy_response):
-                    await event.wait()
-                    await self._post_save_data(oxy_response)
+            pre_save_data_task = asyncio.create_task(self._pre_save_data(oxy_request))
 
-                if oxy_request.is_async_storage:
-                    post_save_data_task = asyncio.create_task(
-                        _post_save_data_task(oxy_response)
-                    )
-                    post_save_data_task.add_done_callback(
-                        self.mas.background_tasks.discard
-                    )
-                    self.mas.background_tasks.add(post_save_data_task)
-                else:
-                    await _post_save_data_task(oxy_response)
-            else:
-                logger.warning(
-                    "Temporary invocation without storing data.",
-                    extra={
-                        "trace_id": oxy_request.current_trace_id,
-                        "node_id": oxy_request.node_id,
-                    },
+            pre_save_data_task.add_done_callback(pre_done_callback)
+            self.mas.background_tasks.add(pre_save_data_task)
+        else:
+            logger.warning(
+                "Temporary invocation without storing data.",
+                extra={
+                    "trace_id": oxy_request.current_trace_id,
+                    "node_id": oxy_request.node_id,
+                },
+            )
+        oxy_request = await self._format_input(oxy_request)
+        await self._pre_send_message(oxy_request)
+
+        oxy_request = await self._before_execute(oxy_request)
+
+        # Execute the request with retry logic
+        oxy_response = await self._execute_single_flight(oxy_request)
+
+        oxy_response.oxy_request = oxy_request
+        oxy_response = await self._after_execute(oxy_response)
+
+        # Post-process
+        oxy_response = await self._post_process(oxy_response)
+        await self._post_log(oxy_response)
+
+        if self.mas:
+
+            async def _post_save_data_task(oxy_response):
+                await event.wait()
+                await self._post_save_data(oxy_response)
+
+            if oxy_request.is_async_storage:
+                post_save_data_task = asyncio.create_task(
+                    _post_save_data_task(oxy_response)
                 )
+                post_save_data_task.add_done_callback(self.mas.background_tasks.discard)
+                self.mas.background_tasks.add(post_save_data_task)
+            else:
+                await _post_save_data_task(oxy_response)
+        else:
+            logger.warning(
+                "Temporary invocation without storing data.",
+                extra={
+                    "trace_id": oxy_request.current_trace_id,
+                    "node_id": oxy_request.node_id,
+                },
+            )
 
-            oxy_response = await self._format_output(oxy_response)
-            await self._post_send_message(oxy_response)
+        oxy_response = await self._format_output(oxy_response)
+        await self._post_send_message(oxy_response)
 
-            return oxy_response
+        return oxy_response
@@ -15,13 +15,16 @@ import aiofiles
 from pydantic import Field
 
 from ...config import Config
-from ...schemas import OxyRequest, OxyResponse
+from ...schemas import OxyRequest, OxyResponse, OxyState
+from ...utils.cache_utils import TieredCache
 from ...utils.common_utils import (
     extract_first_json,
+    get_md5,
     image_to_base64,
     parse_mixed_string,
     video_to_base64,
 )
+from ...utils.stream_utils import StreamAggregator
 from ..base_oxy import Oxy
 
 logger = logging.getLogger(__name__)
@@ -45,6 +48,9 @@ class BaseLLM(Oxy):
         is_convert_url_to_base64: Whether to convert media URLs to base64.
         max_image_pixels: Maximum pixel count for image processing.
         max_video_size: Maximum size in bytes for video processing.
+        is_cache: Whether to answer repeated deterministic calls from the
+            ``llm_cache`` of the MAS.
+        is_cache_forced: Whether to cache calls sampling with a temperature.
     """
 
     category: str = Field("llm", description="")
@@ -80,6 +86,13 @@ class BaseLLM(Oxy):
         description="Maximum non-media file size (bytes) for base64 embedding.",
     )
     is_disable_system_prompt: bool = Field(default=False)
+    is_cache: bool = Field(
+        default_factory=Config.get_llm_cache_is_enabled,
+        description="Whether to cache the responses of deterministic calls.",
+    )
+    is_cache_forced: bool = Field(
+        False, description="Whether to cache calls with a temperature above 0."
+    )
 
     async def _get_messages(self, oxy_request: OxyRequest):
         # merge system prompt
@@ -191,6 +204,106 @@ class BaseLLM(Oxy):
         """Execute the LLM request."""
         raise NotImplementedError("This method is not yet implemented")
 
+    @staticmethod
+    def _usage_extra(usage: Optional[dict]) -> dict:
+        """The ``extra`` of a response recording the token usage of the call.
+
+        Args:
+            usage: The ``prompt_tokens``, ``completion_tokens`` and optional
+                ``total_tokens`` reported by the API, if any.
+        """
+        prompt_tokens = (usage or {}).get("prompt_tokens")
+        completion_tokens = (usage or {}).get("completion_tokens")
+        if prompt_tokens is None and completion_tokens is None:
+            return {}
+        total_tokens = usage.get("total_tokens")
+        if total_tokens is None:
+            total_tokens = (prompt_tokens or 0) + (completion_tokens or 0)
+        return {
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": total_tokens,
+            }
+        }
+
+    def _get_request_params(self, oxy_request: OxyRequest) -> dict:
+        """Parameters of the request besides the messages, as sent to the API."""
+        params = {
+            k: v
+            for k, v in Config.get_llm_config().items()
+            if k not in {"cls", "base_url", "api_key", "name", "model_name"}
+        }
+        params.update(self.llm_params)
+        params.update(
+            {k: v for k, v in oxy_request.arguments.items() if k != "messages"}
+        )
+        return params
+
+    def _get_response_cache(self) -> Optional[TieredCache]:
+        cache = getattr(self.mas, "llm_cache", None)
+        return cache if isinstance(cache, TieredCache) else None
+
+    async def _get_cache_key(self, oxy_request: OxyRequest) -> Optional[str]:
+        """Hash of the model, messages and sampling parameters of the request.
+
+        The messages are the ones sent to the API, as built by ``_get_messages``.
+
+        Returns None if the call must not be cached: without ``is_cache_forced``
+        only calls with a temperature of 0 are, as other calls are expected to
+        answer differently each time.
+        """
+        params = self._get_request_params(oxy_request)
+        temperature = params.get("temperature")
+        if not self.is_cache_forced and (temperature is None or temperature > 0):
+            return None
+        params.pop("stream", None)  # a hit is replayed as a stream if needed
+        key = {
+            "base_url": getattr(self, "base_url", None),
+            "model_name": getattr(self, "model_name", None) or self.name,
+            "messages": await self._get_messages(oxy_request),
+            "params": params,
+        }
+        return get_md5(json.dumps(key, sort_keys=True, ensure_ascii=False, default=str))
+
+    async def _replay_stream(self, oxy_request: OxyRequest, output) -> None:
+        """Send an answer that was not streamed for this node as one delta."""
+        is_stream = self._get_request_params(oxy_request).get("stream", True)
+        if is_stream and isinstance(output, str):
+            aggregator = StreamAggregator(oxy_request)
+            await aggregator.add(output)
+            await aggregator.close()
+
+    async def _after_execute(self, oxy_response: OxyResponse) -> OxyResponse:
+        oxy_response = await super()._after_execute(oxy_response)
+        if oxy_response.extra.get("is_coalesced"):
+            await self._replay_stream(oxy_response.oxy_request, oxy_response.output)
+        return oxy_response
+
+    async def _execute_with_retries(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Answer from the response cache when possible, otherwise call the LLM.
+
+        Interceptors may veto any call, so oxys with one are never cached.
+        """
+        cache = self._get_response_cache()
+        cache_key = None
+        if self.is_cache and cache is not None and not self.func_interceptor:
+            cache_key = await self._get_cache_key(oxy_request)
+        if cache_key is None:
+            return await super()._execute_with_retries(oxy_request)
+
+        output = await cache.get(cache_key)
+        if output is not None:
+            await self._replay_stream(oxy_request, output)
+            return OxyResponse(
+                state=OxyState.COMPLETED, output=output, extra={"is_cache_hit": True}
+            )
+
+        oxy_response = await super()._execute_with_retries(oxy_request)
+        if oxy_response.state is OxyState.COMPLETED:
+            await cache.set(cache_key, oxy_response.output)
+        return oxy_response
+
     async def _post_send_message(self, oxy_response: OxyResponse):
         """Send think messages to the frontend after response generation.
 
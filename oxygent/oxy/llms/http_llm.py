@@ -7,11 +7,13 @@ providers that follow OpenAI-compatible API standards.
 
 import json
 import logging
+from typing import Optional
 
 import httpx
 
 from ...config import Config
 from ...schemas import OxyRequest, OxyResponse, OxyState
+from ...utils.stream_utils import StreamAggregator
 from .remote_llm import RemoteLLM
 
 logger = logging.getLogger(__name__)
@@ -23,8 +25,34 @@ class HttpLLM(RemoteLLM):
     This class provides a concrete implementation of RemoteLLM for communicating
     with remote LLM APIs over HTTP. It handles API authentication, request
     formatting, and response parsing for OpenAI-compatible APIs.
+
+    Requests go through one long-lived ``httpx.AsyncClient`` per instance, so
+    connections are kept alive between calls instead of paying a TCP and TLS
+    handshake for each of them.
     """
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def init(self):
+        await super().init()
+        self._get_client()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self._get_limits(), http2=self.http2
+            )
+        return self._client
+
+    async def cleanup(self) -> None:
+        """Close the shared HTTP client and its connections."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute an HTTP request to the remote LLM API.
 
@@ -103,10 +131,15 @@ class HttpLLM(RemoteLLM):
                 payload[k] = v
 
         if payload.get("stream", False) and (use_openai or not is_gemini):
+            if use_openai:
+                # OpenAI compatible APIs only report the usage of streams on demand
+                payload.setdefault("stream_options", {"include_usage": True})
             result_parts: list[str] = []
-            async with httpx.AsyncClient(timeout=None) as client:
-                async with client.stream(
-                    "POST", url, headers=headers, json=payload
+            usage = None
+            aggregator = StreamAggregator(oxy_request)
+            try:
+                async with self._get_client().stream(
+                    "POST", url, headers=headers, json=payload, timeout=None
                 ) as resp:
                     async for line in resp.aiter_lines():
                         if not line:
@@ -128,50 +161,68 @@ class HttpLLM(RemoteLLM):
                                 },
                             )
                         if use_openai:
-                            delta = chunk["choices"][0]["delta"].get(
-                                "content", ""
-                            ) or chunk["choices"][0]["delta"].get(
+                            usage = chunk.get("usage") or usage
+                            if not chunk.get("choices"):
+                                continue  # the last chunk only carries the usage
+                            choice_delta = chunk["choices"][0]["delta"]
+                            delta = choice_delta.get("content", "") or choice_delta.get(
                                 "reasoning_content", ""
                             )
                         else:
+                            if chunk.get("done"):
+                                usage = {
+                                    "prompt_tokens": chunk.get("prompt_eval_count"),
+                                    "completion_tokens": chunk.get("eval_count"),
+                                }
                             delta = chunk.get("message", {}).get(
                                 "content", ""
                             ) or chunk.get("message", {}).get("reasoning_content", "")
                         if delta:
                             result_parts.append(delta)
-                            await oxy_request.send_message(
-                                {
-                                    "type": "stream",
-                                    "content": {
-                                        "delta": delta,
-                                        "agent": oxy_request.caller,
-                                        "node_id": oxy_request.node_id,
-                                    },
-                                    "_is_stored": False,
-                                }
-                            )
+                            await aggregator.add(delta)
+                await aggregator.close()
+            finally:
+                aggregator.cancel()  # stops the timer if the stream failed
             result = "".join(result_parts)
-            return OxyResponse(state=OxyState.COMPLETED, output=result)
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            http_response = await client.post(url, headers=headers, json=payload)
-            http_response.raise_for_status()
-            data = http_response.json()
-            if "error" in data:
-                error_message = data["error"].get("message", "Unknown error")
-                raise ValueError(f"LLM API error: {error_message}")
-            if is_gemini:
-                result = (
-                    data["candidates"][0]["content"]["parts"][0].get("text", "")
-                    if data.get("candidates")
-                    else ""
-                )
-            elif use_openai:
-                response_message = data["choices"][0]["message"]
-                result = response_message.get("content") or response_message.get(
-                    "reasoning_content"
-                )
-            else:  # ollama
-                result = data["message"]["content"]
-
-            return OxyResponse(state=OxyState.COMPLETED, output=result)
+            return OxyResponse(
+                state=OxyState.COMPLETED,
+                output=result,
+                extra=self._usage_extra(usage),
+            )
+
+        http_response = await self._get_client().post(
+            url, headers=headers, json=payload
+        )
+        http_response.raise_for_status()
+        data = http_response.json()
+        if "error" in data:
+            error_message = data["error"].get("message", "Unknown error")
+            raise ValueError(f"LLM API error: {error_message}")
+        if is_gemini:
+            result = (
+                data["candidates"][0]["content"]["parts"][0].get("text", "")
+                if data.get("candidates")
+                else ""
+            )
+            usage_metadata = data.get("usageMetadata") or {}
+            usage = {
+                "prompt_tokens": usage_metadata.get("promptTokenCount"),
+                "completion_tokens": usage_metadata.get("candidatesTokenCount"),
+                "total_tokens": usage_metadata.get("totalTokenCount"),
+            }
+        elif use_openai:
+            response_message = data["choices"][0]["message"]
+            result = response_message.get("content") or response_message.get(
+                "reasoning_content"
+            )
+            usage = data.get("usage")
+        else:  # ollama
+            result = data["message"]["content"]
+            usage = {
+                "prompt_tokens": data.get("prompt_eval_count"),
+                "completion_tokens": data.get("eval_count"),
+            }
+
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=result, extra=self._usage_extra(usage)
+        )
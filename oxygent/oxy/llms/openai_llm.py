@@ -6,11 +6,14 @@ supports all OpenAI models and compatible APIs.
 """
 
 import logging
+from contextlib import asynccontextmanager
+from typing import Optional
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from ...config import Config
 from ...schemas import OxyRequest, OxyResponse, OxyState
+from ...utils.stream_utils import StreamAggregator
 from .remote_llm import RemoteLLM
 
 logger = logging.getLogger(__name__)
@@ -22,8 +25,62 @@ class OpenAILLM(RemoteLLM):
     This class provides a concrete implementation of RemoteLLM specifically designed
     for OpenAI's language models. It uses the official AsyncOpenAI client for
     optimal performance and compatibility with OpenAI's API standards.
+
+    The client and its connection pool are built once and reused by every
+    call; they are only rebuilt when ``api_key`` or ``base_url`` change, the
+    old client being closed once the calls still running on it are done.
+    Request headers are sent as ``extra_headers`` of each call.
     """
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._client: Optional[AsyncOpenAI] = None
+        self._client_key: Optional[tuple] = None
+        # number of calls running on each client, old clients close when idle
+        self._in_flight: dict[AsyncOpenAI, int] = {}
+
+    async def init(self):
+        await super().init()
+        await self._get_client()
+
+    async def _get_client(self) -> AsyncOpenAI:
+        """Return the shared client, rebuilding it when the endpoint changed."""
+        client_key = (self.api_key, self.base_url)
+        if self._client is not None and self._client_key != client_key:
+            client, self._client = self._client, None
+            if client not in self._in_flight:
+                await client.close()
+        if self._client is None:
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=DefaultAsyncHttpxClient(
+                    timeout=self.timeout, limits=self._get_limits(), http2=self.http2
+                ),
+            )
+            self._client_key = client_key
+        return self._client
+
+    async def cleanup(self) -> None:
+        """Close the shared client and its connections."""
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
+
+    @asynccontextmanager
+    async def _client_in_use(self):
+        """Yield the shared client, closing it after use if it was replaced."""
+        client = await self._get_client()
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1
+        try:
+            yield client
+        finally:
+            self._in_flight[client] -= 1
+            if not self._in_flight[client]:
+                del self._in_flight[client]
+                if client is not self._client:
+                    await client.close()
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute a request using the OpenAI API.
 
@@ -62,65 +119,55 @@ class OpenAILLM(RemoteLLM):
             if k == "messages":
                 continue
             payload[k] = v
-
-        client = AsyncOpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url,
-        )
-        completion = await client.chat.completions.create(**payload)
         if payload["stream"]:
-            answer = ""
-            think_start = True
-            think_end = False
-            async for chunk in completion:
-                if hasattr(chunk.choices[0].delta, "reasoning_content"):
-                    if think_start:
-                        await oxy_request.send_message(
-                            {
-                                "type": "stream",
-                                "content": {
-                                    "delta": "<think>",
-                                    "agent": oxy_request.caller,
-                                    "node_id": oxy_request.node_id,
-                                },
-                                "_is_stored": False,
-                            }
-                        )
-                        answer += "<think>"
-                        think_start = False
-                        think_end = True
-                    char = chunk.choices[0].delta.reasoning_content
-                elif hasattr(chunk.choices[0].delta, "content"):
-                    if think_end:
-                        await oxy_request.send_message(
-                            {
-                                "type": "stream",
-                                "content": {
-                                    "delta": "</think>",
-                                    "agent": oxy_request.caller,
-                                    "node_id": oxy_request.node_id,
-                                },
-                                "_is_stored": False,
-                            }
-                        )
-                        answer += "</think>"
-                        think_end = False
-                    char = chunk.choices[0].delta.content
-                if char:
-                    answer += char
-                    await oxy_request.send_message(
-                        {
-                            "type": "stream",
-                            "content": {
-                                "delta": char,
-                                "agent": oxy_request.caller,
-                                "node_id": oxy_request.node_id,
-                            },
-                            "_is_stored": False,
-                        }
-                    )
-            return OxyResponse(state=OxyState.COMPLETED, output=answer)
-        else:
-            return OxyResponse(
-                state=OxyState.COMPLETED, output=completion.choices[0].message.content
-            )
+            # OpenAI compatible APIs only report the usage of streams on demand
+            payload.setdefault("stream_options", {"include_usage": True})
+        extra_headers = self.headers(oxy_request)
+        if extra_headers:
+            payload["extra_headers"] = extra_headers
+
+        async with self._client_in_use() as client:
+            completion = await client.chat.completions.create(**payload)
+            if payload["stream"]:
+                answer = ""
+                aggregator = StreamAggregator(oxy_request)
+                think_start = True
+                think_end = False
+                usage = None
+                try:
+                    async for chunk in completion:
+                        if chunk.usage is not None:
+                            usage = chunk.usage.model_dump()
+                        if not chunk.choices:
+                            continue  # the last chunk only carries the usage
+                        delta = ""
+                        if hasattr(chunk.choices[0].delta, "reasoning_content"):
+                            if think_start:
+                                delta += "<think>"
+                                think_start = False
+                                think_end = True
+                            char = chunk.choices[0].delta.reasoning_content
+                        elif hasattr(chunk.choices[0].delta, "content"):
+                            if think_end:
+                                delta += "</think>"
+                                think_end = False
+                            char = chunk.choices[0].delta.content
+                        if char:
+                            delta += char
+                        answer += delta
+                        await aggregator.add(delta)
+                    await aggregator.close()
+                finally:
+                    aggregator.cancel()  # stops the timer if the stream failed
+                return OxyResponse(
+                    state=OxyState.COMPLETED,
+                    output=answer,
+                    extra=self._usage_extra(usage),
+                )
+            else:
+                usage = completion.usage.model_dump() if completion.usage else None
+                return OxyResponse(
+                    state=OxyState.COMPLETED,
+                    output=completion.choices[0].message.content,
+                    extra=self._usage_extra(usage),
+                )
@@ -1,5 +1,6 @@
 from typing import Callable, Dict, Optional
 
+import httpx
 from pydantic import Field, field_validator
 
 from ...schemas import OxyRequest, OxyResponse
@@ -17,6 +18,12 @@ class RemoteLLM(BaseLLM):
         api_key: The API key for authentication with the LLM service.
         base_url: The base URL endpoint for the LLM API.
         model_name: The specific model name to use for requests.
+        max_connections: Size of the connection pool, defaults to the largest
+            concurrency of the oxy so that every call has a connection.
+        max_keepalive_connections: Idle connections kept open, defaults to
+            ``max_connections``.
+        keepalive_expiry: Seconds after which an idle connection is closed.
+        http2: Whether to negotiate HTTP/2, requires the ``h2`` package.
     """
 
     api_key: Optional[str] = Field(default=None)
@@ -27,6 +34,16 @@ class RemoteLLM(BaseLLM):
         exclude=True,
         description="Extra HTTP headers or a function that returns headers",
     )
+    max_connections: Optional[int] = Field(
+        None, description="Connection pool size, defaults to the max concurrency."
+    )
+    max_keepalive_connections: Optional[int] = Field(
+        None, description="Idle connections kept open, defaults to the pool size."
+    )
+    keepalive_expiry: float = Field(
+        60, description="Seconds after which an idle connection is closed."
+    )
+    http2: bool = Field(False, description="Whether to use HTTP/2.")
 
     @field_validator("base_url", "model_name")
     @classmethod
@@ -64,5 +81,14 @@ class RemoteLLM(BaseLLM):
         else:
             raise ValueError("headers must be either a dict or a callable")
 
+    def _get_limits(self) -> httpx.Limits:
+        """Connection pool limits of the client of this LLM."""
+        max_connections = self.max_connections or self.get_max_concurrency()
+        return httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=self.max_keepalive_connections or max_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         raise NotImplementedError("This method is not yet implemented")
@@ -26,22 +26,47 @@ import traceback
 from datetime import datetime
 
 import aiofiles
-from fastapi import APIRouter, File, UploadFile
+from fastapi import APIRouter, File, Request, UploadFile
 from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 
 from .config import Config
-from .databases.db_es import JesEs, LocalEs
+from .databases.db_es import JesEs, LocalEs, SqliteEs
 from .db_factory import DBFactory
 from .oxy_factory import OxyFactory
 from .schemas import OxyRequest, WebResponse
-from .utils.data_utils import add_post_and_child_node_ids
+from .utils.blob_utils import BLOB_MARKER, rehydrate_blobs
+from .utils.codec_utils import decode_payload
+from .utils.common_utils import to_json
+from .utils.concurrency_utils import AdaptiveSemaphore
+from .utils.data_utils import add_post_and_child_node_ids, search_trace_nodes
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 
+def _get_es_client(request: Request):
+    """Return the ES client of the MAS serving *request*.
+
+    Falls back to building one from the config when the router is mounted
+    outside ``MAS.start_web_service``.
+    """
+    mas = getattr(request.app.state, "mas", None)
+    if mas is not None and mas.es_client is not None:
+        return mas.es_client
+    db_factory = DBFactory()
+    if Config.get_es_config():
+        jes_config = Config.get_es_config()
+        hosts = jes_config["hosts"]
+        user = jes_config["user"]
+        password = jes_config["password"]
+        return db_factory.get_instance(JesEs, hosts, user, password)
+    if Config.get_local_es_backend() == "sqlite":
+        return db_factory.get_instance(SqliteEs)
+    return db_factory.get_instance(LocalEs)
+
+
 # Basic route to redirect to the web interface
 @router.get("/")
 def read_root():
@@ -65,6 +90,24 @@ def check_alive():
     return {"alive": 1}
 
 
+@router.get("/concurrency")
+def get_concurrency(request: Request):
+    """Current limits of the oxys with an adaptive semaphore.
+
+    Returns:
+        dict: A ``WebResponse``-compatible dictionary mapping oxy names to the
+        ``stats()`` of their ``AdaptiveSemaphore``.
+    """
+    mas = getattr(request.app.state, "mas", None)
+    oxys = mas.oxy_name_to_oxy.values() if mas is not None else []
+    data = {
+        oxy.name: oxy._semaphore.stats()
+        for oxy in oxys
+        if isinstance(oxy._semaphore, AdaptiveSemaphore)
+    }
+    return WebResponse(data=data).to_dict()
+
+
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...)):
     upload_dir = os.path.join(Config.get_cache_save_dir(), "uploads")
@@ -84,7 +127,7 @@ async def upload_file(file: UploadFile = File(...)):
 
 
 @router.get("/node")
-async def get_node_info(item_id: str):
+async def get_node_info(request: Request, item_id: str):
     """Retrieve execution-node details using its *node_id* or *trace_id*.
 
     Args:
@@ -96,16 +139,8 @@ async def get_node_info(item_id: str):
         dict: A ``WebResponse``-compatible dictionary containing the node
         payload enriched with ``pre_id`` and ``next_id`` navigation helpers.
     """
-    db_factory = DBFactory()
-    if Config.get_es_config():
-        jes_config = Config.get_es_config()
-        hosts = jes_config["hosts"]
-        user = jes_config["user"]
-        password = jes_config["password"]
-        es_client = db_factory.get_instance(JesEs, hosts, user, password)
-    else:
-        es_client = db_factory.get_instance(LocalEs)
-    es_response = await es_client.search(
+    es_client = _get_es_client(request)
+    es_response = await es_client.search_all(
         Config.get_app_name() + "_node", {"query": {"term": {"_id": item_id}}}
     )
     try:
@@ -119,16 +154,8 @@ async def get_node_info(item_id: str):
 
         """Get trace_id from trace table (abandoned)"""
         """If error, get trace_id from node table."""
-        es_response = await es_client.search(
-            Config.get_app_name() + "_node",
-            {
-                "query": {"term": {"trace_id": trace_id}},  # all of the nodes
-                "size": 10000,
-                "sort": [{"create_time": {"order": "asc"}}],
-            },
-        )
         node_ids = []
-        for data in es_response["hits"]["hits"]:
+        for data in await search_trace_nodes(es_client, trace_id, all_partitions=True):
             node_ids.append(data["_source"]["node_id"])
 
         if len(node_ids) == 0:
@@ -137,7 +164,7 @@ async def get_node_info(item_id: str):
         if trace_id == item_id:
             # puting item_id from trace_id，get node_id data for another time
             item_id = node_ids[0]
-            es_response = await es_client.search(
+            es_response = await es_client.search_all(
                 Config.get_app_name() + "_node", {"query": {"term": {"_id": item_id}}}
             )
             datas = es_response["hits"]["hits"]
@@ -149,7 +176,11 @@ async def get_node_info(item_id: str):
                 node_data["next_id"] = node_ids[i + 1] if i <= len(node_ids) - 2 else ""
 
                 if "input" in node_data:
-                    node_data["input"] = json.loads(node_data["input"])
+                    node_data["input"] = await rehydrate_blobs(
+                        es_client, json.loads(decode_payload(node_data["input"]))
+                    )
+                if "output" in node_data:
+                    node_data["output"] = decode_payload(node_data["output"])
 
                 if "prompt" in node_data["input"]["class_attr"]:
                     del node_data["input"]["class_attr"]["prompt"]
@@ -184,21 +215,13 @@ async def get_node_info(item_id: str):
 
 # Define the data model for the LLM call request
 @router.get("/view")
-async def get_task_info(item_id: str):
-    db_factory = DBFactory()
-    if Config.get_es_config():
-        jes_config = Config.get_es_config()
-        hosts = jes_config["hosts"]
-        user = jes_config["user"]
-        password = jes_config["password"]
-        es_client = db_factory.get_instance(JesEs, hosts, user, password)
-    else:
-        es_client = db_factory.get_instance(LocalEs)
+async def get_task_info(request: Request, item_id: str):
+    es_client = _get_es_client(request)
 
     # es_client.exists(Config.get_app_name() + "_node", doc_id=item_id)
 
     # If item_id is node_id
-    es_response = await es_client.search(
+    es_response = await es_client.search_all(
         Config.get_app_name() + "_node", {"query": {"term": {"_id": item_id}}}
     )
     datas = es_response["hits"]["hits"]
@@ -209,16 +232,8 @@ async def get_task_info(item_id: str):
         # Input item_id as trace_id
         trace_id = item_id
 
-    es_response = await es_client.search(
-        Config.get_app_name() + "_node",
-        {
-            "query": {"term": {"trace_id": trace_id}},
-            "size": 10000,
-            "sort": [{"create_time": {"order": "asc"}}],
-        },
-    )
     nodes = []
-    for data in es_response["hits"]["hits"]:
+    for data in await search_trace_nodes(es_client, trace_id, all_partitions=True):
         data["_source"]["call_stack"] = data["_source"]["call_stack"]
         data["_source"]["node_id_stack"] = data["_source"]["node_id_stack"]
         data["_source"]["pre_node_ids"] = data["_source"]["pre_node_ids"]
@@ -227,7 +242,22 @@ async def get_task_info(item_id: str):
             and data["_source"]["pre_node_ids"][0] == ""
         ):
             data["_source"]["pre_node_ids"] = []
+        for field in ("input", "output"):
+            if field in data["_source"]:
+                data["_source"][field] = decode_payload(data["_source"][field])
         nodes.append(data["_source"])
+    # put the blobs back into the inputs of the whole trace with one search
+    blob_nodes = [
+        node
+        for node in nodes
+        if isinstance(node.get("input"), str) and BLOB_MARKER in node["input"]
+    ]
+    if blob_nodes:
+        inputs = await rehydrate_blobs(
+            es_client, [json.loads(node["input"]) for node in blob_nodes]
+        )
+        for node, node_input in zip(blob_nodes, inputs):
+            node["input"] = to_json(node_input)
     for index, node in enumerate(nodes):
         node["index"] = index
     add_post_and_child_node_ids(nodes)
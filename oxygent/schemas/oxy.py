@@ -74,6 +74,12 @@ class OxyRequest(BaseModel):
     is_load_data_for_restart: bool = Field(
         True, description="wehether to load data from database"
     )
+    reference_nodes: Optional[dict] = Field(
+        None,
+        exclude=True,
+        repr=False,
+        description="input_md5 -> node of the reference trace, preloaded for restart",
+    )
     input_md5: Optional[str] = Field("", description="")
     root_trace_ids: list = Field(default_factory=list, description="")
     mas: Optional[Any] = Field(None, description="", repr=False)
@@ -148,6 +154,7 @@ class OxyRequest(BaseModel):
         new_instance.mas = self.mas
         new_instance.shared_data = self.shared_data
         new_instance.group_data = self.group_data
+        new_instance.reference_nodes = self.reference_nodes
 
         return new_instance
 
@@ -315,6 +322,9 @@ class OxyRequest(BaseModel):
                 oxy_response.output = "\n\n".join(llm_tool_desc_list)
             return oxy_response
         except asyncio.TimeoutError:
+            # the timeout cancelled the call, so it never reached the retries
+            if hasattr(oxy, "report_overload"):
+                oxy.report_overload()
             logger.warning(
                 f"Task {caller_oxy.name} -> {oxy.name} was timeouted",
                 extra={
@@ -359,6 +369,14 @@ class OxyRequest(BaseModel):
             )
             await self.mas.send_message(message, redis_key)
 
+    async def send_messages(self, messages):
+        messages = [message for message in messages if message]
+        if self.mas and messages:
+            redis_key = (
+                f"{self.mas.message_prefix}:{self.mas.name}:{self.current_trace_id}"
+            )
+            await self.mas.send_messages(messages, redis_key)
+
     def set_query(self, query, master_level=False):
         if master_level:
             self.shared_data["query"] = query
@@ -0,0 +1,127 @@
+"""Content-addressed storage of large repeated strings of node payloads.
+
+Every LLM node of a ReAct loop is given the same system prompt, tool
+descriptions and short memory again. With the ``blob_store`` config enabled,
+``extract_blobs`` replaces each string of at least ``threshold`` bytes by a
+``"__oxyblob__:<sha256>"`` reference, ``save_blobs`` writes the strings once to
+``{app}_blob`` and ``rehydrate_blobs`` puts them back when a node is read.
+"""
+
+import hashlib
+import weakref
+
+from ..config import Config
+from .cache_utils import LRUCache
+
+BLOB_MARKER = "__oxyblob__:"
+
+# ids of the blobs each ES client is known to hold, to skip rewriting them
+_saved_blob_ids: "weakref.WeakKeyDictionary[object, LRUCache]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_blob_index_name() -> str:
+    return Config.get_app_name() + "_blob"
+
+
+def extract_blobs(obj, blobs: dict, threshold: int):
+    """Return a copy of *obj* whose large strings are blob references.
+
+    Args:
+        obj: A JSON-like structure.
+        blobs (dict): Filled with the extracted ``{blob_id: text}``.
+        threshold (int): Minimal size in bytes of an extracted string.
+    """
+    if isinstance(obj, str):
+        data = obj.encode("utf-8")
+        if len(data) < threshold or obj.startswith(BLOB_MARKER):
+            return obj
+        blob_id = hashlib.sha256(data).hexdigest()
+        blobs[blob_id] = obj
+        return BLOB_MARKER + blob_id
+    if isinstance(obj, dict):
+        return {k: extract_blobs(v, blobs, threshold) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [extract_blobs(v, blobs, threshold) for v in obj]
+    return obj
+
+
+async def save_blobs(es_client, blobs: dict) -> None:
+    """Write the *blobs* that *es_client* does not hold yet."""
+    saved = _saved_blob_ids.setdefault(es_client, LRUCache(max_size=10000))
+    actions = [
+        {
+            "_op_type": "index",
+            "_index": get_blob_index_name(),
+            "_id": blob_id,
+            "_source": {"blob_id": blob_id, "content": text},
+        }
+        for blob_id, text in blobs.items()
+        if blob_id not in saved
+    ]
+    if not actions:
+        return
+    result = await es_client.bulk(actions)
+    if result is None:
+        return
+    items = result.get("items") or []
+    if items:
+        # blobs that failed are written again with the next node using them
+        actions = [action for action, item in zip(actions, items) if _is_written(item)]
+    elif result.get("errors"):
+        return
+    # no items and no errors: the writes were queued, e.g. by EsWriteBuffer
+    for action in actions:
+        saved.set(action["_id"], True)
+
+
+def _is_written(item) -> bool:
+    """Whether a bulk result item reports a successful write."""
+    result = next(iter(item.values()), None) if isinstance(item, dict) else None
+    return (
+        isinstance(result, dict)
+        and "error" not in result
+        and result.get("status", 200) < 300
+    )
+
+
+def _collect_blob_ids(obj, blob_ids: set) -> None:
+    if isinstance(obj, str):
+        if obj.startswith(BLOB_MARKER):
+            blob_ids.add(obj[len(BLOB_MARKER) :])
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            _collect_blob_ids(v, blob_ids)
+    elif isinstance(obj, list):
+        for v in obj:
+            _collect_blob_ids(v, blob_ids)
+
+
+def _replace_blobs(obj, contents: dict):
+    if isinstance(obj, str):
+        if obj.startswith(BLOB_MARKER):
+            return contents.get(obj[len(BLOB_MARKER) :], obj)
+        return obj
+    if isinstance(obj, dict):
+        return {k: _replace_blobs(v, contents) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_replace_blobs(v, contents) for v in obj]
+    return obj
+
+
+async def rehydrate_blobs(es_client, obj):
+    """Return a copy of *obj* whose blob references are replaced by the blobs."""
+    blob_ids = set()
+    _collect_blob_ids(obj, blob_ids)
+    if not blob_ids:
+        return obj
+    es_response = await es_client.search(
+        get_blob_index_name(),
+        {"query": {"terms": {"blob_id": list(blob_ids)}}, "size": len(blob_ids)},
+    )
+    contents = {
+        hit["_source"]["blob_id"]: hit["_source"]["content"]
+        for hit in (es_response or {}).get("hits", {}).get("hits", [])
+    }
+    return _replace_blobs(obj, contents)
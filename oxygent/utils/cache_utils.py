@@ -0,0 +1,162 @@
+"""Bounded in-process caches, optionally backed by Redis."""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class LRUCache:
+    """Least-recently-used cache whose entries expire after ``ttl`` seconds.
+
+    Args:
+        max_size (int): Maximum number of entries kept; the least recently used
+            entry is evicted first.
+        ttl (float | None): Default time-to-live in seconds, ``None`` for no
+            expiry.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[Optional[float], Any]] = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expire_at, value = entry
+        if expire_at is not None and expire_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        expire_at = None if ttl is None else time.monotonic() + ttl
+        self._data[key] = (expire_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __contains__(self, key) -> bool:
+        return self.get(key, self) is not self
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TieredCache:
+    """Cache of JSON-serializable values in a local ``LRUCache``.
+
+    With a ``redis_client`` (anything offering async ``get``/``set``), every
+    value is also written to ``{prefix}:{key}`` so that other MAS instances can
+    read it, and local misses fall back to Redis. Values are stored encoded, so
+    callers always get a fresh copy they are free to mutate.
+
+    Args:
+        prefix (str): Namespace of the Redis keys.
+        max_size (int): Capacity of the local tier.
+        ttl (int): Time-to-live in seconds of both tiers.
+        redis_client: Optional Redis client used as the shared tier.
+    """
+
+    def __init__(
+        self, prefix: str, max_size: int = 1024, ttl: int = 3600, redis_client=None
+    ):
+        self.prefix = prefix
+        self.ttl = ttl
+        self.local = LRUCache(max_size=max_size, ttl=ttl)
+        self.redis_client = redis_client
+
+    async def get(self, key: str) -> Any:
+        raw = self.local.get(key)
+        if raw is None and self.redis_client is not None:
+            raw = await self.redis_client.get(f"{self.prefix}:{key}")
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            if raw is not None:
+                self.local.set(key, raw)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any) -> None:
+        raw = json.dumps(value, ensure_ascii=False)
+        self.local.set(key, raw)
+        if self.redis_client is not None:
+            await self.redis_client.set(f"{self.prefix}:{key}", raw, ex=self.ttl)
+
+
+class HistoryCache:
+    """Decoded conversation memories per ``(session_name, trace chain)``.
+
+    An entry holds the memories of a session over a chain of traces
+    (``root_trace_ids + [current_trace_id]``), oldest first. The entry of a new
+    turn is seeded from the one of the previous turn, whose chain is one trace
+    shorter, and grows as the agents of the turn save their history, so that
+    loading the short memory does not need to query ES.
+
+    Args:
+        max_size (int): Maximum number of entries kept.
+        max_length (int): Maximum number of memories kept per entry.
+    """
+
+    def __init__(self, max_size: int = 1000, max_length: int = 100):
+        self.max_length = max_length
+        self.entries = LRUCache(max_size=max_size)
+
+    def _entry(self, session_name: str, trace_ids: list[str]) -> Optional[dict]:
+        key = (session_name, tuple(trace_ids))
+        entry = self.entries.get(key)
+        if entry is None and len(trace_ids) > 1:
+            parent = self.entries.get((session_name, tuple(trace_ids[:-1])))
+            if parent is not None:
+                entry = {
+                    "memories": list(parent["memories"]),
+                    "is_complete": parent["is_complete"],
+                }
+                self.entries.set(key, entry)
+        return entry
+
+    def get(
+        self, session_name: str, trace_ids: list[str], size: int
+    ) -> Optional[list[dict]]:
+        """Return the last *size* memories, or None if they are not known."""
+        entry = self._entry(session_name, trace_ids)
+        if entry is None:
+            return None
+        memories = entry["memories"]
+        if len(memories) < size and not entry["is_complete"]:
+            return None
+        return memories[-size:] if size > 0 else []
+
+    def put(
+        self,
+        session_name: str,
+        trace_ids: list[str],
+        memories: list[dict],
+        is_complete: bool,
+    ) -> None:
+        """Store *memories* read from ES; *is_complete* if none were left out."""
+        entry = {"memories": list(memories), "is_complete": is_complete}
+        self._trim(entry)
+        self.entries.set((session_name, tuple(trace_ids)), entry)
+
+    def append(self, session_name: str, trace_ids: list[str], memory: dict) -> None:
+        """Record a newly saved memory if the session is cached."""
+        entry = self._entry(session_name, trace_ids)
+        if entry is not None:
+            entry["memories"].append(memory)
+            self._trim(entry)
+
+    def _trim(self, entry: dict) -> None:
+        if len(entry["memories"]) > self.max_length:
+            del entry["memories"][: -self.max_length]
+            entry["is_complete"] = False
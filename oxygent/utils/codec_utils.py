@@ -0,0 +1,58 @@
+"""Compression of large text payloads stored in ES.
+
+With the ``payload_codec`` config enabled, ``encode_payload`` turns texts of at
+least ``threshold`` bytes into ``"__oxyz__:<algorithm>:<base64 data>"``, using
+zstd when the ``zstandard`` package is installed and deflate otherwise.
+``decode_payload`` reverses it and returns any other value unchanged, so data
+written before the codec was enabled stays readable.
+"""
+
+import base64
+import zlib
+
+from ..config import Config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+PAYLOAD_MARKER = "__oxyz__:"
+
+
+def _compress(data: bytes, algorithm: str) -> bytes:
+    if algorithm == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return zlib.compress(data)
+
+
+def _decompress(data: bytes, algorithm: str) -> bytes:
+    if algorithm == "zstd":
+        if zstandard is None:
+            raise ImportError("`zstandard` not installed, please install it.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+def encode_payload(text: str) -> str:
+    """Compress *text* if the codec is enabled and it is large enough."""
+    if not Config.get_payload_codec_is_enabled() or not isinstance(text, str):
+        return text
+    data = text.encode("utf-8")
+    if len(data) < Config.get_payload_codec_threshold():
+        return text
+    algorithm = Config.get_payload_codec_algorithm()
+    if algorithm == "zstd" and zstandard is None:
+        algorithm = "deflate"
+    encoded = base64.b64encode(_compress(data, algorithm)).decode("ascii")
+    if len(encoded) >= len(text):
+        return text  # incompressible, e.g. already encoded data
+    return f"{PAYLOAD_MARKER}{algorithm}:{encoded}"
+
+
+def decode_payload(value):
+    """Return the original text of an ``encode_payload`` result."""
+    if not isinstance(value, str) or not value.startswith(PAYLOAD_MARKER):
+        return value
+    algorithm, _, encoded = value[len(PAYLOAD_MARKER) :].partition(":")
+    return _decompress(base64.b64decode(encoded), algorithm).decode("utf-8")
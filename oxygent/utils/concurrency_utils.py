@@ -0,0 +1,157 @@
+"""Adaptive concurrency limit for oxys calling remote endpoints.
+
+``AdaptiveSemaphore`` can replace the static ``asyncio.Semaphore`` of an oxy.
+Its limit follows AIMD (additive increase, multiplicative decrease), like TCP
+congestion control: every healthy call grows it by ``increase / limit``, so
+about ``increase`` per round of ``limit`` calls, and an overload (HTTP 429,
+5xx or a timeout) multiplies it by ``decrease_factor``. The limit thus settles
+around the concurrency the endpoint actually sustains. Like TCP after an idle
+period, the limit only grows while it is reached, so a quiet period does not
+inflate it.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+OVERLOAD_STATUS_CODES = {429}
+
+
+def is_overload_error(e: BaseException) -> bool:
+    """Whether *e* means the endpoint is overloaded: 429, 5xx or a timeout.
+
+    Works with the errors of httpx, openai and aiohttp without importing them,
+    by looking at their ``status_code`` / ``status`` and class names.
+    """
+    if isinstance(e, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    if "Timeout" in type(e).__name__:  # e.g. httpx.ReadTimeout
+        return True
+    response = getattr(e, "response", None)
+    for obj in (e, response):
+        status_code = getattr(obj, "status_code", None) or getattr(obj, "status", None)
+        if isinstance(status_code, int) and (
+            status_code in OVERLOAD_STATUS_CODES or status_code >= 500
+        ):
+            return True
+    return False
+
+
+class AdaptiveSemaphore:
+    """Semaphore whose limit adapts to the health of the calls it guards.
+
+    Used like ``asyncio.Semaphore``; callers report the outcome of each call
+    with ``on_success`` or ``on_overload``.
+
+    Args:
+        initial (int): Starting limit.
+        min_limit (int): The limit never goes below it.
+        max_limit (int): The limit never goes above it.
+        increase (float): Growth of the limit per round of ``limit`` healthy calls.
+        decrease_factor (float): Factor applied to the limit on overload.
+        latency_threshold (float | None): Calls slower than it, in seconds, do
+            not grow the limit; ``None`` ignores latency.
+        decrease_interval (float): Minimal delay in seconds between two
+            decreases, so a burst of failures of the same round cuts once.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_threshold: Optional[float] = None,
+        decrease_interval: float = 1.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_threshold = latency_threshold
+        self.decrease_interval = decrease_interval
+        self._in_use = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_decrease = float("-inf")
+        self.successes = 0
+        self.overloads = 0
+        self.decreases = 0
+
+    async def acquire(self) -> bool:
+        while self._in_use >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()  # hand the slot over
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_use += 1
+        return True
+
+    def release(self) -> None:
+        self._in_use -= 1
+        self._wake()
+
+    def locked(self) -> bool:
+        return self._in_use >= int(self.limit)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return None
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self._in_use
+        while self._waiters and free > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def on_success(self, latency: Optional[float] = None) -> None:
+        """Record a healthy call, growing the limit unless it was too slow.
+
+        The limit only grows while every slot is taken or callers wait; the
+        caller still holds its slot when reporting.
+        """
+        self.successes += 1
+        if self.latency_threshold is not None and latency is not None:
+            if latency > self.latency_threshold:
+                return
+        if self._in_use + len(self._waiters) < int(self.limit):
+            return  # the limit is not what holds the calls back
+        self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+        self._wake()
+
+    def on_overload(self) -> None:
+        """Record an overloaded call, cutting the limit once per interval."""
+        self.overloads += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+    def stats(self) -> dict:
+        """Current limit, usage and counters of the semaphore."""
+        return {
+            "limit": int(self.limit),
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+            "in_use": self._in_use,
+            "waiting": len(self._waiters),
+            "successes": self.successes,
+            "overloads": self.overloads,
+            "decreases": self.decreases,
+        }
@@ -1,5 +1,129 @@
 from collections import defaultdict
 
+from ..config import Config
+
+
+def compare_sort_values(a_values, b_values, descending) -> int:
+    """Compare the ``sort`` values of two ES hits like ES orders them.
+
+    Args:
+        a_values (List): Sort values of the first hit.
+        b_values (List): Sort values of the second hit.
+        descending (List[bool]): Whether each sort field is descending.
+
+    Returns:
+        int: Negative if the first hit comes first, positive if it comes
+        last, 0 if they tie. Missing values come last in either order.
+    """
+    for a, b, desc in zip(a_values, b_values, descending):
+        if a == b:
+            continue
+        if a is None:
+            return 1
+        if b is None:
+            return -1
+        result = (a > b) - (a < b)
+        return -result if desc else result
+    return 0
+
+
+async def scan_index(
+    es_client, index_name, sort, query=None, page_size=1000, all_partitions=False
+):
+    """Iterate over every hit of *query* in *index_name*, page by page.
+
+    Pages with ``search_after`` on *sort*, which must order the documents
+    totally (end it with a unique field), instead of a single oversized request.
+
+    Args:
+        es_client: Any ``BaseEs`` client.
+        index_name (str): The index to read.
+        sort (List[Dict]): ES sort specification.
+        query (Dict | None): ES query, every document when None.
+        page_size (int): Number of hits requested per page.
+        all_partitions (bool): Search every partition of a partitioned index
+            instead of the recent ones.
+
+    Yields:
+        List[Dict]: The ES hits of each page, each with ``_id`` and ``_source``.
+    """
+    body = {"query": query or {"match_all": {}}, "size": page_size, "sort": sort}
+    search = es_client.search_all if all_partitions else es_client.search
+    while True:
+        es_response = await search(index_name, body)
+        page = es_response["hits"]["hits"]
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        body["search_after"] = page[-1]["sort"]
+
+
+async def search_trace_nodes(es_client, trace_id, page_size=1000, all_partitions=False):
+    """Fetch every node hit of a trace in creation order.
+
+    Pages through ``{app}_node`` with ``search_after`` on
+    ``(create_time, node_id)`` instead of a single oversized request.
+
+    Args:
+        es_client: Any ``BaseEs`` client.
+        trace_id (str): The trace whose nodes are fetched.
+        page_size (int): Number of hits requested per page.
+        all_partitions (bool): Also look for the trace in old partitions.
+
+    Returns:
+        List[Dict]: The ES hits, each with ``_id`` and ``_source``.
+    """
+    hits = []
+    async for page in scan_index(
+        es_client,
+        Config.get_app_name() + "_node",
+        [{"create_time": {"order": "asc"}}, {"node_id": {"order": "asc"}}],
+        query={"term": {"trace_id": trace_id}},
+        page_size=page_size,
+        all_partitions=all_partitions,
+    ):
+        hits.extend(page)
+    return hits
+
+
+async def get_trace_meta(es_client, trace_id, trace_cache=None):
+    """Fetch the metadata a follow-up turn needs from a previous trace.
+
+    Served from *trace_cache* when possible; otherwise read from
+    ``{app}_trace`` and, when found, stored into the cache.
+
+    Args:
+        es_client: Any ``BaseEs`` client.
+        trace_id (str): The previous trace.
+        trace_cache (TieredCache | None): Cache of trace metadata.
+
+    Returns:
+        Dict | None: ``group_id``, ``group_data`` and ``root_trace_ids`` of the
+        trace, or None if it does not exist.
+    """
+    if trace_cache is not None:
+        trace_meta = await trace_cache.get(trace_id)
+        if trace_meta is not None:
+            return trace_meta
+
+    es_response = await es_client.search(
+        Config.get_app_name() + "_trace",
+        {"query": {"term": {"_id": trace_id}}, "size": 1},
+    )
+    hits = (es_response or {}).get("hits", {}).get("hits", [])
+    if not hits:
+        return None
+    source = hits[0]["_source"]
+    trace_meta = {
+        "group_id": source.get("group_id", ""),
+        "group_data": source.get("group_data", {}),
+        "root_trace_ids": source.get("root_trace_ids") or [],
+    }
+    if trace_cache is not None:
+        await trace_cache.set(trace_id, trace_meta)
+    return trace_meta
+
 
 def add_post_and_child_node_ids(nodes):
     """Adds `post_node_ids` and `child_node_ids` fields to each node.
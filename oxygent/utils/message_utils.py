@@ -0,0 +1,102 @@
+"""Encoding of the frontend messages passed through Redis to the SSE stream.
+
+A message is turned into its final SSE form when it is sent: ``encode_message``
+applies the frontend conversions and serializes it once, with ``orjson`` when
+it is installed. ``decode_message`` then hands the bytes to the SSE response
+without decoding and re-encoding them, except for the few control events.
+
+Values are ``b"\\xc1D" + data`` for data events and ``b"\\xc1E" + json`` for
+control events such as ``{"event": "close"}``. ``0xc1`` is never used by
+msgpack, so values written by the former msgpack encoding are still decoded.
+"""
+
+import json
+
+import msgpack
+
+from .common_utils import to_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DATA_PREFIX = b"\xc1D"
+EVENT_PREFIX = b"\xc1E"
+
+
+def _default(obj):
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+def dumps(obj) -> bytes:
+    """Serialize *obj* to JSON bytes, converting unknown types with ``str``."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=_default,
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except TypeError:  # e.g. integers over 64 bits
+            pass
+    return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def to_sse_message(message):
+    """Return *message* as the frontend expects it, without mutating it."""
+    if not isinstance(message, dict):
+        return message
+    message_type = message.get("type", "")
+    content = message.get("content")
+    if not isinstance(content, dict):
+        return message
+    # Convert before sending message: Use msg.content.arguments.query
+    if message_type == "tool_call":
+        arguments = content.get("arguments")
+        query = arguments.get("query", "") if isinstance(arguments, dict) else ""
+        if isinstance(query, list):
+            for msg in query:
+                if msg.get("type") == "text":
+                    arguments = {**arguments, "query": msg.get("text", "")}
+                    return {**message, "content": {**content, "arguments": arguments}}
+    elif message_type == "observation":
+        output = content.get("output")
+        if not isinstance(output, str):
+            output = dumps(output).decode("utf-8")
+        return {**message, "content": {**content, "output": output}}
+    return message
+
+
+def encode_message(message) -> bytes:
+    """Serialize *message* into its final SSE form."""
+    if isinstance(message, dict) and "event" in message:
+        return EVENT_PREFIX + dumps(message)
+    message = to_sse_message(message)
+    if isinstance(message, str):
+        return DATA_PREFIX + message.encode("utf-8")
+    return DATA_PREFIX + dumps(message)
+
+
+def decode_message(value):
+    """Return the SSE event of an encoded message, None for empty messages.
+
+    Data events are ``{"data": str}``; control events are returned as sent and
+    contain an ``"event"`` key.
+    """
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    if value.startswith(DATA_PREFIX):
+        return {"data": value[len(DATA_PREFIX) :].decode("utf-8")}
+    if value.startswith(EVENT_PREFIX):
+        return json.loads(value[len(EVENT_PREFIX) :])
+    message = msgpack.unpackb(value)  # written by the former encoding
+    if not message:
+        return None
+    if isinstance(message, dict) and "event" in message:
+        return message
+    return {"data": to_json(to_sse_message(message))}
@@ -0,0 +1,111 @@
+"""Coalescing of streamed LLM deltas into fewer ``stream`` messages.
+
+Sending every token as its own message costs an encoding, a redis push
+and an SSE frame each. ``StreamAggregator`` buffers the deltas of one LLM node
+and sends them as one message per ``flush_interval`` seconds or
+``max_chars`` characters. The first delta is sent right away so the time to
+first token is unchanged, and ``close`` sends whatever is left. ``cancel``
+drops it instead when the stream failed, so no delta is sent after the node
+ended.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from ..config import Config
+
+
+class StreamAggregator:
+    """Batch the stream deltas of a node before sending them.
+
+    Args:
+        oxy_request: The request of the streaming node, used to send messages.
+        flush_interval (float): Maximal delay of a delta in seconds, ``0``
+            sends every delta on its own.
+        max_chars (int): Buffered characters triggering an immediate flush.
+    """
+
+    def __init__(
+        self,
+        oxy_request,
+        flush_interval: Optional[float] = None,
+        max_chars: Optional[int] = None,
+    ):
+        self.oxy_request = oxy_request
+        self.flush_interval = (
+            Config.get_message_stream_flush_interval()
+            if flush_interval is None
+            else flush_interval
+        )
+        self.max_chars = (
+            Config.get_message_stream_max_chars() if max_chars is None else max_chars
+        )
+        self._buffer: list[str] = []
+        self._size = 0
+        self._last_flush: Optional[float] = None  # None until the first send
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()  # keeps the messages in order
+        self._closed = False
+
+    async def add(self, delta: str) -> None:
+        """Buffer *delta*, sending the buffer when it is due."""
+        if not delta or self._closed:
+            return
+        self._buffer.append(delta)
+        self._size += len(delta)
+        if (
+            self._last_flush is None
+            or self._size >= self.max_chars
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            await self.flush()
+        elif self._timer is None:
+            delay = self._last_flush + self.flush_interval - time.monotonic()
+            self._timer = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Send the buffered deltas as one message."""
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        if self._closed or not self._buffer:
+            return
+        delta = "".join(self._buffer)
+        self._buffer.clear()
+        self._size = 0
+        self._last_flush = time.monotonic()
+        async with self._lock:
+            await self.oxy_request.send_message(
+                {
+                    "type": "stream",
+                    "content": {
+                        "delta": delta,
+                        "agent": self.oxy_request.caller,
+                        "node_id": self.oxy_request.node_id,
+                    },
+                    "_is_stored": False,
+                }
+            )
+
+    async def close(self) -> None:
+        """Send the remaining deltas; call it once the stream has ended."""
+        await self.flush()
+        self.cancel()
+
+    def cancel(self) -> None:
+        """Drop the remaining deltas and stop sending, e.g. when the stream failed.
+
+        Does nothing once the aggregator is closed.
+        """
+        self._closed = True
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+        self._buffer.clear()
+        self._size = 0
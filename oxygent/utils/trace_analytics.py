@@ -0,0 +1,51 @@
+"""Offline analytics over node tables exported by ``trace_export``.
+
+Every function takes a pandas ``DataFrame`` of ``NODE_COLUMNS`` rows and
+aggregates it with vectorized group-bys, so millions of nodes are processed in
+seconds, e.g.::
+
+    nodes = load_table("export/node", columns=["callee", "latency_ms"])
+    latency_percentiles(nodes)
+"""
+
+from typing import Optional, Sequence
+
+import pandas as pd
+
+
+def load_table(path: str, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """Read an exported table (a directory of day partitions) into a DataFrame."""
+    return pd.read_parquet(path, columns=columns)
+
+
+def latency_percentiles(
+    nodes: pd.DataFrame,
+    by: str = "callee",
+    percentiles: Sequence[float] = (0.5, 0.9, 0.99),
+) -> pd.DataFrame:
+    """Latency count, mean and *percentiles* in milliseconds per *by* group."""
+    grouped = nodes.dropna(subset=["latency_ms"]).groupby(by)["latency_ms"]
+    result = grouped.agg(["count", "mean"])
+    for q in percentiles:
+        result[f"p{q * 100:g}"] = grouped.quantile(q)
+    return result.sort_values("count", ascending=False)
+
+
+def failure_rates(nodes: pd.DataFrame, by: str = "callee") -> pd.DataFrame:
+    """Number of calls, failed calls and failure rate per *by* group."""
+    result = (
+        nodes.assign(failed=nodes["state"] == "FAILED")
+        .groupby(by)
+        .agg(calls=("failed", "size"), failed=("failed", "sum"))
+    )
+    result["failure_rate"] = result["failed"] / result["calls"]
+    return result.sort_values("failure_rate", ascending=False)
+
+
+def fan_out(nodes: pd.DataFrame, by: str = "callee") -> pd.DataFrame:
+    """Direct children per call, aggregated per *by* group of the parent."""
+    children = nodes["father_node_id"].value_counts()
+    counts = nodes["node_id"].map(children).fillna(0)
+    result = counts.groupby(nodes[by]).agg(["mean", "max"])
+    result.columns = ["mean_children", "max_children"]
+    return result.sort_values("mean_children", ascending=False)
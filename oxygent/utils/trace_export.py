@@ -0,0 +1,263 @@
+"""Export of execution traces to Parquet files for offline analysis.
+
+``export_nodes`` and ``export_traces`` stream ``{app}_node`` and
+``{app}_trace`` out of any ``BaseEs`` client, flatten every document into one
+row and write the rows to Parquet files partitioned by day::
+
+    <out_dir>/node/date=2024-03-01/part-<run_id>-00000.parquet
+
+The files can be read back with ``trace_analytics.load_table``, pandas,
+pyarrow or any engine understanding hive partitioning. Writing them requires
+``pyarrow``.
+"""
+
+import asyncio
+import json
+import os
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from ..config import Config
+from ..schemas import OxyState
+from .blob_utils import BLOB_MARKER, rehydrate_blobs
+from .codec_utils import decode_payload
+from .common_utils import generate_uuid, to_json
+from .data_utils import scan_index
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# pyarrow type aliases of the exported columns
+NODE_COLUMNS = {
+    "node_id": "string",
+    "trace_id": "string",
+    "group_id": "string",
+    "request_id": "string",
+    "caller": "string",
+    "callee": "string",
+    "node_type": "string",
+    "father_node_id": "string",
+    "parallel_id": "string",
+    "state": "string",
+    "depth": "int32",
+    "create_time": "timestamp[us]",
+    "update_time": "timestamp[us]",
+    "latency_ms": "float64",
+    "input_size": "int64",
+    "output_size": "int64",
+    "prompt_tokens": "int64",
+    "completion_tokens": "int64",
+    "total_tokens": "int64",
+}
+
+TRACE_COLUMNS = {
+    "trace_id": "string",
+    "request_id": "string",
+    "group_id": "string",
+    "from_trace_id": "string",
+    "callee": "string",
+    "turn": "int32",
+    "create_time": "timestamp[us]",
+    "input_size": "int64",
+    "output_size": "int64",
+}
+
+
+def _parse_time(value) -> Optional[datetime]:
+    """Parse a ``yyyy-MM-dd HH:mm:ss.SSSSSSSSS`` time, truncated to microseconds."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.strptime(value[:26], "%Y-%m-%d %H:%M:%S.%f")
+    except ValueError:
+        return None
+
+
+def _text_size(value) -> Optional[int]:
+    return len(value) if isinstance(value, str) else None
+
+
+def _load_json(value) -> Any:
+    if not isinstance(value, str):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return None
+
+
+def flatten_node(source: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a ``{app}_node`` document into a ``NODE_COLUMNS`` row."""
+    create_time = _parse_time(source.get("create_time"))
+    update_time = _parse_time(source.get("update_time"))
+    latency_ms = None
+    if create_time and update_time:
+        latency_ms = (update_time - create_time).total_seconds() * 1000
+    try:
+        state = OxyState(source.get("state")).name
+    except ValueError:
+        state = None
+    call_stack = source.get("call_stack")
+    extra = _load_json(source.get("extra"))
+    usage = extra.get("usage") if isinstance(extra, dict) else None
+    usage = usage if isinstance(usage, dict) else {}
+    return {
+        "node_id": source.get("node_id"),
+        "trace_id": source.get("trace_id"),
+        "group_id": source.get("group_id"),
+        "request_id": source.get("request_id"),
+        "caller": source.get("caller"),
+        "callee": source.get("callee"),
+        "node_type": source.get("node_type"),
+        "father_node_id": source.get("father_node_id"),
+        "parallel_id": source.get("parallel_id"),
+        "state": state,
+        "depth": len(call_stack) if isinstance(call_stack, list) else None,
+        "create_time": create_time,
+        "update_time": update_time,
+        "latency_ms": latency_ms,
+        "input_size": _text_size(source.get("input")),
+        "output_size": _text_size(source.get("output")),
+        "prompt_tokens": usage.get("prompt_tokens"),
+        "completion_tokens": usage.get("completion_tokens"),
+        "total_tokens": usage.get("total_tokens"),
+    }
+
+
+def flatten_trace(source: dict[str, Any]) -> dict[str, Any]:
+    """Flatten a ``{app}_trace`` document into a ``TRACE_COLUMNS`` row."""
+    root_trace_ids = source.get("root_trace_ids")
+    return {
+        "trace_id": source.get("trace_id"),
+        "request_id": source.get("request_id"),
+        "group_id": source.get("group_id"),
+        "from_trace_id": source.get("from_trace_id"),
+        "callee": source.get("callee"),
+        "turn": len(root_trace_ids) + 1 if isinstance(root_trace_ids, list) else 1,
+        "create_time": _parse_time(source.get("create_time")),
+        "input_size": _text_size(source.get("input")),
+        "output_size": _text_size(source.get("output")),
+    }
+
+
+async def _load_payloads(es_client, sources: list[dict[str, Any]]) -> None:
+    """Put the original ``input`` and ``output`` texts back into *sources*.
+
+    The stored texts may be compressed by ``encode_payload`` and node inputs
+    hold references to blobs, so their sizes are only measured once restored.
+    """
+    with_blobs = []
+    for source in sources:
+        for field in ("input", "output"):
+            if field in source:
+                source[field] = decode_payload(source[field])
+        if isinstance(source.get("input"), str) and BLOB_MARKER in source["input"]:
+            with_blobs.append(source)
+    if with_blobs:
+        inputs = await rehydrate_blobs(
+            es_client, [_load_json(source["input"]) for source in with_blobs]
+        )
+        for source, value in zip(with_blobs, inputs):
+            source["input"] = to_json(value)
+
+
+def _write_parts(
+    table_dir: str,
+    rows_by_date: dict[str, list[dict[str, Any]]],
+    columns: dict[str, str],
+    file_prefix: str,
+) -> list[str]:
+    schema = pa.schema([(name, pa.type_for_alias(t)) for name, t in columns.items()])
+    paths = []
+    for date, rows in rows_by_date.items():
+        part_dir = os.path.join(table_dir, f"date={date}")
+        os.makedirs(part_dir, exist_ok=True)
+        path = os.path.join(part_dir, f"{file_prefix}.parquet")
+        pq.write_table(pa.Table.from_pylist(rows, schema=schema), path)
+        paths.append(path)
+    return paths
+
+
+async def _export_index(
+    es_client,
+    index_name: str,
+    sort: list[dict[str, Any]],
+    flatten: Callable[[dict[str, Any]], dict[str, Any]],
+    columns: dict[str, str],
+    table_dir: str,
+    batch_size: int,
+    page_size: int,
+) -> list[str]:
+    """Stream *index_name* into day partitions of *table_dir*.
+
+    At most *batch_size* rows are held in memory; each flush writes one file
+    per day it covers.
+    """
+    if pa is None:
+        raise ImportError(
+            "`pyarrow` not installed, please install it with `pip install pyarrow`."
+        )
+    run_id = generate_uuid(8)
+    paths: list[str] = []
+    rows_by_date: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    buffered = 0
+    async for page in scan_index(
+        es_client, index_name, sort, page_size=page_size, all_partitions=True
+    ):
+        sources = [hit["_source"] for hit in page]
+        await _load_payloads(es_client, sources)
+        for source in sources:
+            row = flatten(source)
+            create_time = row["create_time"]
+            date = create_time.strftime("%Y-%m-%d") if create_time else "unknown"
+            rows_by_date[date].append(row)
+            buffered += 1
+        if buffered >= batch_size:
+            prefix = f"part-{run_id}-{len(paths):05d}"
+            paths += await asyncio.to_thread(
+                _write_parts, table_dir, dict(rows_by_date), columns, prefix
+            )
+            rows_by_date.clear()
+            buffered = 0
+    if buffered:
+        prefix = f"part-{run_id}-{len(paths):05d}"
+        paths += await asyncio.to_thread(
+            _write_parts, table_dir, dict(rows_by_date), columns, prefix
+        )
+    return paths
+
+
+async def export_nodes(
+    es_client, out_dir: str, batch_size: int = 50000, page_size: int = 1000
+) -> list[str]:
+    """Export ``{app}_node`` to ``<out_dir>/node``, returning the written files."""
+    return await _export_index(
+        es_client,
+        Config.get_app_name() + "_node",
+        [{"create_time": {"order": "asc"}}, {"node_id": {"order": "asc"}}],
+        flatten_node,
+        NODE_COLUMNS,
+        os.path.join(out_dir, "node"),
+        batch_size,
+        page_size,
+    )
+
+
+async def export_traces(
+    es_client, out_dir: str, batch_size: int = 50000, page_size: int = 1000
+) -> list[str]:
+    """Export ``{app}_trace`` to ``<out_dir>/trace``, returning the written files."""
+    return await _export_index(
+        es_client,
+        Config.get_app_name() + "_trace",
+        [{"create_time": {"order": "asc"}}, {"trace_id": {"order": "asc"}}],
+        flatten_trace,
+        TRACE_COLUMNS,
+        os.path.join(out_dir, "trace"),
+        batch_size,
+        page_size,
+    )
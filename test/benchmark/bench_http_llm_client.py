@@ -0,0 +1,79 @@
+"""Benchmark of HttpLLM calls with a fresh or a shared HTTP client.
+
+A local stub server answers every chat completion at once, so the measured
+time is the client overhead. The fresh-client case closes the client after
+each call, like the former ``async with httpx.AsyncClient()`` per call, and
+pays a TCP handshake every time; against a real endpoint the TLS handshake
+adds one or more round trips on top.
+
+Run from the repository root with
+``PYTHONPATH=. python test/benchmark/bench_http_llm_client.py``.
+"""
+
+import asyncio
+import json
+import time
+
+from oxygent.oxy.llms.http_llm import HttpLLM
+from oxygent.schemas import OxyRequest
+
+BODY = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+    b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+)
+
+
+async def handle(reader, writer):
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            writer.write(RESPONSE)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def run(llm, number, fresh):
+    request = OxyRequest(
+        arguments={"messages": [{"role": "user", "content": "hi"}], "stream": False},
+        caller="bench",
+        caller_category="agent",
+        current_trace_id="bench",
+    )
+    start = time.perf_counter()
+    for _ in range(number):
+        await llm._execute(request)
+        if fresh:
+            await llm.cleanup()
+    return (time.perf_counter() - start) / number
+
+
+async def main(number=500):
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    llm = HttpLLM(
+        name="bench_llm",
+        api_key="sk-bench",
+        base_url=f"http://127.0.0.1:{port}/v1",
+        model_name="bench",
+    )
+    await llm.init()
+    await run(llm, 20, fresh=False)  # warm up
+    fresh = await run(llm, number, fresh=True)
+    shared = await run(llm, number, fresh=False)
+    await llm.cleanup()
+    server.close()
+    print(f"fresh client per call: {fresh * 1e6:.0f} us/call")
+    print(f"shared client:         {shared * 1e6:.0f} us/call, {fresh / shared:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""Microbenchmark of the SSE message path, from send_message to the SSE frame.
+
+Compares the former msgpack path (recursive preprocessing, pack, unpack,
+conversions and ``to_json``) with the single-encode path of ``message_utils``.
+
+Run from the repository root with
+``PYTHONPATH=. python test/benchmark/bench_message_encoding.py``.
+"""
+
+import timeit
+
+import msgpack
+
+from oxygent.utils import message_utils
+from oxygent.utils.common_utils import msgpack_preprocess, to_json
+from oxygent.utils.message_utils import decode_message, encode_message
+
+MESSAGES = {
+    "stream delta": {
+        "type": "stream",
+        "content": {"delta": "Hello", "agent": "master_agent", "node_id": "n" * 16},
+    },
+    "observation": {
+        "type": "observation",
+        "content": {
+            "node_id": "n" * 16,
+            "caller": "master_agent",
+            "callee": "search_tool",
+            "caller_category": "agent",
+            "callee_category": "tool",
+            "call_stack": ["user", "master_agent", "search_tool"],
+            "output": {
+                "results": [
+                    {"title": f"result {i}", "snippet": "lorem ipsum " * 20}
+                    for i in range(10)
+                ]
+            },
+            "current_trace_id": "t" * 16,
+            "request_id": "r" * 16,
+        },
+    },
+}
+
+
+def former_path(message):
+    bytes_msg = msgpack.packb(msgpack_preprocess(message))
+    message = msgpack.unpackb(bytes_msg)
+    if message.get("type", "") == "observation":
+        message["content"]["output"] = to_json(message["content"]["output"])
+    return {"data": to_json(message)}
+
+
+def single_encode_path(message):
+    return decode_message(encode_message(message))
+
+
+def main(number=20000):
+    encoders = ["orjson", "json"] if message_utils.orjson else ["json"]
+    orjson = message_utils.orjson
+    for name, message in MESSAGES.items():
+        former = timeit.timeit(lambda: former_path(message), number=number)
+        print(f"{name}: former path {former / number * 1e6:.2f} us/message")
+        for encoder in encoders:
+            message_utils.orjson = orjson if encoder == "orjson" else None
+            single = timeit.timeit(lambda: single_encode_path(message), number=number)
+            print(
+                f"{name}: single encode ({encoder}) "
+                f"{single / number * 1e6:.2f} us/message, {former / single:.1f}x"
+            )
+        message_utils.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ import pytest
 
 from oxygent.oxy.agents.base_agent import BaseAgent
 from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.utils.cache_utils import TieredCache
 
 
 # Define a dummy subclass implementing required abstract methods
@@ -84,3 +85,25 @@ class TestBaseAgent:
 
         await dummy_agent._post_save_data(oxy_response)
         assert dummy_agent.mas.es_client.index.call_count >= 2
+
+    async def test_trace_meta_cache_serves_follow_up_turn(self, dummy_agent):
+        """Test a follow-up turn reads root_trace_ids from the cache, not ES."""
+        dummy_agent.mas.trace_meta_cache = TieredCache("test", max_size=10)
+        oxy_request = OxyRequest(
+            arguments={},
+            caller="test",
+            caller_category="user",
+            current_trace_id="trace123",
+            root_trace_ids=["trace0"],
+        )
+        await dummy_agent._pre_save_data(oxy_request)
+
+        follow_up = OxyRequest(
+            arguments={},
+            caller="test",
+            caller_category="user",
+            from_trace_id="trace123",
+        )
+        result = await dummy_agent._pre_process(follow_up)
+        assert result.root_trace_ids == ["trace0", "trace123"]
+        dummy_agent.mas.es_client.search.assert_not_called()
@@ -2,12 +2,14 @@
 Unit tests for BaseLLM
 """
 
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
 
 import pytest
 
 from oxygent.oxy.llms.base_llm import BaseLLM
 from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.utils.cache_utils import TieredCache
 
 
 # ───────────────────────────────────────────────────────────────────────────────
@@ -65,3 +67,58 @@ async def test_execute_and_think(llm, oxy_request):
     oxy_request.send_message.assert_any_await(
         {"type": "think", "content": "internal", "agent": "user"}
     )
+
+
+@pytest.mark.asyncio
+async def test_deterministic_calls_are_cached(oxy_request):
+    llm = DummyLLM(name="dummy_llm", is_cache=True, llm_params={"temperature": 0})
+    llm.mas = SimpleNamespace(llm_cache=TieredCache(prefix="ut_llm_cache"))
+    llm._execute = AsyncMock(wraps=llm._execute)
+
+    first = await llm._execute_with_retries(oxy_request)
+    second = await llm._execute_with_retries(oxy_request)
+
+    assert llm._execute.await_count == 1
+    assert second.output == first.output
+    assert second.extra == {"is_cache_hit": True}
+    replayed = oxy_request.send_message.await_args.args[0]
+    assert replayed["type"] == "stream"
+    assert replayed["content"]["delta"] == first.output
+
+    oxy_request.arguments["messages"][-1]["content"] = "Bye"
+    await llm._execute_with_retries(oxy_request)
+    assert llm._execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_key_follows_the_messages_sent(oxy_request, monkeypatch):
+    llm = DummyLLM(name="dummy_llm", is_cache=True, llm_params={"temperature": 0})
+    llm.mas = SimpleNamespace(llm_cache=TieredCache(prefix="ut_llm_cache"))
+    llm._execute = AsyncMock(wraps=llm._execute)
+    prompt = {"content": "You are tester."}
+
+    async def get_messages(self, oxy_request):
+        return [{"role": "system", **prompt}] + oxy_request.arguments["messages"]
+
+    monkeypatch.setattr(DummyLLM, "_get_messages", get_messages)
+
+    await llm._execute_with_retries(oxy_request)
+    prompt["content"] = "You are reviewer."
+    await llm._execute_with_retries(oxy_request)
+    assert llm._execute.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_sampled_calls_bypass_cache_unless_forced(oxy_request):
+    llm = DummyLLM(name="dummy_llm", is_cache=True, llm_params={"temperature": 0.7})
+    llm.mas = SimpleNamespace(llm_cache=TieredCache(prefix="ut_llm_cache"))
+    llm._execute = AsyncMock(wraps=llm._execute)
+
+    for _ in range(2):
+        await llm._execute_with_retries(oxy_request)
+    assert llm._execute.await_count == 2
+
+    llm.is_cache_forced = True
+    for _ in range(2):
+        await llm._execute_with_retries(oxy_request)
+    assert llm._execute.await_count == 3
@@ -0,0 +1,134 @@
+"""
+Unit tests for blob_utils
+"""
+
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from oxygent.config import Config
+from oxygent.databases.db_es.local_es import LocalEs
+from oxygent.routes import router
+from oxygent.utils.blob_utils import (
+    BLOB_MARKER,
+    extract_blobs,
+    get_blob_index_name,
+    rehydrate_blobs,
+    save_blobs,
+)
+
+PROMPT = "You are a helpful assistant. " * 100
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def local_es(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.databases.db_es.local_es.Config.get_cache_save_dir",
+        lambda: str(tmp_path),
+    )
+    return LocalEs()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_extract_blobs_replaces_large_strings():
+    node_input = {
+        "class_attr": {"prompt": PROMPT, "name": "llm"},
+        "arguments": {
+            "messages": [
+                {"role": "system", "content": PROMPT},
+                {"role": "user", "content": "hi"},
+            ]
+        },
+    }
+    blobs = {}
+    extracted = extract_blobs(node_input, blobs, threshold=1024)
+
+    assert len(blobs) == 1
+    ref = BLOB_MARKER + next(iter(blobs))
+    assert extracted["class_attr"] == {"prompt": ref, "name": "llm"}
+    assert extracted["arguments"]["messages"][0]["content"] == ref
+    assert extracted["arguments"]["messages"][1]["content"] == "hi"
+    assert node_input["class_attr"]["prompt"] == PROMPT  # input left untouched
+
+
+@pytest.mark.asyncio
+async def test_save_and_rehydrate(local_es, monkeypatch):
+    blobs = {}
+    extracted = extract_blobs({"messages": [PROMPT, PROMPT + "!"]}, blobs, 1024)
+    await save_blobs(local_es, blobs)
+
+    calls = []
+    original = local_es.bulk
+
+    async def recording_bulk(actions):
+        calls.append(actions)
+        return await original(actions)
+
+    monkeypatch.setattr(local_es, "bulk", recording_bulk)
+    await save_blobs(local_es, blobs)
+    assert calls == []  # already stored
+
+    res = await local_es.search(get_blob_index_name(), {"size": 10})
+    assert len(res["hits"]["hits"]) == 2
+    rehydrated = await rehydrate_blobs(local_es, extracted)
+    assert rehydrated == {"messages": [PROMPT, PROMPT + "!"]}
+    assert await rehydrate_blobs(local_es, {"a": "b"}) == {"a": "b"}
+
+
+@pytest.mark.asyncio
+async def test_failed_blobs_are_saved_again(local_es, monkeypatch):
+    blobs = {}
+    extract_blobs([PROMPT, PROMPT + "!"], blobs, 1024)
+    calls = []
+
+    async def partly_failing_bulk(actions):
+        calls.append([action["_id"] for action in actions])
+        items = [{"index": {"_id": action["_id"], "status": 201}} for action in actions]
+        items[0]["index"] = {"_id": actions[0]["_id"], "status": 429, "error": {}}
+        return {"errors": True, "items": items}
+
+    monkeypatch.setattr(local_es, "bulk", partly_failing_bulk)
+    await save_blobs(local_es, blobs)
+    await save_blobs(local_es, blobs)
+    assert calls[1] == calls[0][:1]
+
+
+@pytest.mark.asyncio
+async def test_view_rehydrates_node_inputs(local_es):
+    blobs = {}
+    node_input = extract_blobs({"class_attr": {"prompt": PROMPT}}, blobs, 1024)
+    await save_blobs(local_es, blobs)
+    for i in range(2):
+        await local_es.index(
+            Config.get_app_name() + "_node",
+            f"n{i}",
+            {
+                "node_id": f"n{i}",
+                "trace_id": "t1",
+                "create_time": f"2026-01-01 00:00:0{i}",
+                "call_stack": ["user", "llm"],
+                "node_id_stack": ["", f"n{i}"],
+                "pre_node_ids": [""],
+                "father_node_id": "",
+                "input": json.dumps(node_input),
+            },
+        )
+
+    app = FastAPI()
+    app.include_router(router)
+    app.state.mas = SimpleNamespace(es_client=local_es)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        response = await client.get("/view", params={"item_id": "t1"})
+
+    nodes = response.json()["data"]["nodes"]
+    assert len(nodes) == 2
+    assert all(json.loads(n["input"])["class_attr"]["prompt"] == PROMPT for n in nodes)
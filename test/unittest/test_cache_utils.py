@@ -0,0 +1,98 @@
+"""
+Unit tests for cache_utils
+"""
+
+import pytest
+
+from oxygent.utils import cache_utils
+from oxygent.utils.cache_utils import HistoryCache, LRUCache, TieredCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value.encode("utf-8")
+        return True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# LRUCache
+# ──────────────────────────────────────────────────────────────────────────────
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+    assert cache.pop("a") == 1 and cache.get("a") is None
+
+
+def test_lru_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_utils.time, "monotonic", lambda: now[0])
+    cache = LRUCache(max_size=10, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+
+    now[0] += 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# TieredCache
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_tiered_cache_returns_copies():
+    cache = TieredCache("p", max_size=10)
+    value = {"ids": ["t1"]}
+    await cache.set("k", value)
+    value["ids"].append("t2")
+
+    cached = await cache.get("k")
+    assert cached == {"ids": ["t1"]}
+    cached["ids"].append("t3")
+    assert await cache.get("k") == {"ids": ["t1"]}
+    assert await cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_tiered_cache_falls_back_to_redis():
+    redis = FakeRedis()
+    writer = TieredCache("p", max_size=10, redis_client=redis)
+    await writer.set("k", {"group_id": "g"})
+    assert list(redis.store) == ["p:k"]
+
+    reader = TieredCache("p", max_size=10, redis_client=redis)
+    assert await reader.get("k") == {"group_id": "g"}
+    redis.store.clear()
+    assert await reader.get("k") == {"group_id": "g"}  # now in the local tier
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# HistoryCache
+# ──────────────────────────────────────────────────────────────────────────────
+def test_history_cache_seeds_next_turn_from_previous_one():
+    cache = HistoryCache(max_length=3)
+    assert cache.get("s", ["t1"], 10) is None
+
+    cache.put("s", ["t1"], [{"q": 1}], is_complete=True)
+    cache.append("s", ["t1", "t2"], {"q": 2})
+    cache.append("other", ["t1", "t2"], {"q": 0})  # unknown session, ignored
+    assert cache.get("s", ["t1", "t2"], 10) == [{"q": 1}, {"q": 2}]
+    assert cache.get("s", ["t1"], 10) == [{"q": 1}]
+    assert cache.get("other", ["t1", "t2"], 10) is None
+
+    cache.append("s", ["t1", "t2"], {"q": 3})
+    cache.append("s", ["t1", "t2"], {"q": 4})  # trims the oldest memory
+    assert cache.get("s", ["t1", "t2"], 2) == [{"q": 3}, {"q": 4}]
+    assert cache.get("s", ["t1", "t2"], 4) is None  # no longer complete
@@ -0,0 +1,52 @@
+"""
+Unit tests for codec_utils
+"""
+
+import json
+
+import pytest
+
+from oxygent.config import Config
+from oxygent.utils import codec_utils
+from oxygent.utils.codec_utils import PAYLOAD_MARKER, decode_payload, encode_payload
+
+LARGE_TEXT = json.dumps({"messages": [{"role": "user", "content": "hi " * 2000}]})
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def codec_enabled(monkeypatch):
+    monkeypatch.setattr(Config, "get_payload_codec_is_enabled", lambda: True)
+    monkeypatch.setattr(Config, "get_payload_codec_threshold", lambda: 1024)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_disabled_codec_keeps_text():
+    assert encode_payload(LARGE_TEXT) == LARGE_TEXT
+
+
+def test_small_text_is_not_compressed(codec_enabled):
+    assert encode_payload("short") == "short"
+    assert decode_payload("short") == "short"
+    assert decode_payload({"not": "text"}) == {"not": "text"}
+
+
+@pytest.mark.parametrize("algorithm", ["zstd", "deflate"])
+def test_round_trip(codec_enabled, monkeypatch, algorithm):
+    monkeypatch.setattr(Config, "get_payload_codec_algorithm", lambda: algorithm)
+    encoded = encode_payload(LARGE_TEXT)
+
+    assert encoded.startswith(PAYLOAD_MARKER)
+    assert len(encoded) < len(LARGE_TEXT) / 10
+    assert decode_payload(encoded) == LARGE_TEXT
+
+
+def test_zstd_falls_back_to_deflate(codec_enabled, monkeypatch):
+    monkeypatch.setattr(codec_utils, "zstandard", None)
+    encoded = encode_payload(LARGE_TEXT)
+    assert encoded.startswith(PAYLOAD_MARKER + "deflate:")
+    assert decode_payload(encoded) == LARGE_TEXT
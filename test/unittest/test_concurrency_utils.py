@@ -0,0 +1,156 @@
+"""
+Unit tests for concurrency_utils
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.utils.concurrency_utils import AdaptiveSemaphore, is_overload_error
+
+
+def http_error(status_code):
+    request = httpx.Request("POST", "http://llm.test/chat")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_is_overload_error():
+    assert is_overload_error(http_error(429))
+    assert is_overload_error(http_error(503))
+    assert is_overload_error(httpx.ReadTimeout("slow"))
+    assert is_overload_error(asyncio.TimeoutError())
+    assert not is_overload_error(http_error(400))
+    assert not is_overload_error(ValueError("bad output"))
+
+
+@pytest.mark.asyncio
+async def test_limits_concurrency_and_wakes_waiters():
+    semaphore = AdaptiveSemaphore(2)
+    await semaphore.acquire()
+    await semaphore.acquire()
+    waiter = asyncio.create_task(semaphore.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done() and semaphore.stats()["waiting"] == 1
+
+    semaphore.release()
+    await waiter
+    assert semaphore.stats()["in_use"] == 2
+
+
+@pytest.mark.asyncio
+async def test_aimd_limit_within_bounds():
+    semaphore = AdaptiveSemaphore(4, min_limit=2, max_limit=6, decrease_interval=0)
+    semaphore._in_use = 6  # every slot taken
+    for _ in range(4):
+        semaphore.on_success()
+    assert semaphore.stats()["limit"] == 4  # +1 per round of 4 calls
+    for _ in range(100):
+        semaphore.on_success()
+    assert semaphore.stats()["limit"] == 6
+
+    semaphore.on_overload()
+    assert semaphore.stats()["limit"] == 3
+    semaphore.on_overload()
+    assert semaphore.stats()["limit"] == 2
+
+    semaphore.latency_threshold = 1.0
+    semaphore.on_success(latency=5.0)
+    assert semaphore.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_only_when_reached():
+    semaphore = AdaptiveSemaphore(4, max_limit=64)
+    await semaphore.acquire()
+    for _ in range(100):
+        semaphore.on_success()  # one call at a time after a quiet period
+    assert semaphore.stats()["limit"] == 4
+
+    for _ in range(3):
+        await semaphore.acquire()
+    for _ in range(10):
+        semaphore.on_success()
+    assert semaphore.stats()["limit"] == 5  # no longer reached by the 4 calls
+
+
+@pytest.mark.asyncio
+async def test_one_decrease_per_interval():
+    semaphore = AdaptiveSemaphore(16, decrease_interval=60)
+    for _ in range(5):
+        semaphore.on_overload()
+    assert semaphore.stats()["limit"] == 8
+    assert semaphore.stats()["overloads"] == 5
+
+
+@pytest.mark.asyncio
+async def test_limit_settles_at_endpoint_capacity():
+    capacity = 8
+    semaphore = AdaptiveSemaphore(2, max_limit=64, decrease_interval=0.01)
+    in_flight, limits = 0, []
+
+    async def call():
+        nonlocal in_flight
+        async with semaphore:
+            in_flight += 1
+            await asyncio.sleep(0.001)
+            overloaded = in_flight > capacity
+            in_flight -= 1
+            if overloaded:
+                semaphore.on_overload()
+            else:
+                semaphore.on_success()
+            limits.append(semaphore.limit)
+
+    async def worker():
+        for _ in range(40):
+            await call()
+
+    await asyncio.gather(*(worker() for _ in range(32)))
+    settled = limits[len(limits) // 2 :]  # the limit saws around the capacity
+    assert capacity * 0.75 <= sum(settled) / len(settled) <= capacity * 1.5
+
+
+@pytest.mark.asyncio
+async def test_oxy_feeds_adaptive_semaphore():
+    class RateLimitedOxy(Oxy):
+        async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+            if oxy_request.arguments["q"] == "429":
+                raise http_error(429)
+            return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+    oxy = RateLimitedOxy(
+        name="remote", semaphore=8, is_adaptive_semaphore=True, retries=1
+    )
+    assert oxy.get_max_concurrency() == 32
+
+    await oxy.execute(OxyRequest(arguments={"q": "429"}, caller="test"))
+    assert oxy._semaphore.stats()["limit"] == 4
+    await oxy.execute(OxyRequest(arguments={"q": "ok"}, caller="test"))
+    assert oxy._semaphore.stats()["successes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeouts_reduce_the_limit():
+    class SlowOxy(Oxy):
+        async def execute(self, oxy_request: OxyRequest) -> OxyResponse:
+            await asyncio.sleep(1)
+            return OxyResponse(state=OxyState.COMPLETED, output="late")
+
+        async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+            pass
+
+    oxy = SlowOxy(name="slow", semaphore=8, is_adaptive_semaphore=True, timeout=0.01)
+    request = OxyRequest(callee="slow", callee_category="user")
+    request.set_mas(SimpleNamespace(oxy_name_to_oxy={"slow": oxy}))
+    response = await request.call(callee="slow", arguments={})
+
+    assert response.state == OxyState.FAILED
+    assert oxy._semaphore.stats()["limit"] == 4
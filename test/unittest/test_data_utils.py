@@ -2,7 +2,17 @@
 Unit tests for oxygent.utils.data_utils
 """
 
-from oxygent.utils.data_utils import add_post_and_child_node_ids, build_tree
+from unittest.mock import AsyncMock
+
+import pytest
+
+from oxygent.utils.cache_utils import TieredCache
+from oxygent.utils.data_utils import (
+    add_post_and_child_node_ids,
+    build_tree,
+    get_trace_meta,
+    search_trace_nodes,
+)
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -149,3 +159,47 @@ def test_build_tree_with_parallel_groups():
 
     tree = build_tree(input_nodes)
     assert _sorted_nodes(tree) == _sorted_nodes(expected)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# search_trace_nodes
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_search_trace_nodes_pages_with_search_after():
+    pages = [
+        [{"_id": "a", "sort": [1, "a"]}, {"_id": "b", "sort": [2, "b"]}],
+        [{"_id": "c", "sort": [3, "c"]}],
+    ]
+    bodies = []
+
+    async def search(index_name, body):
+        bodies.append(dict(body))
+        return {"hits": {"hits": pages[len(bodies) - 1]}}
+
+    es_client = AsyncMock()
+    es_client.search.side_effect = search
+    hits = await search_trace_nodes(es_client, "t", page_size=2)
+
+    assert [h["_id"] for h in hits] == ["a", "b", "c"]
+    assert "search_after" not in bodies[0]
+    assert bodies[1]["search_after"] == [2, "b"]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# get_trace_meta
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_get_trace_meta_populates_cache():
+    es_client = AsyncMock()
+    es_client.search.return_value = {
+        "hits": {"hits": [{"_source": {"group_id": "g", "root_trace_ids": ["r"]}}]}
+    }
+    cache = TieredCache("test", max_size=10)
+
+    expected = {"group_id": "g", "group_data": {}, "root_trace_ids": ["r"]}
+    assert await get_trace_meta(es_client, "t", cache) == expected
+    assert await get_trace_meta(es_client, "t", cache) == expected
+    assert es_client.search.await_count == 1
+
+    es_client.search.return_value = {"hits": {"hits": []}}
+    assert await get_trace_meta(es_client, "missing", cache) is None
@@ -0,0 +1,197 @@
+"""
+Unit tests for EsWriteBuffer
+"""
+
+import asyncio
+
+import pytest
+
+from oxygent.databases.db_es.es_write_buffer import EsWriteBuffer
+from oxygent.databases.db_es.local_es import LocalEs
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def local_es(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.databases.db_es.local_es.Config.get_cache_save_dir",
+        lambda: str(tmp_path),
+    )
+    return LocalEs()
+
+
+@pytest.fixture
+def bulk_calls(local_es, monkeypatch):
+    calls = []
+    original = local_es.bulk
+
+    async def recording_bulk(actions):
+        calls.append([(a["_op_type"], a["_id"]) for a in actions])
+        return await original(actions)
+
+    monkeypatch.setattr(local_es, "bulk", recording_bulk)
+    return calls
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_flush_by_batch_size(local_es, bulk_calls):
+    buffer = EsWriteBuffer(local_es, batch_size=3, flush_interval=60)
+    await buffer.index("idx", "a", {"v": 1})
+    await buffer.update("idx", "b", {"w": 2})
+    assert bulk_calls == []
+
+    await buffer.index("idx", "c", {"v": 3})
+    assert bulk_calls == [[("index", "a"), ("update", "b"), ("index", "c")]]
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_flush_by_interval(local_es, bulk_calls):
+    buffer = EsWriteBuffer(local_es, batch_size=100, flush_interval=0.01)
+    await buffer.index("idx", "a", {"v": 1})
+    await asyncio.sleep(0.05)
+    assert bulk_calls == [[("index", "a")]]
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_reads_see_pending_writes(local_es, bulk_calls):
+    buffer = EsWriteBuffer(local_es, batch_size=100, flush_interval=60)
+    body = {"v": 1}
+    await buffer.index("idx", "a", body)
+    body["v"] = 2  # later mutations of the caller's dict are not written
+
+    assert await buffer.exists("idx", "a") is True
+    res = await buffer.search("idx", {})
+    assert res["hits"]["hits"][0]["_source"] == {"v": 1}
+    assert len(bulk_calls) == 1
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_writes(local_es, bulk_calls):
+    buffer = EsWriteBuffer(local_es, batch_size=100, flush_interval=60)
+    await buffer.index("idx", "a", {"v": 1})
+    assert await buffer.close() is True
+    assert bulk_calls == [[("index", "a")]]
+    assert await local_es.exists("idx", "a") is True
+
+
+@pytest.mark.asyncio
+async def test_update_coalesces_into_pending_index(local_es, bulk_calls):
+    buffer = EsWriteBuffer(local_es, batch_size=100, flush_interval=60)
+    await buffer.index("idx", "a", {"state": "running", "input": "i"})
+    await buffer.update("idx", "a", {"state": "done", "output": "o"})
+    await buffer.update("idx", "b", {"x": 1})
+    await buffer.update("idx", "b", {"y": 2})
+    await buffer.flush()
+
+    assert bulk_calls == [[("index", "a"), ("update", "b")]]
+    res = await local_es.search("idx", {"query": {"term": {"_id": "a"}}})
+    assert res["hits"]["hits"][0]["_source"] == {
+        "state": "done",
+        "input": "i",
+        "output": "o",
+    }
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_hold_skips_started_write_of_fast_nodes(local_es, bulk_calls):
+    buffer = EsWriteBuffer(
+        local_es,
+        batch_size=100,
+        flush_interval=0.01,
+        hold_ms=80,
+        hold_indices=["idx"],
+    )
+    await buffer.index("idx", "fast", {"state": "running"})
+    await buffer.index("idx", "slow", {"state": "running"})
+    await buffer.index("other", "t", {"v": 1})
+    await asyncio.sleep(0.03)
+    assert bulk_calls == [[("index", "t")]]  # only node index actions are held
+
+    await buffer.update("idx", "fast", {"state": "done"})
+    await asyncio.sleep(0.03)
+    assert bulk_calls[1] == [("index", "fast")]
+
+    await asyncio.sleep(0.1)  # the hold of the long-running node expired
+    assert bulk_calls[2] == [("index", "slow")]
+    await buffer.update("idx", "slow", {"state": "done"})
+    await buffer.close()
+    assert bulk_calls[3] == [("update", "slow")]
+
+
+@pytest.mark.asyncio
+async def test_failed_bulk_is_retried(local_es, monkeypatch):
+    original = local_es.bulk
+    failures = [ConnectionError("es down")]
+
+    async def flaky_bulk(actions):
+        if failures:
+            raise failures.pop()
+        return await original(actions)
+
+    monkeypatch.setattr(local_es, "bulk", flaky_bulk)
+    buffer = EsWriteBuffer(local_es, batch_size=100, flush_interval=0.01)
+    await buffer.index("idx", "a", {"v": 1})
+    await buffer.flush()  # fails, the action is kept
+    await buffer.update("idx", "a", {"w": 2})
+
+    await asyncio.sleep(0.05)  # the timer retries
+    assert buffer._pending == {}
+    assert (await local_es.search("idx", {"query": {"term": {"_id": "a"}}}))["hits"][
+        "hits"
+    ][0]["_source"] == {"v": 1, "w": 2}
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_reads_flush_only_what_they_read(local_es, bulk_calls):
+    buffer = EsWriteBuffer(local_es, batch_size=100, flush_interval=60)
+    await buffer.index("idx", "a", {"v": 1})
+    await buffer.index("idx", "b", {"v": 2})
+    await buffer.index("other", "c", {"v": 3})
+
+    assert await buffer.exists("idx", "a") is True
+    assert bulk_calls == [[("index", "a")]]
+    await buffer.search("other", {})
+    assert bulk_calls[1] == [("index", "c")]
+    assert list(buffer._pending) == [("idx", "b")]
+    await buffer.close()
+
+
+@pytest.mark.asyncio
+async def test_requeue_drops_oldest_beyond_max_pending(local_es, monkeypatch):
+    async def failing_bulk(actions):
+        raise ConnectionError("es down")
+
+    monkeypatch.setattr(local_es, "bulk", failing_bulk)
+    buffer = EsWriteBuffer(local_es, batch_size=100, flush_interval=60, max_pending=2)
+    for doc_id in "abc":
+        await buffer.index("idx", doc_id, {})
+    await buffer.flush()
+
+    assert list(buffer._pending) == [("idx", "b"), ("idx", "c")]
+    buffer._timer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_search_sends_held_documents_only_when_read(local_es, bulk_calls):
+    buffer = EsWriteBuffer(
+        local_es, batch_size=100, flush_interval=60, hold_ms=60000, hold_indices=["idx"]
+    )
+    await buffer.index("idx", "a", {"state": "running"})
+    await buffer.index("idx", "b", {"state": "running"})
+
+    await buffer.search("idx", {"query": {"match_all": {}}})
+    assert bulk_calls == []
+    res = await buffer.search("idx", {"query": {"term": {"_id": "a"}}})
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["a"]
+    assert bulk_calls == [[("index", "a")]]
+    await buffer.close()
@@ -2,6 +2,9 @@
 Unit tests for HttpLLM
 """
 
+import json
+
+import httpx
 import pytest
 
 from oxygent.oxy.llms.http_llm import HttpLLM
@@ -72,12 +75,6 @@ async def test_execute_success(monkeypatch, llm, oxy_request):
             pass
 
     class FakeClient:
-        async def __aenter__(self):
-            return self
-
-        async def __aexit__(self, exc_type, exc, tb):
-            return False
-
         async def post(self, url, headers=None, json=None):
             captured["url"] = url
             captured["headers"] = headers
@@ -116,18 +113,88 @@ async def test_execute_http_error(monkeypatch, llm, oxy_request):
             raise FakeErrResponse("401")
 
     class FakeClient:
+        async def post(self, *a, **kw):
+            return ErrResp()
+
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.http_llm.httpx.AsyncClient", lambda *a, **k: FakeClient()
+    )
+
+    with pytest.raises(FakeErrResponse):
+        await llm._execute(oxy_request)
+
+
+@pytest.mark.asyncio
+async def test_execute_stream_coalesces_deltas(monkeypatch, llm, oxy_request):
+    usage = {"prompt_tokens": 5, "completion_tokens": 6, "total_tokens": 11}
+    lines = [
+        f'data: {{"choices": [{{"delta": {{"content": "{c}"}}}}]}}' for c in "Hello!"
+    ] + [f"data: {json.dumps({'choices': [], 'usage': usage})}", "data: [DONE]"]
+
+    class FakeStream:
         async def __aenter__(self):
             return self
 
         async def __aexit__(self, exc_type, exc, tb):
             return False
 
-        async def post(self, *a, **kw):
-            return ErrResp()
+        async def aiter_lines(self):
+            for line in lines:
+                yield line
+
+    class FakeClient:
+        def stream(self, method, url, headers=None, json=None, timeout=None):
+            return FakeStream()
 
     monkeypatch.setattr(
         "oxygent.oxy.llms.http_llm.httpx.AsyncClient", lambda *a, **k: FakeClient()
     )
+    monkeypatch.setattr(
+        "oxygent.utils.stream_utils.Config.get_message_stream_flush_interval",
+        lambda: 10,
+    )
+    sent = []
 
-    with pytest.raises(FakeErrResponse):
-        await llm._execute(oxy_request)
+    async def fake_send_message(self, message):
+        sent.append(message["content"]["delta"])
+
+    monkeypatch.setattr(
+        "oxygent.schemas.oxy.OxyRequest.send_message", fake_send_message
+    )
+
+    resp = await llm._execute(oxy_request)
+
+    assert resp.output == "Hello!"
+    assert resp.extra["usage"] == usage
+    assert sent == ["H", "ello!"]
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_and_closed(monkeypatch, llm, oxy_request):
+    oxy_request.arguments["stream"] = False
+    llm.semaphore = 4
+    clients, requests = [], []
+    async_client = httpx.AsyncClient
+
+    async def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "ok"}}]})
+
+    def fake_client(**kwargs):
+        clients.append(kwargs)
+        return async_client(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr("oxygent.oxy.llms.http_llm.httpx.AsyncClient", fake_client)
+
+    await llm.init()
+    client = llm._client
+    for _ in range(2):
+        assert (await llm._execute(oxy_request)).output == "ok"
+
+    assert len(clients) == 1 and len(requests) == 2
+    assert clients[0]["limits"].max_connections == 4
+    assert clients[0]["limits"].max_keepalive_connections == 4
+
+    await llm.cleanup()
+    assert llm._client is None
+    assert client.is_closed
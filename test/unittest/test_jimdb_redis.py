@@ -69,3 +69,111 @@ async def test_lpush_and_rpop(redis_client):
     pipe.__aenter__.return_value = pipe
     pipe.execute.return_value = [3]
     r.pipeline
+
+
+@pytest.mark.asyncio
+async def test_brpop_uses_blocking_pool(redis_client):
+    blocking = AsyncMock()
+    blocking.brpop.return_value = (b"k", b"v")
+    redis_client.blocking_pool = blocking
+
+    assert await redis_client.brpop("k", timeout=3) == b"v"
+    blocking.brpop.assert_awaited_once_with("k", timeout=3)
+    blocking.brpop.return_value = None
+    assert await redis_client.brpop("k") is None
+
+
+@pytest.mark.asyncio
+async def test_brpop_falls_back_to_polling(redis_client):
+    from aioredis.exceptions import ResponseError
+
+    blocking = AsyncMock()
+    blocking.brpop.side_effect = ResponseError("ERR unknown command 'BRPOP'")
+    redis_client.blocking_pool = blocking
+    redis_client.redis_pool.rpop.side_effect = [None, b"v"]
+
+    assert await redis_client.brpop("k") == b"v"
+    assert redis_client.brpop_supported is False
+
+
+@pytest.mark.asyncio
+async def test_blocking_pool_exhaustion_is_backpressure(redis_client):
+    from aioredis.exceptions import ConnectionError
+
+    blocking = AsyncMock()
+    blocking.brpop.side_effect = ConnectionError("No connection available.")
+    redis_client.blocking_pool = blocking
+    regular = redis_client.redis_pool
+
+    assert await redis_client.brpop("k") is None
+    assert redis_client.blocking_pool is blocking
+    assert redis_client.redis_pool is regular
+    blocking.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_regular_reconnect_keeps_blocking_pool(redis_client):
+    from aioredis.exceptions import ConnectionError
+
+    blocking = AsyncMock()
+    redis_client.blocking_pool = blocking
+    redis_client.redis_pool.get.side_effect = ConnectionError("reset")
+
+    with patch.object(redis_client, "_get_redis_connection") as reconnect:
+        reconnect.return_value.get = AsyncMock(return_value=b"v")
+        assert await redis_client.get("k") == b"v"
+    assert redis_client.blocking_pool is blocking
+    blocking.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_xadd(redis_client):
+    r = redis_client.redis_pool
+    pipe = AsyncMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute.return_value = [b"1-0", True]
+    r.pipeline = lambda transaction=False: pipe
+
+    assert await redis_client.xadd("s", {"data": b"x"}, max_size=5) == "1-0"
+    pipe.xadd.assert_called_once_with("s", {"data": b"x"}, maxlen=5, approximate=True)
+
+
+@pytest.mark.asyncio
+async def test_xread_decodes_entries(redis_client):
+    blocking = AsyncMock()
+    blocking.xread.return_value = [[b"s", [(b"1-0", {b"data": b"x"})]]]
+    redis_client.blocking_pool = blocking
+
+    assert await redis_client.xread("s", "0-0", timeout=2) == [("1-0", {"data": b"x"})]
+    blocking.xread.assert_awaited_once_with({"s": "0-0"}, count=None, block=2000)
+
+
+@pytest.mark.asyncio
+async def test_lpush_batch_one_transaction(redis_client):
+    pipe = AsyncMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute.return_value = [2, True, True]
+    calls = []
+
+    def pipeline(transaction=False):
+        calls.append(transaction)
+        return pipe
+
+    redis_client.redis_pool.pipeline = pipeline
+
+    assert await redis_client.lpush_batch("k", [b"a", b"b"], transaction=True) == 2
+    assert calls == [True]
+    pipe.lpush.assert_called_once_with("k", b"a", b"b")
+
+
+@pytest.mark.asyncio
+async def test_xadd_batch_one_round_trip(redis_client):
+    pipe = AsyncMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute.return_value = [b"1-0", b"1-1", True]
+    redis_client.redis_pool.pipeline = lambda transaction=False: pipe
+
+    ids = await redis_client.xadd_batch("s", [{"data": b"a"}, {"data": b"b"}])
+    assert ids == ["1-0", "1-1"]
+    assert pipe.xadd.call_count == 2
+    pipe.execute.assert_awaited_once()
@@ -92,3 +92,37 @@ async def test_close_client(jes_es, mock_client):
     res = await jes_es.close()
     assert res is None
     mock_client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_bulk(jes_es, mock_client):
+    mock_client.bulk.return_value = {"errors": False, "items": []}
+    res = await jes_es.bulk(
+        [
+            {"_op_type": "index", "_index": "idx", "_id": "1", "_source": {"a": 1}},
+            {"_op_type": "update", "_index": "idx", "_id": "1", "_source": {"b": 2}},
+        ]
+    )
+    assert res["errors"] is False
+    mock_client.bulk.assert_awaited_once_with(
+        body=[
+            {"index": {"_index": "idx", "_id": "1"}},
+            {"a": 1},
+            {"update": {"_index": "idx", "_id": "1"}},
+            {"doc": {"b": 2}},
+        ]
+    )
+
+
+@pytest.mark.asyncio
+async def test_list_and_delete_indices(jes_es, mock_client):
+    mock_client.indices.get_alias.return_value = {"n-2": {}, "n-1": {}}
+    assert await jes_es.list_indices("n-") == ["n-1", "n-2"]
+    mock_client.indices.get_alias.assert_awaited_once_with(
+        index="n-*", allow_no_indices=True
+    )
+
+    await jes_es.delete_index("n-1")
+    mock_client.indices.delete.assert_awaited_once_with(
+        index="n-1", ignore_unavailable=True
+    )
@@ -12,6 +12,7 @@ from oxygent.oxy.agents.local_agent import LocalAgent
 from oxygent.oxy.base_tool import BaseTool
 from oxygent.oxy.function_tools.function_tool import FunctionTool
 from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.utils.cache_utils import HistoryCache
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -141,3 +142,38 @@ async def test_full_execute_cycle(dummy_local_agent, oxy_request):
     resp = await dummy_local_agent.execute(copy.deepcopy(oxy_request))
     assert resp.state == OxyState.COMPLETED
     assert resp.output == "hello"
+
+
+@pytest.mark.asyncio
+async def test_history_cache_serves_next_turn(dummy_local_agent, mas_env):
+    mas_env.history_cache = HistoryCache()
+    mas_env.es_client.search.return_value = {
+        "hits": {"hits": [{"_source": {"memory": '{"query": "q1", "answer": "a1"}'}}]}
+    }
+    turn2 = OxyRequest(
+        arguments={"query": "q2"},
+        caller="user",
+        callee="agent_tester",
+        caller_category="user",
+        from_trace_id="t1",
+        root_trace_ids=["t1"],
+        current_trace_id="t2",
+        is_save_history=True,
+    )
+    memory = await dummy_local_agent._get_history(turn2)
+    assert [m["content"] for m in memory.to_dict_list()] == ["q1", "a1"]
+    assert mas_env.es_client.search.await_count == 1
+
+    await dummy_local_agent._post_save_data(
+        OxyResponse(state=OxyState.COMPLETED, output="a2", oxy_request=turn2)
+    )
+    turn3 = turn2.model_copy(
+        update={
+            "from_trace_id": "t2",
+            "root_trace_ids": ["t1", "t2"],
+            "current_trace_id": "t3",
+        }
+    )
+    memory = await dummy_local_agent._get_history(turn3)
+    assert [m["content"] for m in memory.to_dict_list()] == ["q1", "a1", "q2", "a2"]
+    assert mas_env.es_client.search.await_count == 1
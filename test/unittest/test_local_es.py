@@ -2,6 +2,7 @@
 Unit tests for LocalEs
 """
 
+import asyncio
 import os
 import shutil
 
@@ -90,3 +91,268 @@ async def test_search_term_terms_bool_sort(local_es):
 async def test_close(local_es):
     res = await local_es.close()
     assert res is True
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Log storage mode
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def log_es(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.databases.db_es.local_es.Config.get_cache_save_dir",
+        lambda: str(tmp_path),
+    )
+    return LocalEs(storage_mode="log")
+
+
+@pytest.mark.asyncio
+async def test_log_mode_index_update_search(log_es):
+    await log_es.create_index("idx", {"mappings": {}})
+    assert os.path.exists(os.path.join(log_es.data_dir, "idx.jsonl"))
+
+    await log_es.index("idx", "a", {"k": "v1", "n": 1})
+    await log_es.index("idx", "b", {"k": "v2", "n": 2})
+    await log_es.update("idx", "a", {"n": 3})
+
+    assert await log_es.exists("idx", "a") is True
+    assert await log_es.exists("idx", "zzz") is False
+
+    res = await log_es.search("idx", {"query": {"term": {"_id": "a"}}})
+    assert res["hits"]["hits"][0]["_source"] == {"k": "v1", "n": 3}
+
+    hit = await log_es.get_by_node_id("idx", "missing")
+    assert hit is None
+
+
+@pytest.mark.asyncio
+async def test_log_mode_reload_and_torn_record(log_es):
+    await log_es.create_index("idx", {"mappings": {}})
+    await log_es.index("idx", "a", {"v": 1})
+    await log_es.update("idx", "a", {"w": 2})
+    with open(os.path.join(log_es.data_dir, "idx.jsonl"), "ab") as f:
+        f.write(b'{"_id": "b", "_sour')  # crash in the middle of an append
+
+    reopened = LocalEs(storage_mode="log")
+    res = await reopened.search("idx", {})
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["a"]
+    assert res["hits"]["hits"][0]["_source"] == {"v": 1, "w": 2}
+
+    await reopened.index("idx", "c", {"v": 3})
+    res = await reopened.search("idx", {})
+    assert {h["_id"] for h in res["hits"]["hits"]} == {"a", "c"}
+
+
+@pytest.mark.asyncio
+async def test_log_mode_compaction(log_es, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.databases.db_es.local_es.Config.get_local_es_compaction_min_records",
+        lambda: 10,
+    )
+    await log_es.create_index("idx", {"mappings": {}})
+    for i in range(20):
+        await log_es.update("idx", "doc", {"i": i})
+    await log_es.index("idx", "other", {"i": -1})
+    await log_es.close()  # waits for the background compaction
+
+    with open(os.path.join(log_es.data_dir, "idx.jsonl"), "rb") as f:
+        assert len(f.readlines()) <= 3
+    res = await log_es.search("idx", {"query": {"term": {"_id": "doc"}}})
+    assert res["hits"]["hits"][0]["_source"]["i"] == 19
+    assert await log_es.exists("idx", "other") is True
+
+
+@pytest.mark.asyncio
+async def test_log_mode_imports_legacy_json(local_es):
+    await local_es.create_index("idx", {"mappings": {}})
+    await local_es.index("idx", "old", {"v": 1})
+
+    log_es = LocalEs(storage_mode="log")
+    assert await log_es.exists("idx", "old") is True
+    await log_es.index("idx", "new", {"v": 2})
+    res = await log_es.search("idx", {})
+    assert len(res["hits"]["hits"]) == 2
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Document cache and keyword indexes
+# ──────────────────────────────────────────────────────────────────────────────
+KEYWORD_MAPPING = {
+    "mappings": {
+        "properties": {
+            "trace_id": {"type": "keyword"},
+            "root_trace_ids": {"type": "keyword"},
+            "n": {"type": "integer"},
+        }
+    }
+}
+
+
+@pytest.mark.asyncio
+async def test_keyword_index_follows_updates(local_es):
+    await local_es.create_index("idx", KEYWORD_MAPPING)
+    await local_es.index("idx", "a", {"trace_id": "t1", "n": 1})
+    await local_es.index("idx", "b", {"trace_id": "t1", "n": 2})
+    await local_es.index("idx", "c", {"trace_id": "t2", "root_trace_ids": ["r", "s"]})
+
+    res = await local_es.search("idx", {"query": {"term": {"trace_id": "t1"}}})
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["a", "b"]
+
+    await local_es.update("idx", "a", {"trace_id": "t2"})
+    q = {"query": {"terms": {"trace_id": ["t2", "t3"]}}}
+    res = await local_es.search("idx", q)
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["a", "c"]
+
+    q = {"query": {"term": {"root_trace_ids": ["r", "s"]}}}
+    res = await local_es.search("idx", q)
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["c"]
+
+    q = {
+        "query": {"bool": {"must": [{"term": {"trace_id": "t1"}}, {"term": {"n": 2}}]}}
+    }
+    res = await local_es.search("idx", q)
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["b"]
+
+
+@pytest.mark.asyncio
+async def test_cache_reads_disk_once_and_hits_are_copies(local_es, monkeypatch):
+    await local_es.create_index("idx", KEYWORD_MAPPING)
+    await local_es.index("idx", "a", {"trace_id": "t1", "node_id": "n1"})
+
+    reads = []
+    original = local_es._read_index
+
+    async def counting_read(index_name):
+        reads.append(index_name)
+        return await original(index_name)
+
+    monkeypatch.setattr(local_es, "_read_index", counting_read)
+    for _ in range(3):
+        res = await local_es.search("idx", {"query": {"term": {"trace_id": "t1"}}})
+        res["hits"]["hits"][0]["_source"]["trace_id"] = "mutated"
+    hit = await local_es.get_by_node_id("idx", "n1")
+
+    assert reads == ["idx"]
+    assert hit["_source"]["trace_id"] == "t1"
+
+
+@pytest.mark.asyncio
+async def test_update_by_node_id_is_atomic(local_es):
+    await local_es.create_index("idx", KEYWORD_MAPPING)
+    await local_es.index("idx", "a", {"trace_id": "t1", "node_id": "n1"})
+    es = LocalEs()  # cold cache: the lookup reads the disk
+
+    await asyncio.gather(
+        es.update_by_node_id("idx", "n1", {"done": True}),
+        es.index("idx", "a", {"trace_id": "t1", "node_id": "n2"}),
+    )
+    hit = await es.get_by_node_id("idx", "n2")
+    assert "done" not in hit["_source"]  # not merged into the replaced node
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Sorting and search_after
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_top_k_multi_key_sort_with_missing_values(local_es):
+    await local_es.create_index("idx", {"mappings": {}})
+    rows = {
+        "a": (1, "x"),
+        "b": (2, "y"),
+        "c": (2, "z"),
+        "d": (None, "w"),
+        "e": (3, "v"),
+    }
+    for doc_id, (t, k) in rows.items():
+        body = {"k": k} if t is None else {"t": t, "k": k}
+        await local_es.index("idx", doc_id, body)
+
+    spec = [{"t": {"order": "desc"}}, {"k": {"order": "asc"}}]
+    res = await local_es.search("idx", {"sort": spec, "size": 3})
+    hits = res["hits"]["hits"]
+    assert [h["_id"] for h in hits] == ["e", "b", "c"]
+    assert hits[-1]["sort"] == [2, "z"]
+
+    res = await local_es.search("idx", {"sort": spec, "size": 10})
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["e", "b", "c", "a", "d"]
+
+
+@pytest.mark.asyncio
+async def test_search_after_pages_through_index(local_es):
+    await local_es.create_index("idx", {"mappings": {}})
+    for i in range(7):
+        await local_es.index(
+            "idx", f"n{i}", {"create_time": i // 2, "node_id": f"n{i}"}
+        )
+
+    body = {
+        "sort": [{"create_time": {"order": "asc"}}, {"node_id": {"order": "asc"}}],
+        "size": 3,
+    }
+    seen = []
+    while True:
+        page = (await local_es.search("idx", body))["hits"]["hits"]
+        seen.extend(h["_id"] for h in page)
+        if len(page) < body["size"]:
+            break
+        body["search_after"] = page[-1]["sort"]
+    assert seen == [f"n{i}" for i in range(7)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_writes_each_index_once(local_es, monkeypatch):
+    await local_es.create_index("idx", KEYWORD_MAPPING)
+    await local_es.index("idx", "a", {"trace_id": "t0", "n": 0})
+    writes = []
+    original = local_es._write_json_atomic
+
+    async def counting_write(path, data):
+        writes.append(os.path.basename(path))
+        await original(path, data)
+
+    monkeypatch.setattr(local_es, "_write_json_atomic", counting_write)
+    res = await local_es.bulk(
+        [
+            {"_op_type": "index", "_index": "idx", "_id": "b", "_source": {"n": 1}},
+            {"_op_type": "update", "_index": "idx", "_id": "a", "_source": {"n": 2}},
+            {"_op_type": "update", "_index": "idx", "_id": "b", "_source": {"m": 3}},
+            {"_op_type": "index", "_index": "other", "_id": "c", "_source": {}},
+        ]
+    )
+    assert res["errors"] is False and len(res["items"]) == 4
+    assert writes == ["idx.json", "other.json"]
+
+    res = await local_es.search("idx", {"query": {"term": {"trace_id": "t0"}}})
+    assert res["hits"]["hits"][0]["_source"] == {"trace_id": "t0", "n": 2}
+    res = await local_es.search("idx", {"query": {"term": {"_id": "b"}}})
+    assert res["hits"]["hits"][0]["_source"] == {"n": 1, "m": 3}
+
+
+@pytest.mark.asyncio
+async def test_log_mode_bulk(log_es):
+    await log_es.create_index("idx", {"mappings": {}})
+    await log_es.index("idx", "a", {"v": 1})
+    await log_es.bulk(
+        [
+            {"_op_type": "update", "_index": "idx", "_id": "a", "_source": {"w": 2}},
+            {"_op_type": "update", "_index": "idx", "_id": "a", "_source": {"x": 3}},
+        ]
+    )
+    reopened = LocalEs(storage_mode="log")
+    res = await reopened.search("idx", {})
+    assert res["hits"]["hits"][0]["_source"] == {"v": 1, "w": 2, "x": 3}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("es_fixture", ["local_es", "log_es"])
+async def test_list_and_delete_indices(request, es_fixture):
+    es = request.getfixturevalue(es_fixture)
+    for name in ("node-20240301", "node-20240302", "trace"):
+        await es.create_index(name, {"mappings": {}})
+        await es.index(name, "a", {"v": 1})
+
+    assert await es.list_indices("node-") == ["node-20240301", "node-20240302"]
+    await es.delete_index("node-20240301")
+    assert await es.list_indices("node-") == ["node-20240302"]
+    assert await es.exists("node-20240301", "a") is False
+    assert await es.exists("node-20240302", "a") is True
+    assert "node-20240301_mapping.json" not in os.listdir(es.data_dir)
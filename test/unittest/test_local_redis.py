@@ -2,6 +2,7 @@
 Unit tests for LocalRedis
 """
 
+import asyncio
 import time
 
 import pytest
@@ -77,3 +78,136 @@ async def test_expiry(redis):
 @pytest.mark.asyncio
 async def test_close(redis):
     assert await redis.close() is None
+
+
+@pytest.mark.asyncio
+async def test_brpop_returns_available_item(redis):
+    await redis.lpush("q", "a")
+    assert await redis.brpop("q") == "a"
+
+
+@pytest.mark.asyncio
+async def test_brpop_wakes_up_on_lpush(redis):
+    waiter = asyncio.create_task(redis.brpop("q", timeout=5))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    start = time.monotonic()
+    assert await redis.lpush("q", "a") == 1  # the woken waiter drops the key
+    assert await waiter == "a"
+    assert time.monotonic() - start < 0.05
+    assert "q" not in redis._waiters
+
+
+@pytest.mark.asyncio
+async def test_brpop_timeout(redis):
+    assert await redis.brpop("q", timeout=0.05) is None
+    assert "q" not in redis._waiters
+
+
+@pytest.mark.asyncio
+async def test_brpop_cancelled_waiter_does_not_take_wakeup(redis):
+    first = asyncio.create_task(redis.brpop("q", timeout=5))
+    second = asyncio.create_task(redis.brpop("q", timeout=5))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0)
+    await redis.lpush("q", "a")
+    assert await asyncio.wait_for(second, 1) == "a"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert "q" not in redis._waiters
+
+
+@pytest.mark.asyncio
+async def test_xadd_ids_increase_and_entries_are_kept(redis):
+    ids = [await redis.xadd("s", {"data": i}) for i in range(3)]
+    parsed = [tuple(map(int, i.split("-"))) for i in ids]
+    assert parsed == sorted(parsed) and len(set(parsed)) == 3
+
+    entries = await redis.xread("s")
+    assert [fields["data"] for _, fields in entries] == [0, 1, 2]
+    # reading does not consume: a second reader sees the same entries
+    assert await redis.xread("s") == entries
+    assert await redis.xread("s", ids[0]) == entries[1:]
+    assert await redis.xread("s", ids[0], count=1) == entries[1:2]
+    assert await redis.xread("s", "$") == []
+
+
+@pytest.mark.asyncio
+async def test_xadd_max_size(redis):
+    for i in range(5):
+        await redis.xadd("s", {"data": i}, max_size=2)
+    assert [f["data"] for _, f in await redis.xread("s")] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_xread_blocks_until_xadd_for_every_reader(redis):
+    readers = [asyncio.create_task(redis.xread("s", "$", timeout=5)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    entry_id = await redis.xadd("s", {"data": "x"})
+    for reader in readers:
+        assert await asyncio.wait_for(reader, 1) == [(entry_id, {"data": "x"})]
+    assert "s" not in redis._stream_waiters
+    assert await redis.xread("s", entry_id, timeout=0.02) == []
+
+
+@pytest.mark.asyncio
+async def test_bytes_accounting(redis):
+    await redis.lpush("a", "xxxx", "yy")
+    await redis.xadd("s", {"data": b"zzz"})
+    assert redis.stats()["bytes"] == 6 + (16 + 4 + 3)
+    await redis.rpop("a")
+    assert redis.used_bytes == 4 + 23
+    await redis.lpush("b", "1", "22", "333", max_size=2)
+    assert list(redis.data["b"]) == ["1", "22"]
+    assert redis._key_bytes["b"] == 3
+    await redis.lpush("b", "4444")
+    assert redis._key_bytes["b"] == 5
+    await redis.rpop("a")
+    assert "a" not in redis.data and redis.used_bytes == 23 + 5
+
+
+@pytest.mark.asyncio
+async def test_budget_evicts_least_recently_used_keys():
+    redis = LocalRedis(max_bytes=10)
+    await redis.lpush("old", "aaaa")
+    await redis.lpush("used", "bbbb")
+    await redis.lpush("old", "c")  # touch
+    await redis.lpush("new", "dddd")
+    assert set(redis.data) == {"old", "new"}
+    stats = redis.stats()
+    assert stats["keys"] == 2 and stats["bytes"] == 9
+    assert stats["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sweeper_removes_expired_keys():
+    redis = LocalRedis(sweep_interval=0.01)
+    await redis.lpush("gone", "v", ex=-1)
+    await redis.lpush("kept", "v")
+    redis.start_sweeper()
+    await asyncio.sleep(0.05)
+    assert set(redis.data) == {"kept"}
+    assert redis.stats()["expirations"] == 1 and redis.used_bytes == 1
+    await redis.close()
+    assert redis._sweeper is None
+
+
+@pytest.mark.asyncio
+async def test_sweep_in_batches(redis):
+    for i in range(25):
+        await redis.lpush(f"k{i}", "v", ex=-1 if i % 2 else 100)
+    assert await redis.sweep(batch_size=10) == 12
+    assert len(redis.data) == 13
+
+
+@pytest.mark.asyncio
+async def test_lpush_batch_pops_in_order(redis):
+    await redis.lpush_batch("q", ["a", "b", "c"], max_size=10)
+    assert [await redis.rpop("q") for _ in range(3)] == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_xadd_batch(redis):
+    ids = await redis.xadd_batch("s", [{"data": 1}, {"data": 2}])
+    assert [entry_id for entry_id, _ in await redis.xread("s")] == ids
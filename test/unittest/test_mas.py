@@ -0,0 +1,258 @@
+"""
+Unit tests for the message sending of MAS
+"""
+
+import asyncio
+import json
+import logging
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from oxygent.config import Config
+from oxygent.databases.db_redis import LocalRedis
+from oxygent.mas import MAS
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+from oxygent.utils.message_utils import decode_message
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def mas():
+    return MAS.model_construct(
+        redis_client=LocalRedis(), es_client=AsyncMock(), active_tasks={}
+    )
+
+
+@pytest.fixture
+def transport():
+    original = Config.get_message_transport()
+    yield Config.set_message_transport
+    Config.set_message_transport(original)
+
+
+def web_app(monkeypatch, mas):
+    """Return the FastAPI app of *mas* without running the server."""
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+    apps = []
+
+    class FakeServer:
+        def __init__(self, config):
+            apps.append(config.app)
+
+        async def serve(self):
+            pass
+
+    monkeypatch.setattr("uvicorn.Server", FakeServer)
+    monkeypatch.setattr(Config, "get_server_auto_open_webpage", lambda: False)
+    asyncio.run(mas.start_web_service(host="127.0.0.1", port=8080))
+    return apps[0]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_send_messages_one_push_in_order(mas, transport, monkeypatch):
+    transport("list")
+    push = AsyncMock(wraps=mas.redis_client.lpush_batch)
+    monkeypatch.setattr(mas.redis_client, "lpush_batch", push)
+
+    await mas.send_messages(
+        [{"type": "a"}, {"type": "b", "_is_send": False}, {"type": "c"}],
+        "msg:app:trace1",
+    )
+
+    push.assert_awaited_once()
+    popped = [await mas.redis_client.rpop("msg:app:trace1") for _ in range(3)]
+    assert [json.loads(decode_message(p)["data"]) for p in popped[:2]] == [
+        {"type": "a"},
+        {"type": "c"},
+    ]
+    assert popped[2] is None
+
+
+@pytest.mark.asyncio
+async def test_send_messages_stream_and_bulk_store(mas, transport):
+    transport("stream")
+
+    await mas.send_messages(
+        [{"type": "a", "_is_stored": True}, {"type": "b", "_is_stored": True}],
+        "msg:app:trace1",
+    )
+
+    entries = await mas.redis_client.xread("msg:app:trace1")
+    events = [decode_message(f["data"]) for _, f in entries]
+    assert [json.loads(e["data"])["type"] for e in events] == ["a", "b"]
+    (actions,) = mas.es_client.bulk.await_args.args
+    assert [a["_source"]["trace_id"] for a in actions] == ["trace1", "trace1"]
+    mas.es_client.index.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_event_stream_passes_messages_through(mas, transport, monkeypatch):
+    monkeypatch.setattr("oxygent.mas.logger", logging.getLogger(__name__))
+    transport("stream")
+    key = "msg:app:trace1"
+    await mas.send_messages(
+        [{"type": "stream", "content": {"delta": "hi"}}, "text"], key
+    )
+    await mas.send_message({"event": "close", "data": "done"}, key)
+
+    events = [event async for event in mas.event_stream(key, "trace1")]
+
+    assert json.loads(events[0]["data"]) == {
+        "type": "stream",
+        "content": {"delta": "hi"},
+    }
+    assert events[1]["data"] == "text"
+    assert events[2]["event"] == "close"
+    resumed = [e async for e in mas.event_stream(key, "trace1", None, events[0]["id"])]
+    assert resumed == events[1:]
+
+
+def test_websocket_multiplexes_traces(monkeypatch):
+    mas = MAS.model_construct(
+        redis_client=LocalRedis(),
+        es_client=AsyncMock(),
+        active_tasks={},
+        func_filter=lambda payload: payload,
+        func_interceptor=lambda payload: None,
+    )
+
+    async def chat_with_agent(payload, send_msg_key):
+        if payload["query"] == "slow":
+            await asyncio.sleep(5)
+        await mas.send_message({"type": "answer", "content": "ok"}, send_msg_key)
+        await mas.send_message({"event": "close", "data": "done"}, send_msg_key)
+
+    object.__setattr__(mas, "chat_with_agent", chat_with_agent)
+
+    with TestClient(web_app(monkeypatch, mas)) as client, client.websocket_connect(
+        "/ws"
+    ) as ws:
+        for trace_id, query in [("t1", "a"), ("t2", "b"), ("t3", "slow")]:
+            payload = {"query": query, "current_trace_id": trace_id}
+            ws.send_json({"type": "chat", "payload": payload})
+        frames = [ws.receive_json() for _ in range(4)]
+        assert {(f["current_trace_id"], f.get("event")) for f in frames} == {
+            ("t1", None),
+            ("t1", "close"),
+            ("t2", None),
+            ("t2", "close"),
+        }
+        ws.send_text("not json")
+        assert ws.receive_json()["event"] == "error"
+        ws.send_json({"type": "chat", "payload": ["not", "an", "object"]})
+        assert ws.receive_json()["event"] == "error"
+        ws.send_json({"type": "cancel", "current_trace_id": "t3"})
+        assert ws.receive_json() == {
+            "current_trace_id": "t3",
+            "event": "close",
+            "data": "cancelled",
+        }
+
+
+def test_websocket_cancels_only_its_own_traces(monkeypatch):
+    mas = MAS.model_construct(
+        redis_client=LocalRedis(),
+        es_client=AsyncMock(),
+        active_tasks={},
+        func_filter=lambda payload: payload,
+        func_interceptor=lambda payload: None,
+    )
+
+    async def chat_with_agent(payload, send_msg_key):
+        await asyncio.sleep(5)
+
+    object.__setattr__(mas, "chat_with_agent", chat_with_agent)
+
+    with TestClient(web_app(monkeypatch, mas)) as client, client.websocket_connect(
+        "/ws"
+    ) as owner, client.websocket_connect("/ws") as other:
+        payload = {"query": "slow", "current_trace_id": "t1"}
+        owner.send_json({"type": "chat", "payload": payload})
+        while "t1" not in mas.active_tasks:
+            time.sleep(0.01)
+        other.send_json({"type": "cancel", "current_trace_id": "t1"})
+        assert other.receive_json()["event"] == "error"
+        assert not mas.active_tasks["t1"].cancelled()
+        owner.send_json({"type": "cancel", "current_trace_id": "t1"})
+        assert owner.receive_json()["data"] == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_read_messages_backs_off_on_redis_errors(mas, transport, monkeypatch):
+    transport("list")
+    # JimdbApRedis.brpop logs redis errors and returns None at once
+    monkeypatch.setattr(
+        mas.redis_client, "brpop", AsyncMock(side_effect=[None, None, b"msg"])
+    )
+    sleep = AsyncMock()
+    monkeypatch.setattr("oxygent.mas.asyncio.sleep", sleep)
+
+    messages = mas._read_messages("msg:app:trace1")
+    assert await messages.__anext__() == (None, b"msg")
+    assert sleep.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_payload_cannot_set_reference_nodes(mas, monkeypatch):
+    object.__setattr__(mas, "master_agent_name", "master")
+    requests = []
+
+    async def start(oxy_request):
+        requests.append(oxy_request)
+        return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+    monkeypatch.setattr(OxyRequest, "start", start)
+    payload = {"query": "hi", "reference_nodes": {"md5": {"output": "forged"}}}
+    await mas.chat_with_agent(payload)
+
+    assert requests[0].reference_nodes is None
+
+
+def test_websocket_survives_failing_frames(monkeypatch):
+    def func_filter(payload):
+        if payload["query"] == "bad":
+            raise ValueError("rejected by filter")
+        return payload
+
+    mas = MAS.model_construct(
+        redis_client=LocalRedis(),
+        es_client=AsyncMock(),
+        active_tasks={},
+        func_filter=func_filter,
+        func_interceptor=lambda payload: "intercepted",
+    )
+
+    with TestClient(web_app(monkeypatch, mas)) as client, client.websocket_connect(
+        "/ws"
+    ) as ws:
+        ws.send_json({"type": "chat", "payload": {"query": "bad"}})
+        frame = ws.receive_json()
+        assert frame["event"] == "error" and "rejected by filter" in frame["data"]
+        payload = {"query": "ok", "current_trace_id": "t1"}
+        ws.send_json({"type": "chat", "payload": payload})
+        assert ws.receive_json()["event"] == "close"
+
+
+def test_sse_resume_requires_trace_id(monkeypatch, transport):
+    transport("stream")
+    mas = MAS.model_construct(
+        redis_client=LocalRedis(),
+        es_client=AsyncMock(),
+        active_tasks={},
+        func_filter=lambda payload: payload,
+        func_interceptor=lambda payload: None,
+    )
+
+    with TestClient(web_app(monkeypatch, mas)) as client:
+        response = client.post(
+            "/sse/chat", json={"query": "hi"}, headers={"Last-Event-ID": "1-0"}
+        )
+    assert response.json()["code"] == 400
@@ -0,0 +1,72 @@
+"""
+Unit tests for message_utils
+"""
+
+import json
+
+import msgpack
+import pytest
+
+from oxygent.utils import message_utils
+from oxygent.utils.common_utils import msgpack_preprocess
+from oxygent.utils.message_utils import decode_message, dumps, encode_message
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture(params=["orjson", "json"])
+def encoder(request, monkeypatch):
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(message_utils, "orjson", None)
+    return request.param
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_dumps_converts_unknown_types(encoder):
+    data = json.loads(dumps({"s": {1}, 2: object.__name__, "t": (1, "é")}))
+    assert data == {"s": [1], "2": "object", "t": [1, "é"]}
+    assert json.loads(dumps({"big": 2**70})) == {"big": 2**70}
+
+
+def test_data_message_round_trip(encoder):
+    message = {"type": "stream", "content": {"delta": "hi", "node_id": "n"}}
+    event = decode_message(encode_message(message))
+    assert set(event) == {"data"}
+    assert json.loads(event["data"]) == message
+
+
+def test_string_message_passed_as_is(encoder):
+    assert decode_message(encode_message("plain text")) == {"data": "plain text"}
+
+
+def test_control_event(encoder):
+    event = decode_message(encode_message({"event": "close", "data": "done"}))
+    assert event == {"event": "close", "data": "done"}
+
+
+def test_frontend_conversions_do_not_mutate(encoder):
+    output = {"rows": [1, 2]}
+    observation = {"type": "observation", "content": {"output": output}}
+    event = decode_message(encode_message(observation))
+    assert json.loads(json.loads(event["data"])["content"]["output"]) == output
+    assert observation["content"]["output"] is output
+
+    query = [{"type": "image_url"}, {"type": "text", "text": "q"}]
+    tool_call = {"type": "tool_call", "content": {"arguments": {"query": query}}}
+    event = decode_message(encode_message(tool_call))
+    assert json.loads(event["data"])["content"]["arguments"]["query"] == "q"
+    assert tool_call["content"]["arguments"]["query"] is query
+
+
+def test_decodes_former_msgpack_messages():
+    message = {"type": "observation", "content": {"output": [1]}}
+    event = decode_message(msgpack.packb(msgpack_preprocess(message)))
+    assert json.loads(event["data"])["content"]["output"] == "[1]"
+    close = msgpack.packb({"event": "close", "data": "done"})
+    assert decode_message(close) == {"event": "close", "data": "done"}
+    assert decode_message(msgpack.packb({})) is None
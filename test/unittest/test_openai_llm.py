@@ -0,0 +1,156 @@
+"""
+Unit tests for OpenAILLM
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from oxygent.oxy.llms.openai_llm import OpenAILLM
+from oxygent.schemas import OxyRequest
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture(autouse=True)
+def config_patch(monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.openai_llm.Config.get_llm_config", lambda: {}, raising=True
+    )
+
+
+@pytest.fixture
+def released():
+    """Event the handler waits for before answering, set by default."""
+    released = asyncio.Event()
+    released.set()
+    return released
+
+
+@pytest.fixture
+def requests(monkeypatch, released):
+    """Route the HTTP clients of OpenAILLM to a handler recording requests."""
+    requests = []
+
+    async def handler(request):
+        requests.append(request)
+        await released.wait()
+        return httpx.Response(
+            200,
+            json={
+                "id": "c1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-ut",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "Hi there!"},
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 3,
+                    "completion_tokens": 2,
+                    "total_tokens": 5,
+                },
+            },
+        )
+
+    def fake_http_client(**kwargs):
+        requests.append(kwargs)
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.openai_llm.DefaultAsyncHttpxClient", fake_http_client
+    )
+    return requests
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    async def passthrough(self, req: OxyRequest):
+        return req.arguments["messages"]
+
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.base_llm.BaseLLM._get_messages", passthrough, raising=True
+    )
+
+    return OpenAILLM(
+        name="openai_llm",
+        api_key="sk-123",
+        base_url="https://api.fake.com/v1",
+        model_name="gpt-ut",
+        headers=lambda oxy_request: {"X-Trace": oxy_request.current_trace_id},
+        semaphore=4,
+    )
+
+
+@pytest.fixture
+def oxy_request():
+    return OxyRequest(
+        arguments={
+            "messages": [{"role": "user", "content": "Hello, LLM"}],
+            "stream": False,
+        },
+        caller="tester",
+        caller_category="agent",
+        current_trace_id="trace123",
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_client_is_reused_with_extra_headers(llm, oxy_request, requests):
+    await llm.init()
+    client = llm._client
+    for _ in range(2):
+        response = await llm._execute(oxy_request)
+        assert response.output == "Hi there!"
+        assert response.extra["usage"]["total_tokens"] == 5
+
+    assert llm._client is client
+    client_kwargs, *calls = requests
+    assert client_kwargs["limits"].max_connections == 4
+    assert len(calls) == 2
+    assert all(call.headers["X-Trace"] == "trace123" for call in calls)
+
+    await llm.cleanup()
+    assert llm._client is None
+
+
+@pytest.mark.asyncio
+async def test_client_is_rebuilt_when_endpoint_changes(llm, oxy_request, requests):
+    await llm._execute(oxy_request)
+    client = llm._client
+    llm.base_url = "https://other.fake.com/v1"
+    await llm._execute(oxy_request)
+
+    assert llm._client is not client
+    assert client.is_closed()
+    assert str(requests[-1].url) == "https://other.fake.com/v1/chat/completions"
+    await llm.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_replaced_client_is_closed_after_its_calls(
+    llm, oxy_request, requests, released
+):
+    await llm.init()
+    client = llm._client
+    released.clear()
+    running = asyncio.create_task(llm._execute(oxy_request))
+    while len(requests) < 2:  # the client kwargs and the running call
+        await asyncio.sleep(0.01)
+
+    llm.base_url = "https://other.fake.com/v1"
+    assert await llm._get_client() is not client
+    assert not client.is_closed()
+    released.set()
+    assert (await running).output == "Hi there!"
+    assert client.is_closed()
+    await llm.cleanup()
@@ -10,6 +10,7 @@ Because Oxy is abstract, we define a DummyOxy subclass for testing.
 """
 
 import asyncio
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -67,3 +68,111 @@ class TestBaseOxy:
         assert response.state == OxyState.COMPLETED
         assert response.output == "dummy_output"
         assert response.oxy_request == oxy_request
+
+    @pytest.mark.asyncio
+    async def test_request_interceptor_replays_from_reference_nodes(self, dummy_oxy):
+        """Preloaded reference nodes are used without searching ES."""
+        mas = AsyncMock()
+        dummy_oxy.mas = mas
+        reference_nodes = {
+            "md5": {
+                "update_time": "2025-01-01 00:00:00",
+                "output": "cached_output",
+                "state": OxyState.COMPLETED.value,
+                "extra": "{}",
+            }
+        }
+        oxy_request = OxyRequest(
+            reference_trace_id="ref_trace",
+            restart_node_id="restart_node",
+            restart_node_order="2025-01-02 00:00:00",
+            input_md5="md5",
+            reference_nodes=reference_nodes,
+        )
+        response = await dummy_oxy._request_interceptor(oxy_request)
+        assert response.output == "cached_output"
+        mas.es_client.search.assert_not_awaited()
+
+        oxy_request.input_md5 = "unknown_md5"
+        assert await dummy_oxy._request_interceptor(oxy_request) is None
+
+    @pytest.mark.asyncio
+    async def test_single_flight_coalesces_identical_calls(self):
+        """Concurrent identical calls share one execution, each keeping its node."""
+        calls = []
+
+        class SlowOxy(Oxy):
+            async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+                calls.append(oxy_request.arguments)
+                await asyncio.sleep(0.05)
+                return OxyResponse(
+                    state=OxyState.COMPLETED, output={"q": oxy_request.arguments["q"]}
+                )
+
+        oxy = SlowOxy(name="slow", is_single_flight=True)
+        requests = [
+            OxyRequest(arguments={"q": q}, caller="test", current_trace_id=f"t{i}")
+            for i, q in enumerate(["a", "a", "a", "b"])
+        ]
+        responses = await asyncio.gather(*(oxy.execute(r) for r in requests))
+
+        assert calls == [{"q": "a"}, {"q": "b"}]
+        assert [r.output for r in responses] == [{"q": "a"}] * 3 + [{"q": "b"}]
+        assert responses[1].output is not responses[0].output
+        leader = requests[0].node_id
+        assert [r.extra.get("coalesced_node_id") for r in responses] == [
+            None,
+            leader,
+            leader,
+            None,
+        ]
+        assert responses[1].oxy_request is requests[1]
+        assert oxy._in_flight == {}
+
+        await oxy.execute(requests[0])  # no longer in flight
+        assert len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_single_flight_waiters_hold_no_slot(self):
+        """Only the executing call takes a slot of the semaphore."""
+        locked = []
+
+        class SlowOxy(Oxy):
+            async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+                await asyncio.sleep(0.05)  # the identical calls arrive meanwhile
+                locked.append(self._semaphore.locked())
+                return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+        oxy = SlowOxy(name="slow", semaphore=2, is_single_flight=True)
+        requests = [
+            OxyRequest(arguments={"q": "a"}, caller="test", current_trace_id=f"t{i}")
+            for i in range(3)
+        ]
+        await asyncio.gather(*(oxy.execute(r) for r in requests))
+
+        assert locked == [False]
+
+    @pytest.mark.asyncio
+    async def test_single_flight_skipped_with_interceptor(self):
+        """Each call runs its own interceptor, so none of them is coalesced."""
+        calls = []
+
+        class SlowOxy(Oxy):
+            async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+                calls.append(oxy_request.arguments)
+                await asyncio.sleep(0.05)
+                return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+        async def interceptor(oxy_request):
+            return "vetoed" if oxy_request.current_trace_id == "t1" else None
+
+        oxy = SlowOxy(name="slow", is_single_flight=True, func_interceptor=interceptor)
+        requests = [
+            OxyRequest(arguments={"q": "a"}, caller="test", current_trace_id=f"t{i}")
+            for i in range(2)
+        ]
+        responses = await asyncio.gather(*(oxy.execute(r) for r in requests))
+
+        assert len(calls) == 1
+        assert [r.state for r in responses] == [OxyState.COMPLETED, OxyState.SKIPPED]
+        assert responses[1].output == "vetoed"
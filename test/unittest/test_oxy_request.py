@@ -80,6 +80,13 @@ def test_deepcopy_resets_parallel_ids(base_request):
     assert dup.latest_node_ids == []
 
 
+def test_clone_shares_reference_nodes(base_request):
+    base_request.reference_nodes = {"md5": {"output": "o"}}
+    new_req = base_request.clone_with(callee="dummy")
+    assert new_req.reference_nodes is base_request.reference_nodes
+    assert "reference_nodes" not in new_req.model_dump()
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # ❹ retry_execute
 # ──────────────────────────────────────────────────────────────────────────────
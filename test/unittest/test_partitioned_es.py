@@ -0,0 +1,202 @@
+"""
+Unit tests for PartitionedEs
+"""
+
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+
+from oxygent.databases.db_es import partitioned_es
+from oxygent.databases.db_es.local_es import LocalEs
+from oxygent.databases.db_es.partitioned_es import PartitionedEs
+
+MAPPING = {
+    "mappings": {
+        "properties": {
+            "trace_id": {"type": "keyword"},
+            "create_time": {"type": "date"},
+        }
+    }
+}
+
+
+class FakeDatetime(datetime):
+    current = datetime(2024, 3, 1, 12, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def local_es(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.databases.db_es.local_es.Config.get_cache_save_dir",
+        lambda: str(tmp_path),
+    )
+    return LocalEs()
+
+
+@pytest_asyncio.fixture
+async def part_es(local_es, monkeypatch):
+    monkeypatch.setattr(partitioned_es, "datetime", FakeDatetime)
+    FakeDatetime.current = datetime(2024, 3, 1, 12, 0)
+    es = PartitionedEs(local_es, ["node"], retention_days=2)
+    await es.create_index("node", MAPPING)
+    await es.create_index("plain", MAPPING)
+    return es
+
+
+def set_day(day):
+    FakeDatetime.current = datetime(2024, 3, day, 12, 0)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_writes_go_to_daily_partitions(part_es, local_es):
+    await part_es.index("node", "a", {"trace_id": "t1", "create_time": "2024-03-01"})
+    await part_es.index("plain", "p", {"v": 1})
+    set_day(2)
+    # later writes of a document stay in its partition
+    await part_es.update("node", "a", {"state": "done"})
+    await part_es.bulk(
+        [
+            {"_op_type": "index", "_index": "node", "_id": "b", "_source": {}},
+            {"_op_type": "update", "_index": "node", "_id": "a", "_source": {"x": 1}},
+        ]
+    )
+
+    assert await local_es.list_indices("node-") == ["node-20240301", "node-20240302"]
+    assert await local_es.exists("node-20240301", "a") is True
+    assert await local_es.exists("node-20240302", "b") is True
+    assert await local_es.exists("plain", "p") is True
+    assert await part_es.exists("node", "a") is True
+    res = await part_es.search("node", {"query": {"term": {"_id": "a"}}})
+    assert res["hits"]["hits"][0]["_source"] == {
+        "trace_id": "t1",
+        "create_time": "2024-03-01",
+        "state": "done",
+        "x": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_new_documents_are_written_without_lookups(
+    part_es, local_es, monkeypatch
+):
+    for day in (1, 2, 3):
+        set_day(day)
+        await part_es.index("node", f"d{day}", {})
+    exists_calls = []
+    original = local_es.exists
+
+    async def recording_exists(index_name, doc_id):
+        exists_calls.append(index_name)
+        return await original(index_name, doc_id)
+
+    monkeypatch.setattr(local_es, "exists", recording_exists)
+    for i in range(10):
+        await part_es.index("node", f"new{i}", {})
+    assert exists_calls == []
+
+    part_es._doc_partitions.clear()  # e.g. after a restart
+    await part_es.update("node", "d1", {"state": "done"})
+    assert await local_es.exists("node-20240301", "d1") is True
+    assert await local_es.exists("node-20240303", "d1") is False
+
+
+@pytest.mark.asyncio
+async def test_search_merges_partitions(part_es):
+    for day in (1, 2, 3):
+        set_day(day)
+        for i in range(2):
+            await part_es.index(
+                "node",
+                f"d{day}_{i}",
+                {"trace_id": "t", "create_time": f"2024-03-0{day} 0{i}"},
+            )
+
+    body = {
+        "query": {"term": {"trace_id": "t"}},
+        "sort": [{"create_time": {"order": "desc"}}],
+        "size": 3,
+    }
+    res = await part_es.search("node", body)
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["d3_1", "d3_0", "d2_1"]
+
+    body["sort"] = [{"create_time": {"order": "asc"}}]
+    body["search_after"] = ["2024-03-01 01"]
+    res = await part_es.search("node", body)
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["d2_0", "d2_1", "d3_0"]
+
+
+@pytest.mark.asyncio
+async def test_recent_lookups_skip_old_partitions(part_es, local_es, monkeypatch):
+    for day in (1, 2, 3):
+        set_day(day)
+        await part_es.index("node", f"d{day}", {"create_time": f"2024-03-0{day}"})
+
+    searched = []
+    original = local_es.search
+
+    async def recording_search(index_name, body):
+        searched.append(index_name)
+        return await original(index_name, body)
+
+    monkeypatch.setattr(local_es, "search", recording_search)
+    body = {"sort": [{"create_time": {"order": "desc"}}], "size": 1}
+    res = await part_es.search("node", body)
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["d3"]
+    assert searched == ["node-20240303", "node-20240302"]
+
+    searched.clear()
+    await part_es.search("node", {"query": {"term": {"_id": "d3"}}})
+    assert searched == ["node-20240303"]
+
+
+@pytest.mark.asyncio
+async def test_retention_drops_old_partitions(part_es, local_es):
+    for day in (1, 2, 3, 4):
+        set_day(day)
+        await part_es.index("node", f"d{day}", {})
+
+    assert await local_es.list_indices("node-") == [
+        "node-20240302",
+        "node-20240303",
+        "node-20240304",
+    ]
+    assert await part_es.exists("node", "d1") is False
+
+
+@pytest.mark.asyncio
+async def test_search_visits_recent_partitions_unless_asked(
+    part_es, local_es, monkeypatch
+):
+    part_es.retention_days = 0
+    part_es.recent_partitions = 2
+    for day in (1, 2, 3):
+        set_day(day)
+        await part_es.index("node", f"d{day}", {"trace_id": "t"})
+
+    searched = []
+    original = local_es.search
+
+    async def recording_search(index_name, body):
+        searched.append(index_name)
+        return await original(index_name, body)
+
+    monkeypatch.setattr(local_es, "search", recording_search)
+    body = {"query": {"term": {"trace_id": "old"}}}
+    assert (await part_es.search("node", body))["hits"]["hits"] == []
+    assert searched == ["node-20240303", "node-20240302"]
+
+    body = {"query": {"term": {"_id": "d1"}}}
+    assert (await part_es.search("node", body))["hits"]["hits"] == []
+    res = await part_es.search_all("node", body)
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["d1"]
@@ -0,0 +1,149 @@
+"""
+Unit tests for SqliteEs
+"""
+
+import sqlite3
+
+import pytest
+import pytest_asyncio
+
+from oxygent.databases.db_es.sqlite_es import SqliteEs
+
+MAPPING = {
+    "mappings": {
+        "properties": {
+            "trace_id": {"type": "keyword"},
+            "root_trace_ids": {"type": "keyword"},
+            "create_time": {"type": "date"},
+        }
+    }
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "es.db")
+
+
+@pytest_asyncio.fixture
+async def sqlite_es(db_path):
+    es = SqliteEs(db_path)
+    await es.create_index("idx", MAPPING)
+    yield es
+    await es.close()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_keyword_fields_are_indexed(sqlite_es, db_path):
+    conn = sqlite3.connect(db_path)
+    names = {r[0] for r in conn.execute("SELECT name FROM sqlite_master")}
+    assert {"idx__trace_id", "idx__root_trace_ids"} <= names
+    assert "idx__create_time" not in names
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+@pytest.mark.asyncio
+async def test_index_update_exists(sqlite_es):
+    r1 = await sqlite_es.index("idx", "1", {"v": 10, "x": 1})
+    assert r1["result"] == "created"
+    r2 = await sqlite_es.update("idx", "1", {"v": 20})
+    assert r2["result"] == "updated"
+
+    assert await sqlite_es.exists("idx", "1") is True
+    assert await sqlite_es.exists("idx", "999") is False
+    res = await sqlite_es.search("idx", {"query": {"term": {"_id": "1"}}})
+    assert res["hits"]["hits"][0]["_source"] == {"v": 20, "x": 1}
+
+
+@pytest.mark.asyncio
+async def test_search_term_terms_bool(sqlite_es):
+    await sqlite_es.index("idx", "a", {"trace_id": "t1", "n": 2})
+    await sqlite_es.index("idx", "b", {"trace_id": "t2", "n": 1})
+    await sqlite_es.index("idx", "c", {"trace_id": "t2", "root_trace_ids": ["r"]})
+
+    async def ids(query):
+        res = await sqlite_es.search("idx", {"query": query})
+        return [h["_id"] for h in res["hits"]["hits"]]
+
+    assert await ids({"term": {"trace_id": "t1"}}) == ["a"]
+    assert await ids({"terms": {"trace_id": ["t2", "t3"]}}) == ["b", "c"]
+    assert await ids({"term": {"root_trace_ids": ["r"]}}) == ["c"]
+    must = [{"term": {"trace_id": "t2"}}, {"term": {"n": 1}}]
+    assert await ids({"bool": {"must": must}}) == ["b"]
+    should = [{"term": {"n": 2}}, {"term": {"n": 1}}]
+    assert await ids({"bool": {"should": should}}) == ["a", "b"]
+    assert await ids({"bool": {"must_not": [{"term": {"trace_id": "t2"}}]}}) == ["a"]
+    assert await ids({"match_all": {}}) == ["a", "b", "c"]
+    assert await sqlite_es.search("missing_idx", {}) == {"hits": {"hits": []}}
+
+
+@pytest.mark.asyncio
+async def test_sort_size_and_search_after(sqlite_es):
+    for i in range(7):
+        await sqlite_es.index(
+            "idx", f"n{i}", {"trace_id": "t", "create_time": i // 2, "node_id": f"n{i}"}
+        )
+    await sqlite_es.index("idx", "late", {"trace_id": "t", "node_id": "late"})
+
+    body = {
+        "query": {"term": {"trace_id": "t"}},
+        "sort": [{"create_time": {"order": "desc"}}, {"node_id": {"order": "asc"}}],
+        "size": 3,
+    }
+    seen = []
+    while True:
+        page = (await sqlite_es.search("idx", body))["hits"]["hits"]
+        seen.extend(h["_id"] for h in page)
+        if len(page) < body["size"]:
+            break
+        body["search_after"] = page[-1]["sort"]
+    assert seen == ["n6", "n4", "n5", "n2", "n3", "n0", "n1", "late"]
+
+
+@pytest.mark.asyncio
+async def test_data_survives_reopen(sqlite_es, db_path):
+    await sqlite_es.index("idx", "a", {"trace_id": "t1"})
+    await sqlite_es.close()
+
+    reopened = SqliteEs(db_path)
+    res = await reopened.search("idx", {"query": {"term": {"trace_id": "t1"}}})
+    assert [h["_id"] for h in res["hits"]["hits"]] == ["a"]
+    await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk(sqlite_es):
+    await sqlite_es.index("idx", "a", {"v": 1})
+    res = await sqlite_es.bulk(
+        [
+            {"_op_type": "update", "_index": "idx", "_id": "a", "_source": {"w": 2}},
+            {"_op_type": "index", "_index": "idx", "_id": "b", "_source": {"v": 3}},
+            {"_op_type": "index", "_index": "other", "_id": "c", "_source": {}},
+        ]
+    )
+    assert res["errors"] is False
+    res = await sqlite_es.search("idx", {})
+    assert [h["_source"] for h in res["hits"]["hits"]] == [{"v": 1, "w": 2}, {"v": 3}]
+    assert await sqlite_es.exists("other", "c") is True
+
+
+@pytest.mark.asyncio
+async def test_list_and_delete_indices(sqlite_es):
+    await sqlite_es.create_index("idx-20240301", MAPPING)
+    await sqlite_es.index("idx-20240301", "a", {"trace_id": "t1"})
+    await sqlite_es.index("idx-20240302", "b", {"trace_id": "t1"})
+
+    assert await sqlite_es.list_indices("idx-") == ["idx-20240301", "idx-20240302"]
+    await sqlite_es.delete_index("idx-20240301")
+    assert await sqlite_es.list_indices("idx") == ["idx", "idx-20240302"]
+    assert await sqlite_es.exists("idx-20240301", "a") is False
+    # the table is recreated on the next write
+    await sqlite_es.index("idx-20240301", "c", {})
+    assert await sqlite_es.exists("idx-20240301", "c") is True
@@ -0,0 +1,94 @@
+"""
+Unit tests for StreamAggregator
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from oxygent.utils.stream_utils import StreamAggregator
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def oxy_request():
+    return SimpleNamespace(
+        caller="agent", node_id="n1", send_message=AsyncMock(return_value=None)
+    )
+
+
+def sent_deltas(oxy_request):
+    return [
+        call.args[0]["content"]["delta"]
+        for call in oxy_request.send_message.await_args_list
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_first_delta_sent_immediately_rest_coalesced(oxy_request):
+    aggregator = StreamAggregator(oxy_request, flush_interval=10, max_chars=1000)
+    for delta in ["Hel", "lo", ", ", "world"]:
+        await aggregator.add(delta)
+    assert sent_deltas(oxy_request) == ["Hel"]
+    await aggregator.close()
+    assert sent_deltas(oxy_request) == ["Hel", "lo, world"]
+    message = oxy_request.send_message.await_args.args[0]
+    assert message["type"] == "stream" and message["_is_stored"] is False
+    assert message["content"]["agent"] == "agent"
+    assert message["content"]["node_id"] == "n1"
+
+
+@pytest.mark.asyncio
+async def test_flush_on_size(oxy_request):
+    aggregator = StreamAggregator(oxy_request, flush_interval=10, max_chars=4)
+    for delta in ["a", "bb", "cc", "d"]:
+        await aggregator.add(delta)
+    assert sent_deltas(oxy_request) == ["a", "bbcc"]
+    await aggregator.close()
+    assert sent_deltas(oxy_request) == ["a", "bbcc", "d"]
+
+
+@pytest.mark.asyncio
+async def test_flush_on_timer(oxy_request):
+    aggregator = StreamAggregator(oxy_request, flush_interval=0.02, max_chars=1000)
+    await aggregator.add("a")
+    await aggregator.add("b")
+    await aggregator.add("c")
+    await asyncio.sleep(0.05)
+    assert sent_deltas(oxy_request) == ["a", "bc"]
+    await aggregator.close()
+    assert oxy_request.send_message.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_zero_interval_sends_every_delta(oxy_request):
+    aggregator = StreamAggregator(oxy_request, flush_interval=0)
+    for delta in ["a", "", "b", "c"]:
+        await aggregator.add(delta)
+    await aggregator.close()
+    assert sent_deltas(oxy_request) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_nothing_is_sent_after_cancel_or_close(oxy_request):
+    aggregator = StreamAggregator(oxy_request, flush_interval=0.02, max_chars=1000)
+    await aggregator.add("a")
+    await aggregator.add("b")  # due with the timer
+    aggregator.cancel()
+    await asyncio.sleep(0.05)
+    await aggregator.add("c")
+    await aggregator.close()
+    assert sent_deltas(oxy_request) == ["a"]
+
+    aggregator = StreamAggregator(oxy_request, flush_interval=10, max_chars=1000)
+    await aggregator.close()
+    await aggregator.add("d")
+    await aggregator.flush()
+    assert sent_deltas(oxy_request) == ["a"]
@@ -0,0 +1,120 @@
+"""
+Unit tests for trace_analytics and trace_export
+"""
+
+import base64
+import json
+import zlib
+
+import pandas as pd
+import pytest
+
+from oxygent.databases.db_es.local_es import LocalEs
+from oxygent.utils.blob_utils import BLOB_MARKER, get_blob_index_name
+from oxygent.utils.codec_utils import PAYLOAD_MARKER
+from oxygent.utils.trace_analytics import (
+    failure_rates,
+    fan_out,
+    latency_percentiles,
+    load_table,
+)
+
+NODES = pd.DataFrame(
+    {
+        "node_id": ["a", "b", "c", "d", "e"],
+        "father_node_id": ["", "a", "a", "a", "b"],
+        "callee": ["agent", "llm", "llm", "tool", "llm"],
+        "state": ["COMPLETED", "COMPLETED", "FAILED", "COMPLETED", "COMPLETED"],
+        "latency_ms": [100.0, 10.0, 20.0, None, 30.0],
+    }
+)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def local_es(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "oxygent.databases.db_es.local_es.Config.get_cache_save_dir",
+        lambda: str(tmp_path),
+    )
+    return LocalEs()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Analytics
+# ──────────────────────────────────────────────────────────────────────────────
+def test_latency_percentiles():
+    result = latency_percentiles(NODES, percentiles=(0.5, 0.999))
+    assert list(result.columns) == ["count", "mean", "p50", "p99.9"]
+    assert result.loc["llm", "count"] == 3
+    assert result.loc["llm", "p50"] == 20.0
+    assert "tool" not in result.index
+
+
+def test_failure_rates():
+    result = failure_rates(NODES)
+    assert result.index[0] == "llm"
+    assert result.loc["llm", "calls"] == 3 and result.loc["llm", "failed"] == 1
+    assert result.loc["agent", "failure_rate"] == 0
+
+
+def test_fan_out():
+    result = fan_out(NODES)
+    assert result.loc["agent", "max_children"] == 3
+    assert result.loc["llm", "mean_children"] == pytest.approx(1 / 3)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Export
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_export_nodes_round_trip(local_es, tmp_path):
+    pytest.importorskip("pyarrow")
+    from oxygent.utils.trace_export import export_nodes
+
+    for i, day in enumerate(["01", "01", "02"]):
+        await local_es.index(
+            "app_node",
+            f"n{i}",
+            {
+                "node_id": f"n{i}",
+                "callee": "llm",
+                "state": 3,
+                "call_stack": ["user", "agent", "llm"],
+                "create_time": f"2024-03-{day} 10:00:00.000000000",
+                "update_time": f"2024-03-{day} 10:00:01.500000000",
+                "extra": '{"usage": {"total_tokens": 42}}',
+            },
+        )
+
+    paths = await export_nodes(local_es, str(tmp_path / "out"), batch_size=2)
+    assert len(paths) == 2
+    nodes = load_table(str(tmp_path / "out" / "node"))
+    assert sorted(nodes["node_id"]) == ["n0", "n1", "n2"]
+    assert set(nodes["state"]) == {"COMPLETED"}
+    assert set(nodes["latency_ms"]) == {1500.0}
+    assert set(nodes["total_tokens"]) == {42}
+    assert set(nodes["depth"]) == {3}
+
+
+@pytest.mark.asyncio
+async def test_sizes_are_measured_on_restored_payloads(local_es):
+    from oxygent.utils.trace_export import _load_payloads, flatten_node
+
+    prompt, answer = "p" * 1000, "a" * 1000
+    blob_id = "0" * 64
+    await local_es.index(
+        get_blob_index_name(), blob_id, {"blob_id": blob_id, "content": prompt}
+    )
+    compressed = base64.b64encode(zlib.compress(answer.encode())).decode()
+    source = {
+        "input": json.dumps({"system": BLOB_MARKER + blob_id}),
+        "output": f"{PAYLOAD_MARKER}deflate:{compressed}",
+    }
+
+    await _load_payloads(local_es, [source])
+    row = flatten_node(source)
+    assert row["input_size"] == len(json.dumps({"system": prompt}))
+    assert row["output_size"] == len(answer)